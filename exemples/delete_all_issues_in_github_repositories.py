@@ -1,12 +1,17 @@
 #!/usr/bin/env python3
 import argparse
+import json
 import os
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import requests
 
 #python3 delete_issues.py --repo IA-Generative/default_repository --dry-run
 #python3 delete_issues.py --repo IA-Generative/default_repository --yes
+#python3 delete_issues.py --repo IA-Generative/default_repository --yes --bulk --workers 4 --chunk-size 20
+#python3 delete_issues.py --repo IA-Generative/default_repository --yes --bulk --resume   # reprise après interruption
 #export GITHUB_TOKEN="ghp_..."   # token avec droits suffisants sur le repo
 
 
@@ -61,6 +66,220 @@ def delete_issue_gql(issue_node_id: str, token: str):
         raise RuntimeError(data["errors"])
     return data
 
+###
+### Mode bulk : listing GraphQL par curseur, suppressions aliasées par lots, pool de workers,
+### cadencement sur les en-têtes de rate-limit et point de reprise
+###
+
+class RatePacer:
+    """
+    Cadence les appels GitHub à partir des en-têtes X-RateLimit-* / Retry-After
+    au lieu d'une pause fixe : l'intervalle entre deux appels est le temps restant avant
+    le reset divisé par le budget restant, et on attend le reset si le budget est épuisé.
+    """
+
+    def __init__(self, min_interval=0.0, reserve=50):
+        self.min_interval = min_interval
+        self.reserve = reserve
+        self._interval = 0.0  # intervalle par appel calculé depuis les derniers en-têtes
+        self._next_at = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        # Chaque appelant réserve son propre créneau : les workers concurrents sont espacés
+        # de l'intervalle courant au lieu de partir ensemble à la même échéance
+        with self._lock:
+            now = time.time()
+            slot = max(self._next_at, now)
+            self._next_at = slot + max(self.min_interval, self._interval)
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+    def update(self, response):
+        headers = response.headers
+        now = time.time()
+        pause = None
+        retry_after = headers.get("Retry-After")
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+
+        if retry_after is not None:
+            pause = float(retry_after)
+        elif remaining is not None and reset is not None:
+            remaining, reset = int(remaining), int(reset)
+            if remaining <= self.reserve:
+                pause = max(0.0, reset - now)
+            else:
+                # budget restant réparti jusqu'au reset : intervalle appliqué à chaque créneau réservé
+                with self._lock:
+                    self._interval = max(0.0, reset - now) / (remaining - self.reserve)
+        elif response.status_code in (403, 429):
+            pause = 60.0  # rate-limit secondaire sans indication : recommandation GitHub
+
+        if pause is not None:
+            # pause globale (Retry-After, budget épuisé) : aucun créneau avant son échéance
+            with self._lock:
+                self._next_at = max(self._next_at, now + pause)
+
+def gql_call(query: str, variables: dict, token: str, pacer: RatePacer, attempts: int = 3):
+    """Appel GraphQL cadencé ; rejoue en cas de rate-limit (403/429) ou d'erreur serveur."""
+    for attempt in range(1, attempts + 1):
+        pacer.wait()
+        r = requests.post(GQL_API, headers=gh_headers(token), json={"query": query, "variables": variables}, timeout=60)
+        pacer.update(r)
+        if r.status_code in (403, 429, 502, 503, 504) and attempt < attempts:
+            print(f"⏳ HTTP {r.status_code} — nouvelle tentative {attempt}/{attempts - 1}", file=sys.stderr)
+            continue
+        r.raise_for_status()
+        return r.json()
+
+def list_issues_gql(owner: str, repo: str, token: str, pacer: RatePacer, state: str = "all"):
+    """Liste les issues (hors PRs) via GraphQL en suivant les curseurs, 100 par page."""
+    query = """
+    query($owner: String!, $repo: String!, $states: [IssueState!], $after: String) {
+      repository(owner: $owner, name: $repo) {
+        issues(first: 100, after: $after, states: $states) {
+          pageInfo { hasNextPage endCursor }
+          nodes { id number title }
+        }
+      }
+    }
+    """
+    states = None if state == "all" else [state.upper()]
+    after = None
+    while True:
+        data = gql_call(query, {"owner": owner, "repo": repo, "states": states, "after": after}, token, pacer)
+        if "errors" in data:
+            raise RuntimeError(data["errors"])
+        issues = ((data.get("data") or {}).get("repository") or {}).get("issues") or {}
+        for it in issues.get("nodes") or []:
+            yield {"node_id": it["id"], "number": it["number"], "title": (it.get("title") or "").strip()}
+        page_info = issues.get("pageInfo") or {}
+        if not page_info.get("hasNextPage"):
+            break
+        after = page_info.get("endCursor")
+
+def delete_issues_gql_batch(chunk: list, token: str, pacer: RatePacer):
+    """
+    Supprime un lot d'issues en un seul document GraphQL (mutations aliasées d0, d1, ...).
+    Retourne {node_id: None si supprimée, sinon message d'erreur}.
+    """
+    variables = {f"i{n}": it["node_id"] for n, it in enumerate(chunk)}
+    header = ", ".join(f"$i{n}: ID!" for n in range(len(chunk)))
+    body = "\n".join(
+        f"  d{n}: deleteIssue(input: {{ issueId: $i{n} }}) {{ clientMutationId }}" for n in range(len(chunk))
+    )
+    data = gql_call(f"mutation({header}) {{\n{body}\n}}", variables, token, pacer, attempts=1)
+
+    errors = {}
+    for err in data.get("errors") or []:
+        alias = (err.get("path") or [None])[0]
+        errors.setdefault(alias, err.get("message") or str(err))
+    results = {}
+    for n, it in enumerate(chunk):
+        ok = ((data.get("data") or {}).get(f"d{n}") is not None) and f"d{n}" not in errors
+        results[it["node_id"]] = None if ok else (errors.get(f"d{n}") or errors.get(None) or "suppression non confirmée")
+    return results
+
+class Checkpoint:
+    """Point de reprise JSON : liste des issues à supprimer et ids déjà supprimés (écriture atomique)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.data = {"issues": [], "done": []}
+        self._done = set()
+        self._lock = threading.Lock()
+
+    def load(self):
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.data = json.load(f)
+            self._done = set(self.data.get("done") or [])
+        return self
+
+    def pending(self):
+        return [it for it in self.data.get("issues") or [] if it["node_id"] not in self._done]
+
+    def mark_done(self, node_ids):
+        with self._lock:
+            self._done.update(node_ids)
+            self.data["done"] = sorted(self._done)
+            self.save()
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.data, f)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+def run_bulk(owner: str, repo: str, token: str, args, state: str):
+    """Mode bulk : reprise éventuelle, listing GraphQL, confirmation puis suppressions parallèles par lots."""
+    pacer = RatePacer(min_interval=args.min_interval)
+    checkpoint = Checkpoint(args.checkpoint or f".delete_issues_{owner}_{repo}.checkpoint.json")
+
+    if args.resume and os.path.exists(checkpoint.path):
+        checkpoint.load()
+        print(f"♻️ Reprise depuis {checkpoint.path}")
+    else:
+        checkpoint.data = {"repo": f"{owner}/{repo}", "state": state,
+                           "issues": list(list_issues_gql(owner, repo, token, pacer, state=state)), "done": []}
+        if not args.dry_run:
+            checkpoint.save()
+
+    issues = checkpoint.pending()
+    if not issues:
+        print("✅ Aucune issue à supprimer.")
+        checkpoint.clear()
+        return
+
+    print(f"🔎 Repo: {owner}/{repo}")
+    print(f"📌 Issues à supprimer: {len(issues)} (state={state}, lots de {args.chunk_size}, {args.workers} workers)")
+    for it in issues[:10]:
+        print(f" - #{it['number']} {it['title']}")
+    if len(issues) > 10:
+        print(f" ... +{len(issues) - 10} autres")
+
+    if args.dry_run:
+        print("🧪 DRY RUN: aucune suppression effectuée.")
+        return
+
+    if not args.yes:
+        resp = input(f"\n⚠️ Confirmer la suppression de {len(issues)} issues ? taper 'DELETE' : ")
+        if resp.strip() != "DELETE":
+            print("❌ Annulé.")
+            return
+
+    chunks = [issues[i:i + args.chunk_size] for i in range(0, len(issues), args.chunk_size)]
+    deleted = 0
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        futures = {pool.submit(delete_issues_gql_batch, chunk, token, pacer): chunk for chunk in chunks}
+        for future in as_completed(futures):
+            chunk = futures[future]
+            try:
+                results = future.result()
+            except Exception as e:
+                print(f"❌ Lot en échec ({len(chunk)} issues) : {e}", file=sys.stderr)
+                continue
+            ok = [node_id for node_id, err in results.items() if err is None]
+            checkpoint.mark_done(ok)
+            deleted += len(ok)
+            for it in chunk:
+                err = results.get(it["node_id"])
+                if err:
+                    print(f"❌ Failed #{it['number']} : {err}", file=sys.stderr)
+            print(f"🗑️ {deleted}/{len(issues)} supprimées")
+
+    if deleted == len(issues):
+        checkpoint.clear()
+        print(f"✅ Terminé. Supprimées: {deleted}/{len(issues)}")
+    else:
+        print(f"⚠️ Terminé avec erreurs. Supprimées: {deleted}/{len(issues)} — relancer avec --resume ({checkpoint.path})")
+
 def main():
     ap = argparse.ArgumentParser(description="Delete all issues in a GitHub repo (GraphQL deleteIssue).")
     ap.add_argument("--repo", default="IA-Generative/default_repository", help="owner/repo")
@@ -69,6 +288,12 @@ def main():
     ap.add_argument("--dry-run", action="store_true", help="Ne supprime rien, affiche seulement ce qui serait supprimé")
     ap.add_argument("--yes", action="store_true", help="Ne demande pas de confirmation interactive")
     ap.add_argument("--sleep", type=float, default=0.2, help="Pause entre suppressions (anti rate-limit)")
+    ap.add_argument("--bulk", action="store_true", help="Listing GraphQL + suppressions par lots en parallèle, cadencées sur les en-têtes de rate-limit")
+    ap.add_argument("--chunk-size", type=int, default=20, help="(bulk) Issues supprimées par requête GraphQL")
+    ap.add_argument("--workers", type=int, default=4, help="(bulk) Requêtes de suppression simultanées")
+    ap.add_argument("--min-interval", type=float, default=0.0, help="(bulk) Intervalle minimal entre deux requêtes (s)")
+    ap.add_argument("--checkpoint", default=None, help="(bulk) Fichier de reprise (défaut: .delete_issues_<owner>_<repo>.checkpoint.json)")
+    ap.add_argument("--resume", action="store_true", help="(bulk) Reprend depuis le fichier de reprise sans relister")
     args = ap.parse_args()
 
     token = os.getenv("GITHUB_TOKEN")
@@ -79,6 +304,10 @@ def main():
     owner, repo = args.repo.split("/", 1)
     state = "all" if args.include_closed else args.state
 
+    if args.bulk:
+        run_bulk(owner, repo, token, args, state)
+        return
+
     # Collecte issues (en excluant les PRs)
     issues = []
     for it in list_issues(owner, repo, token, state=state):
@@ -2,10 +2,17 @@ from datetime import datetime
 import logging
 
 from sync.sync_grist import (
-    grist_create_epic_objects
+    grist_create_epic_objects,
+    grist_update_epic_objects,
+    GRIST_WATERMARK_COLUMNS,
+    _parse_timestamp_to_epoch
 )
 from sync.sync_github import (
-    github_project_board_create_objects
+    github_project_board_create_objects,
+    github_push_state_from_results
+)
+from sync.sync_ratelimit import (
+    github_rate_limit_status
 )
 from sync.sync_iobeya import (
     iobeya_board_create_objects
@@ -23,9 +30,10 @@ def synchronize_all(grist_conf, iobeya_conf, github_conf, context):
     Effectue la synchronisation complète entre Grist, iObeya et GitHub.
 
     L’orchestration est pilotée par `context["action"]` (nouvelle logique UI) :
-      - "pullToGristBtn"  : iObeya/GitHub -> Grist (création des features manquantes dans Grist)
+      - "pullToGristBtn"  : iObeya/GitHub -> Grist (création des features manquantes dans Grist
+                            et mise à jour des objets modifiés : diffs "update_grist")
       - "pushToIobeyaBtn" : Grist -> iObeya
-      - "pushToGithubBtn" : Grist -> GitHub (TODO placeholder)
+      - "pushToGithubBtn" : Grist -> GitHub (création en lot des issues + rattachement au ProjectV2)
 
     Rétro-compatibilité :
       - Si `action` est absent, on retombe sur `force_overwrite` :
@@ -84,11 +92,23 @@ def synchronize_all(grist_conf, iobeya_conf, github_conf, context):
     if sync_context.get("g_list_epics") is None and session_snapshot.get("id_Epic") is not None:
         sync_context["g_list_epics"] = {"id": session_snapshot.get("id_Epic")}
 
+    # Objets GitHub lus partiellement lors de la prévisualisation : aucune action GitHub sur cette base
+    if context.get("github_read_complete") is False:
+        logger.error("❌ Lecture GitHub incomplète lors de la prévisualisation : diffs GitHub ignorés.")
+        result["details"]["github_read_incomplete"] = True
+        sync_context["github_diff"] = []
+        session_snapshot["github_diff"] = []
+
     try:
         if action == "pullToGristBtn":
             logger.info("🔁 Action: pullToGristBtn — création des features manquantes dans Grist...")
             result["details"]["steps"].append("pullToGrist")
             result["grist_synced"] = grist_create_epic_objects(grist_conf, iobeya_conf, github_conf, sync_context)
+            # Propagation des modifications (titres / descriptions) des objets déjà présents dans Grist
+            grist_updates = grist_update_epic_objects(grist_conf, sync_context)
+            result["details"]["grist_updated"] = grist_updates["updated"]
+            # Colonnes modifiées différemment côté iObeya et côté GitHub : laissées telles quelles dans Grist
+            result["details"]["grist_conflicts"] = grist_updates["conflicts"]
 
         elif action == "pushToIobeyaBtn":
             logger.info("🔁 Action: pushToIobeyaBtn — synchronisation Grist → iObeya...")
@@ -96,16 +116,23 @@ def synchronize_all(grist_conf, iobeya_conf, github_conf, context):
             result["iobeya_synced"] = iobeya_board_create_objects(iobeya_conf, sync_context)
 
         elif action == "pushToGithubBtn":
-            logger.info("🔁 Action: pushToGithubBtn — synchronisation Grist → GitHub (TODO placeholder)...")
+            logger.info("🔁 Action: pushToGithubBtn — synchronisation Grist → GitHub...")
             result["details"]["steps"].append("pushToGithub")
-            result["github_synced"] = github_project_board_create_objects(github_conf, sync_context)
+            github_results = github_project_board_create_objects(github_conf, sync_context)
+            result["github_synced"] = github_results
 
-            # TODO: implémenter l'appel réel d'export vers GitHub
-            result["github_synced"] = True
+            # État de reprise (issues créées / rattachées) à conserver en session pour une prochaine poussée
+            result["details"]["github_push_state"] = github_push_state_from_results(
+                github_results, session_snapshot.get("github_push_state")
+            )
 
         else:
             raise ValueError(f"Unknown action: {action}")
 
+        # Budget GitHub restant après la synchro (REST "core" et GraphQL)
+        if (github_conf or {}).get("api_token"):
+            result["details"]["github_rate_limit"] = github_rate_limit_status(github_conf.get("api_token"))
+
         result["status"] = "success"
         result["details"]["finished_at_utc"] = datetime.utcnow().isoformat() + "Z"
         logger.info("✅ Synchronisation terminée avec succès.")
@@ -118,12 +145,19 @@ def synchronize_all(grist_conf, iobeya_conf, github_conf, context):
 
     return result
 
-def compute_diff(grist_object, dest_object, rename_deleted=False, epic_obj=None, allowed_types=None):
+def compute_diff(grist_object, dest_object, rename_deleted=False, epic_obj=None, allowed_types=None, update_fields=("Nom",)):
     """
     compute_diff calcule à partir d’une clé composite (type, id_Num, Nom)
     les opérations minimales nécessaires pour synchroniser Grist avec un système cible
     en appliquant un filtrage strict par type et une gestion optionnelle des suppressions logiques.
     Returns a list of diffs avec un type d'action tel que :"create","update_grist","not_present","none"
+
+    update_grist : objet présent des deux côtés (même clé, ou même (type, pi_Num, id_Num) avec un
+    Nom différent = objet renommé) dont au moins un champ de `update_fields` diffère ; le diff porte
+    l'id Grist ("id") et uniquement les colonnes modifiées ("fields"). Les champs absents (None)
+    de l'objet cible ne sont pas comparés. Le diff n'est émis que si l'objet cible a été modifié
+    après l'objet Grist (horodatages comparés) : une modification faite dans Grist (renommage...)
+    n'est pas écrasée par l'ancienne valeur de la cible.
     """
 
     #    Notes: 
@@ -156,9 +190,24 @@ def compute_diff(grist_object, dest_object, rename_deleted=False, epic_obj=None,
     # Conclude building lookup dicts
     all_ids = set(grist_dict.keys()) | set(dest_dict.keys())
 
+    # Objets renommés : même (type, pi_Num, id_Num) mais Nom différent => appariés pour une mise à jour
+    dest_only_by_num = {}
+    for k, item in dest_dict.items():
+        num_key = _item_num_key(item) if k not in grist_dict else None
+        if num_key:
+            dest_only_by_num.setdefault(num_key, k)
+    renamed = {}
+    for k, item in grist_dict.items():
+        num_key = _item_num_key(item) if k not in dest_dict else None
+        if num_key and num_key in dest_only_by_num:
+            renamed[k] = dest_only_by_num.pop(num_key)
+    renamed_dest_keys = set(renamed.values())
+
     for fid in all_ids:
+        if fid in renamed_dest_keys:
+            continue  # traité avec l'objet Grist apparié
         g_objects = grist_dict.get(fid)
-        d_objects = dest_dict.get(fid)
+        d_objects = dest_dict.get(renamed[fid]) if fid in renamed else dest_dict.get(fid)
 
         # Case 1: present in Grist only => create in dest
         if g_objects and not d_objects:
@@ -190,6 +239,14 @@ def compute_diff(grist_object, dest_object, rename_deleted=False, epic_obj=None,
             if epic_obj:
                 g_objects["id_Epic"] = epic_obj.get("id_Epic") if isinstance(epic_obj, dict) else "" # on ajoute la liaison avec l'epic dans le nouvel objet
 
+            changes = _changed_fields(g_objects, d_objects, update_fields)
+            if changes and not _dest_is_newer(g_objects, d_objects):
+                logger.debug(f"⏭️ {g_objects.get('Nom')} : modifié côté Grist (ou date inconnue), pas de update_grist.")
+                changes = {}
+            if changes:
+                diff_list.append({"action": "update_grist", "Nom": d_objects.get("Nom"), "type": g_objects.get("type"), "id_Num": g_objects.get("id_Num"), "id_Epic": g_objects.get("id_Epic"), "id": g_objects.get("id"), "fields": changes})
+                continue
+
             diff_list.append({"action": "none","Nom": g_objects.get("Nom"), "type": g_objects.get("type"), "id_Num": g_objects.get("id_Num"), "id_Epic": g_objects.get("id_Epic")})
 
     # Stats summary
@@ -259,3 +316,59 @@ def _get_item_num(item: dict) -> str:
 def _normalize_type(t: str) -> str:
     """Normalize type values for matching (case/spacing)."""
     return str(t).strip().lower()
+
+def _item_num_key(item: dict) -> tuple:
+    """(type, pi_Num, id_Num) of an item with a real numeric id, or () when it cannot be matched by number."""
+    item_type = _get_item_type(item)
+    try:
+        item_num = int(float(item.get("id_Num")))
+    except (TypeError, ValueError):
+        return ()
+    if not item_type or item_num <= 0:
+        return ()
+    try:
+        pi_num = int(float(item.get("pi_Num")))
+    except (TypeError, ValueError):
+        pi_num = 0
+    return (item_type, pi_num, item_num)
+
+def _changed_fields(grist_item: dict, dest_item: dict, fields) -> dict:
+    """Columns of `fields` whose destination value differs from Grist (whitespace-insensitive,
+    case-insensitive for `Nom` as in the name matching)."""
+    changes = {}
+    for field in fields or ():
+        if field != "Nom" and dest_item.get("details_loaded") is False:
+            continue  # objet lu sans détails (profil GitHub "lean") : seul le titre est fiable
+        value = dest_item.get(field)
+        if value is None or (isinstance(value, float) and value != value):
+            continue
+        current, proposed = _normalize_text(grist_item.get(field)), _normalize_text(value)
+        if field == "Nom":
+            current, proposed = current.lower(), proposed.lower()
+        if proposed != current:
+            changes[field] = value
+    return changes
+
+def _last_update_epoch(item: dict, keys) -> Optional[float]:
+    """First parsable timestamp among `keys` (epoch seconds), None if none is usable."""
+    for key in keys:
+        ts = _parse_timestamp_to_epoch(item.get(key))
+        if ts is not None and ts == ts:  # NaN (colonnes pandas vides) ignoré
+            return ts
+    return None
+
+def _dest_is_newer(grist_item: dict, dest_item: dict) -> bool:
+    """True if the destination object was modified after the Grist record.
+
+    Grist side: a real modification column if any, else `timestamp` (set from the source at creation).
+    Unknown timestamps on either side: False (no way to tell which side changed).
+    """
+    grist_ts = _last_update_epoch(grist_item, GRIST_WATERMARK_COLUMNS + ("timestamp",))
+    dest_ts = _last_update_epoch(dest_item, ("timestamp", "updatedAt"))
+    return grist_ts is not None and dest_ts is not None and dest_ts > grist_ts
+
+def _normalize_text(value) -> str:
+    """Normalize free text for comparison (None/NaN as empty, collapsed whitespace)."""
+    if value is None or (isinstance(value, float) and value != value):
+        return ""
+    return " ".join(str(value).split())
@@ -9,9 +9,20 @@ import yaml
 from datetime import datetime, timezone
 import logging
 import json
+import hmac
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+try:
+    import fcntl  # verrou des instantanés entre workers (indisponible sous Windows)
+except ImportError:
+    fcntl = None
 
 # --- Import des fonctions utilitaires ---
 from sync.sync_utils import extract_id_and_clean_for_kind
+from sync.sync_ratelimit import github_rate_limiter, MAX_ATTEMPTS as GITHUB_RATE_LIMIT_MAX_ATTEMPTS
 
 # --- Activation et configuration des logs ---
 logging.basicConfig(
@@ -25,6 +36,19 @@ config_path = "config.yaml" if os.path.exists("config.yaml") else "config.exampl
 with open(config_path, "r") as f:
     config = yaml.safe_load(f)
 
+# Catalogue des ProjectsV2 : taille de page, durée de fraîcheur du cache (s) et parallélisme entre organisations
+GITHUB_PROJECTS_PAGE_SIZE = 50
+GITHUB_PROJECTS_CACHE_TTL = float((config.get("github", {}) or {}).get("projects_cache_ttl", 300))
+GITHUB_PROJECTS_MAX_WORKERS = 4
+
+
+class GithubIncompleteReadError(Exception):
+    """Lecture d'un ProjectV2 interrompue en cours de pagination (erreur GraphQL ou réseau).
+
+    Les pages déjà lues ne représentent pas tout le projet : elles ne doivent pas être comparées
+    à Grist (les items manquants seraient vus comme absents et recréés).
+    """
+
 
 ########### 
 ###########  Methodes pour gérer les interactions avec Github  ###########
@@ -38,351 +62,1278 @@ def github_get_organizations(organizations):
 
 # récupération de la liste des projets GitHub (Projects V2) via GraphQL
 
+_GITHUB_ORG_PROJECTS_QUERY = """
+query($org: String!, $first: Int!, $after: String) {
+  organization(login: $org) {
+    projectsV2(first: $first, after: $after) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        id
+        title
+        shortDescription
+        number
+      }
+    }
+  }
+}
+"""
+
 def github_get_projects(github_token,org_name): 
     
     if not github_token or not org_name:
         logger.error("❌ Token GitHub manquant ou non défini dans l'environnement")
         return []    
-    
-    # --- Requête GraphQL pour les ProjectsV2 ---
-    graphql_query = {
-        "query": f"""
-        query {{
-          organization(login: "{org_name}") {{
-            projectsV2(first: 20) {{
-              nodes {{
-                id
-                title
-                shortDescription
-                number
-              }}
-            }}
-          }}
-        }}
-        """
-    }
-
-    headers = {
-        "Authorization": f"Bearer {github_token}",
-        "Accept": "application/vnd.github+json"
-    }
 
     try:
-        response = requests.post(
-            "https://api.github.com/graphql",
-            headers=headers,
-            json=graphql_query,
+        return _github_fetch_org_projects(github_token, org_name)
+
+    except requests.RequestException as e:  
+        logger.error(f"❌ Erreur API GitHub : {e}")
+        return []
+
+def _github_fetch_org_projects(github_token, org_name, page_size=GITHUB_PROJECTS_PAGE_SIZE):
+    """
+    Liste complète (triée par nom) des ProjectsV2 d'une organisation, en suivant les curseurs.
+
+    Lève requests.RequestException en cas d'erreur HTTP (le cache conserve alors l'ancienne valeur).
+    """
+    project_list = []
+    cursor = None
+    while True:
+        data = _github_graphql(
+            github_token,
+            _GITHUB_ORG_PROJECTS_QUERY,
+            {"org": org_name, "first": page_size, "after": cursor},
             timeout=10
         )
-        response.raise_for_status()
-        data = response.json()
 
         # Extraire les projets
-        org_data = data.get("data", {}).get("organization")
-        
+        org_data = (data.get("data") or {}).get("organization")
         if not org_data:
             logger.warning(f"⚠️ Aucune organisation trouvée : {org_name}")
             return []
 
-        projects = org_data.get("projectsV2", {}).get("nodes", [])
-        
-        project_list = [
-            {
+        connection = org_data.get("projectsV2") or {}
+        for p in connection.get("nodes") or []:
+            if not p:
+                continue
+            project_list.append({
                 "id": p.get("id"),
                 "name": p.get("title"),
                 "description": p.get("shortDescription"),
                 "number": p.get("number")
-            }
-            for p in projects
-        ]
+            })
 
-        # Tri alpha sur le nom du projet (insensible à la casse)
-        project_list_sorted = sorted(
-            project_list,
-            key=lambda p: ((p.get("name") or "").strip().lower(), (p.get("id") or ""))
-        )
+        page_info = connection.get("pageInfo") or {}
+        if not page_info.get("hasNextPage"):
+            break
+        cursor = page_info.get("endCursor")
 
-        return project_list_sorted
+    # Tri alpha sur le nom du projet (insensible à la casse)
+    return sorted(
+        project_list,
+        key=lambda p: ((p.get("name") or "").strip().lower(), (p.get("id") or ""))
+    )
 
-    except requests.RequestException as e:  
-        logger.error(f"❌ Erreur API GitHub : {e}")
+
+class GithubProjectCatalog:
+    """
+    Catalogue des ProjectsV2 par organisation, partagé par les requêtes de l'application.
+
+    - Une entrée fraîche (âge < ttl) est servie directement.
+    - Une entrée périmée est servie immédiatement et rafraîchie en arrière-plan
+      (stale-while-revalidate) ; un seul rafraîchissement par organisation à la fois.
+    - Une organisation absente du cache est chargée de façon synchrone.
+    - warm() charge toutes les organisations configurées en parallèle.
+    """
+
+    def __init__(self, github_token, ttl=GITHUB_PROJECTS_CACHE_TTL, max_workers=GITHUB_PROJECTS_MAX_WORKERS):
+        self.github_token = github_token
+        self.ttl = float(ttl)
+        self.max_workers = max(1, int(max_workers))
+        self._entries = {}       # org -> (monotonic, projets)
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def get(self, org_name, force_refresh=False):
+        """Projets de l'organisation (liste triée) ; [] si l'organisation n'a jamais pu être chargée."""
+        with self._lock:
+            entry = self._entries.get(org_name)
+
+        if entry is None or force_refresh:
+            return self._refresh(org_name)
+
+        if time.monotonic() - entry[0] >= self.ttl:
+            self._refresh_in_background(org_name)
+        return entry[1]
+
+    def warm(self, organizations, wait=True):
+        """Charge (ou recharge) les organisations en parallèle ; en tâche de fond si wait=False."""
+        organizations = [o for o in (organizations or []) if o]
+        if not organizations:
+            return
+
+        def _warm():
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(organizations))) as pool:
+                list(pool.map(self._refresh, organizations))
+            logger.info(f"🗂️ Catalogue GitHub préchargé : {len(organizations)} organisation(s).")
+
+        if wait:
+            _warm()
+        else:
+            threading.Thread(target=_warm, name="github-catalog-warm", daemon=True).start()
+
+    def _refresh(self, org_name):
+        try:
+            projects = _github_fetch_org_projects(self.github_token, org_name)
+        except requests.RequestException as e:
+            logger.error(f"❌ Erreur API GitHub ({org_name}) : {e}")
+            # On conserve la valeur périmée plutôt que de vider la liste
+            with self._lock:
+                entry = self._entries.get(org_name)
+            return entry[1] if entry else []
+
+        with self._lock:
+            self._entries[org_name] = (time.monotonic(), projects)
+        return projects
+
+    def _refresh_in_background(self, org_name):
+        with self._lock:
+            if org_name in self._refreshing:
+                return
+            self._refreshing.add(org_name)
+
+        def _run():
+            try:
+                self._refresh(org_name)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(org_name)
+
+        threading.Thread(target=_run, name=f"github-catalog-{org_name}", daemon=True).start()
+
+
+_github_project_catalogs = {}
+_github_project_catalogs_lock = threading.Lock()
+
+
+def github_project_catalog(github_token):
+    """Retourne le catalogue de projets partagé pour un token GitHub."""
+    with _github_project_catalogs_lock:
+        catalog = _github_project_catalogs.get(github_token)
+        if catalog is None:
+            catalog = _github_project_catalogs[github_token] = GithubProjectCatalog(github_token)
+    return catalog
+
+
+def github_get_projects_cached(github_token, org_name, force_refresh=False):
+    """Projets d'une organisation servis depuis le catalogue en cache (voir GithubProjectCatalog)."""
+    if not github_token or not org_name:
+        logger.error("❌ Token GitHub manquant ou non défini dans l'environnement")
         return []
+    return github_project_catalog(github_token).get(org_name, force_refresh=force_refresh)
 
 ###
 ### Crud des données des projets GitHub Issues via REST API v3
 ###
 
-def github_get_project_objects(projectId, github_token):
+# Taille des pages GraphQL (items du projet et pages complémentaires de commentaires / champs)
+GITHUB_ITEMS_PAGE_SIZE = 50
+GITHUB_NESTED_PAGE_SIZE = 100
+# Nombre d'issues par document GraphQL de mutations aliasées
+GITHUB_MUTATION_CHUNK_SIZE = 20
+# Nombre maximal de documents de mutations envoyés en parallèle vers un même dépôt
+GITHUB_MAX_IN_FLIGHT = 4
+
+# Champs d'un item de projet (fragment partagé par la lecture paginée et la relecture ciblée par ids)
+_GITHUB_PROJECT_ITEM_FRAGMENT = """
+fragment ProjectItemFields on ProjectV2Item {
+  id
+  updatedAt
+  fieldValues(first: 20) {
+    pageInfo { hasNextPage endCursor }
+    nodes {
+      ... on ProjectV2ItemFieldTextValue {
+        text
+        field { ... on ProjectV2FieldCommon { name } }
+      }
+      ... on ProjectV2ItemFieldDateValue {
+        date
+        field { ... on ProjectV2FieldCommon { name } }
+      }
+      ... on ProjectV2ItemFieldSingleSelectValue {
+        name
+        field { ... on ProjectV2FieldCommon { name } }
+      }
+    }
+  }
+  content {
+    __typename
+    ... on DraftIssue {
+      title
+      body
+      createdAt
+      updatedAt            # last-modified timestamp for the issue
+    }
+    ... on Issue {
+      id
+      databaseId
+      number
+      title
+      body
+      createdAt
+      updatedAt            # last-modified timestamp for the issue
+      repository {
+        nameWithOwner
+      }
+      comments(first: 20) {
+        totalCount
+        pageInfo { hasNextPage endCursor }
+        nodes {
+          body
+          bodyText     # rendered to plain text
+          author { login }
+          createdAt
+          updatedAt
+        }
+      }
+      assignees(first: 10) { nodes { login } }
+    }
+    ... on PullRequest {
+      id
+      databaseId
+      number
+      title
+      body
+      createdAt
+      updatedAt            # last-modified timestamp for the issue
+      comments(first: 20) {
+        totalCount
+        pageInfo { hasNextPage endCursor }
+        nodes {
+          body
+          bodyText     # rendered to plain text
+          author { login }
+          createdAt
+          updatedAt
+        }
+      }
+      assignees(first: 10) { nodes { login } }
+    }
+  }
+}
+"""
+
+_GITHUB_PROJECT_ITEMS_QUERY = _GITHUB_PROJECT_ITEM_FRAGMENT + """
+query($projectId: ID!, $first: Int!, $after: String) {
+  node(id: $projectId) {
+    ... on ProjectV2 {
+      id
+      title
+      items(first: $first, after: $after) {
+        pageInfo { hasNextPage endCursor }
+        nodes { ...ProjectItemFields }
+      }
+    }
+  }
+}
+"""
+
+# Profil "lean" : uniquement ce qu'il faut pour le diff (titre, identifiants, horodatages),
+# sans corps, commentaires ni assignees. Les détails sont relus à la demande (github_load_object_details).
+_GITHUB_PROJECT_ITEM_LEAN_FRAGMENT = """
+fragment ProjectItemLeanFields on ProjectV2Item {
+  id
+  updatedAt
+  fieldValues(first: 20) {
+    pageInfo { hasNextPage endCursor }
+    nodes {
+      ... on ProjectV2ItemFieldTextValue {
+        text
+        field { ... on ProjectV2FieldCommon { name } }
+      }
+    }
+  }
+  content {
+    __typename
+    ... on DraftIssue { title updatedAt }
+    ... on Issue {
+      id
+      databaseId
+      number
+      title
+      updatedAt
+      repository { nameWithOwner }
+    }
+    ... on PullRequest {
+      id
+      databaseId
+      number
+      title
+      updatedAt
+    }
+  }
+}
+"""
+
+_GITHUB_PROJECT_ITEMS_LEAN_QUERY = _GITHUB_PROJECT_ITEM_LEAN_FRAGMENT + """
+query($projectId: ID!, $first: Int!, $after: String) {
+  node(id: $projectId) {
+    ... on ProjectV2 {
+      id
+      title
+      items(first: $first, after: $after) {
+        pageInfo { hasNextPage endCursor }
+        nodes { ...ProjectItemLeanFields }
+      }
+    }
+  }
+}
+"""
+
+# Profils de lecture : "full" (corps + commentaires) ou "lean" (diff seulement)
+GITHUB_FETCH_PROFILES = ("full", "lean")
+
+_GITHUB_ITEM_FIELD_VALUES_QUERY = """
+query($itemId: ID!, $first: Int!, $after: String) {
+  node(id: $itemId) {
+    ... on ProjectV2Item {
+      fieldValues(first: $first, after: $after) {
+        pageInfo { hasNextPage endCursor }
+        nodes {
+          ... on ProjectV2ItemFieldTextValue {
+            text
+            field { ... on ProjectV2FieldCommon { name } }
+          }
+          ... on ProjectV2ItemFieldDateValue {
+            date
+            field { ... on ProjectV2FieldCommon { name } }
+          }
+          ... on ProjectV2ItemFieldSingleSelectValue {
+            name
+            field { ... on ProjectV2FieldCommon { name } }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+_GITHUB_CONTENT_COMMENTS_QUERY = """
+query($contentId: ID!, $first: Int!, $after: String) {
+  node(id: $contentId) {
+    ... on Issue {
+      comments(first: $first, after: $after) {
+        pageInfo { hasNextPage endCursor }
+        nodes { body author { login } createdAt updatedAt }
+      }
+    }
+    ... on PullRequest {
+      comments(first: $first, after: $after) {
+        pageInfo { hasNextPage endCursor }
+        nodes { body author { login } createdAt updatedAt }
+      }
+    }
+  }
+}
+"""
+
+
+def github_get_project_objects(projectId, github_token, profile="full"):
     """
     Version compatible GitHub API v4 (GraphQL) fin 2024 / 2025.
     Récupère correctement les titres et descriptions des items Projects V2.
     Utilise extract_feature_id_and_clean() pour extraire Nom_Feature et id_feature.
+
+    Wrapper liste autour de github_iter_project_objects() (tous les items, toutes les pages).
+    Lève GithubIncompleteReadError si la lecture est interrompue.
     """
-    import requests, re
+    objects = []
+    for page in github_iter_project_objects(projectId, github_token, profile=profile):
+        objects.extend(page)
 
+    print(f"✅ {len(objects)} items récupérés depuis GitHub.")
+    return objects
+
+
+def github_iter_project_objects(projectId, github_token, page_size=GITHUB_ITEMS_PAGE_SIZE, profile="full"):
+    """
+    Générateur : parcourt les items d'un ProjectV2 page par page en suivant `pageInfo.endCursor`
+    et produit, pour chaque page, la liste des objets normalisés (Features / Issues).
+
+    Les commentaires (et les valeurs de champs si le titre en dépend) au-delà de la première
+    page sont récupérés via des requêtes complémentaires sur le noeud concerné.
+    Seule la page brute courante est conservée en mémoire (les objets normalisés, plus légers,
+    sont accumulés par l'appelant). Le diff, lui, ne peut pas être calculé au fil des pages :
+    compute_diff doit connaître tous les items pour décider qu'un objet Grist est absent de
+    GitHub (création) ou qu'il a été renommé (appariement sur type / PI / numéro).
+    Lève GithubIncompleteReadError si une page ne peut être lue : les pages déjà produites
+    sont alors incomplètes et ne doivent pas servir au diff.
+
+    profile : "full" (corps + commentaires) ou "lean" (titre, identifiants, horodatages ;
+    objets marqués details_loaded=False, à compléter via github_load_object_details()).
+    """
     if not projectId or not github_token:
         logger.warning("⚠️ Paramètres GitHub manquants (projectId ou token).")
-        return []
-    logger.info(f"🔗 Project ID utilisé pour la requête GraphQL : {projectId}")
-    
-    url = "https://api.github.com/graphql"
-    headers = {
-        "Authorization": f"Bearer {github_token}",
-        "Accept": "application/vnd.github+json"
+        return
+    logger.info(f"🔗 Project ID utilisé pour la requête GraphQL : {projectId} (profil {profile})")
+    query = _GITHUB_PROJECT_ITEMS_LEAN_QUERY if profile == "lean" else _GITHUB_PROJECT_ITEMS_QUERY
+
+    after = None
+    page_num = 0
+
+    try:
+        while True:
+            variables = {"projectId": projectId, "first": page_size, "after": after}
+            data = _github_graphql(github_token, query, variables, timeout=15)
+            if "errors" in data:
+                logger.error(f"❌ Erreurs GraphQL (page {page_num + 1} des items du projet) : {data['errors']}")
+                raise GithubIncompleteReadError(f"lecture du projet {projectId} interrompue à la page {page_num + 1}")
+
+            items = ((data.get("data") or {}).get("node") or {}).get("items") or {}
+            nodes = items.get("nodes") or []
+            page_info = items.get("pageInfo") or {}
+            page_num += 1
+
+            page_objects = []
+            for node in nodes:
+                if not node:
+                    continue
+                _github_complete_item_pages(node, github_token)
+                obj = _github_normalize_project_item(node, details_loaded=(profile != "lean"))
+                if obj:
+                    page_objects.append(obj)
+
+            logger.debug(f"📄 Page {page_num} : {len(nodes)} items GitHub, {len(page_objects)} objets retenus.")
+            yield page_objects
+
+            if not page_info.get("hasNextPage") or not page_info.get("endCursor"):
+                break
+            after = page_info.get("endCursor")
+
+    except requests.RequestException as e:
+        logger.error(f"❌ Erreur API GitHub (page {page_num + 1} des items du projet) : {e}")
+        raise GithubIncompleteReadError(f"lecture du projet {projectId} interrompue à la page {page_num + 1}") from e
+
+
+_GITHUB_PROJECT_ITEMS_SWEEP_QUERY = """
+query($projectId: ID!, $first: Int!, $after: String) {
+  node(id: $projectId) {
+    ... on ProjectV2 {
+      items(first: $first, after: $after) {
+        pageInfo { hasNextPage endCursor }
+        nodes {
+          id
+          updatedAt
+          content {
+            ... on DraftIssue { updatedAt }
+            ... on Issue { updatedAt }
+            ... on PullRequest { updatedAt }
+          }
+        }
+      }
     }
+  }
+}
+"""
 
-    query = """
-    query($projectId: ID!) {
-    node(id: $projectId) {
-        ... on ProjectV2 {
-        id
-        title
-        items(first: 50) {
-            nodes {
-            id
-            fieldValues(first: 8) {
-                nodes {
-                ... on ProjectV2ItemFieldTextValue {
-                    text
-                    field { ... on ProjectV2FieldCommon { name } }
-                }
-                ... on ProjectV2ItemFieldDateValue {
-                    date
-                    field { ... on ProjectV2FieldCommon { name } }
-                }
-                ... on ProjectV2ItemFieldSingleSelectValue {
-                    name
-                    field { ... on ProjectV2FieldCommon { name } }
-                }
-                }
-            }
-            content {
-                __typename
-                ... on DraftIssue {
-                title
-                body
-                createdAt
-                updatedAt            # last-modified timestamp for the issue
-                }
-                ... on Issue {
-                id
-                databaseId
-                number
-                title
-                body
-                createdAt
-                updatedAt            # last-modified timestamp for the issue
-                repository {
-                    nameWithOwner
-                }
-                comments(first: 20) {
-                    totalCount
-                    pageInfo { hasNextPage endCursor }
-                    nodes {
-                        body
-                        bodyText     # rendered to plain text
-                        author { login }
-                        createdAt
-                        updatedAt            # last-modified timestamp for the issue
-                    }
+_GITHUB_PROJECT_ITEMS_BY_IDS_QUERY = _GITHUB_PROJECT_ITEM_FRAGMENT + """
+query($ids: [ID!]!) {
+  nodes(ids: $ids) { ...ProjectItemFields }
+}
+"""
+
+_GITHUB_PROJECT_ITEMS_BY_IDS_LEAN_QUERY = _GITHUB_PROJECT_ITEM_LEAN_FRAGMENT + """
+query($ids: [ID!]!) {
+  nodes(ids: $ids) { ...ProjectItemLeanFields }
+}
+"""
+
+# Répertoire des instantanés locaux des projets GitHub (lecture incrémentale)
+GITHUB_SNAPSHOT_DIR = os.path.join((config.get("run", {}) or {}).get("output_dir", "data"), "github_snapshots")
+# Intervalle (s) au-delà duquel le miroir webhook est réconcilié par un balayage incrémental
+GITHUB_MIRROR_RECONCILE_INTERVAL = float((config.get("github", {}) or {}).get("mirror_reconcile_interval", 3600))
+
+
+def github_get_project_objects_incremental(projectId, github_token, profile="full"):
+    """
+    Lecture incrémentale des items d'un ProjectV2 à partir d'un instantané local persistant.
+
+    1) Balayage léger (ids + updatedAt de l'item et de son contenu, 100 items par page) ;
+    2) relecture complète (`nodes(ids:)`) des seuls items nouveaux ou modifiés depuis le
+       dernier passage (updatedAt postérieur au watermark ou différent de l'instantané) ;
+    3) les items absents du balayage sont supprimés de l'instantané.
+
+    Un projet inchangé ne coûte donc que le balayage. Retourne la même liste d'objets que
+    github_get_project_objects() pour le même profil ; un changement de profil invalide l'instantané.
+    Lève GithubIncompleteReadError si le balayage ou la relecture d'un item modifié échoue
+    (l'instantané n'est alors pas modifié).
+    """
+    if not projectId or not github_token:
+        logger.warning("⚠️ Paramètres GitHub manquants (projectId ou token).")
+        return []
+
+    snapshot = _github_snapshot_load(projectId)
+    if snapshot.get("profile", "full") != profile:
+        snapshot = {"project_id": projectId, "watermark": "", "items": {}}
+    snapshot["profile"] = profile
+    items = snapshot.get("items", {})
+    by_ids_query = _GITHUB_PROJECT_ITEMS_BY_IDS_LEAN_QUERY if profile == "lean" else _GITHUB_PROJECT_ITEMS_BY_IDS_QUERY
+    watermark = snapshot.get("watermark") or ""
+
+    try:
+        # 1) Balayage des ids / updatedAt
+        seen = {}
+        after = None
+        while True:
+            data = _github_graphql(
+                github_token,
+                _GITHUB_PROJECT_ITEMS_SWEEP_QUERY,
+                {"projectId": projectId, "first": 100, "after": after},
+                timeout=15,
+            )
+            if "errors" in data:
+                logger.error(f"❌ Erreurs GraphQL (balayage des items du projet) : {data['errors']}")
+                raise GithubIncompleteReadError(f"balayage du projet {projectId} interrompu")
+            page = ((data.get("data") or {}).get("node") or {}).get("items") or {}
+            for node in page.get("nodes") or []:
+                if node and node.get("id"):
+                    seen[node["id"]] = max(node.get("updatedAt") or "", ((node.get("content") or {}).get("updatedAt")) or "")
+            page_info = page.get("pageInfo") or {}
+            if not page_info.get("hasNextPage") or not page_info.get("endCursor"):
+                break
+            after = page_info.get("endCursor")
+
+        # 2) Relecture des items nouveaux / modifiés
+        changed = [
+            item_id for item_id, updated in seen.items()
+            if item_id not in items or updated > watermark or updated != items[item_id].get("updatedAt")
+        ]
+        for start in range(0, len(changed), GITHUB_ITEMS_PAGE_SIZE):
+            data = _github_graphql(
+                github_token,
+                by_ids_query,
+                {"ids": changed[start:start + GITHUB_ITEMS_PAGE_SIZE]},
+                timeout=15,
+            )
+            if "errors" in data:
+                logger.error(f"❌ Erreurs GraphQL (relecture des items) : {data['errors']}")
+                raise GithubIncompleteReadError(f"relecture des items du projet {projectId} interrompue")
+            nodes = [node for node in (data.get("data") or {}).get("nodes") or [] if node and node.get("id")]
+            missing = set(changed[start:start + GITHUB_ITEMS_PAGE_SIZE]) - {node["id"] for node in nodes}
+            if missing:
+                # un item modifié non relu serait absent du diff (et recréé) : lecture incomplète
+                logger.error(f"❌ {len(missing)} item(s) modifié(s) non relu(s) : {sorted(missing)}")
+                raise GithubIncompleteReadError(f"relecture des items du projet {projectId} incomplète")
+            for node in nodes:
+                _github_complete_item_pages(node, github_token)
+                items[node["id"]] = {
+                    "updatedAt": seen.get(node["id"], ""),
+                    "object": _github_normalize_project_item(node, details_loaded=(profile != "lean")),
                 }
-                assignees(first: 10) { nodes { login } }
+
+        # 3) Suppressions : items qui ne sont plus dans le projet
+        removed = [item_id for item_id in items if item_id not in seen]
+        for item_id in removed:
+            items.pop(item_id, None)
+
+    except requests.RequestException as e:
+        logger.error(f"❌ Erreur API GitHub (lecture incrémentale) : {e}")
+        raise GithubIncompleteReadError(f"lecture incrémentale du projet {projectId} interrompue") from e
+
+    snapshot["items"] = items
+    snapshot["watermark"] = max(seen.values(), default=watermark)
+    snapshot["swept_at"] = time.time()
+    with _github_snapshot_locked(projectId):
+        _github_snapshot_save(projectId, snapshot)
+
+    objects = [entry["object"] for entry in items.values() if entry.get("object")]
+    logger.info(
+        f"✅ {len(objects)} items GitHub (incrémental) : {len(changed)} relus, {len(removed)} supprimés, "
+        f"{len(seen) - len(changed)} inchangés."
+    )
+    return objects
+
+
+###
+### Miroir local des items de projet alimenté par les webhooks GitHub
+###
+
+_github_snapshot_lock = threading.Lock()
+
+
+def github_webhook_verify_signature(secret, body, signature_header):
+    """Vérifie l'en-tête X-Hub-Signature-256 ("sha256=<hex>") d'une livraison de webhook GitHub."""
+    if not secret or not signature_header or not signature_header.startswith("sha256="):
+        return False
+    expected = hmac.new(secret.encode("utf-8"), body or b"", hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature_header[len("sha256="):])
+
+
+def github_get_project_objects_from_mirror(projectId, reconcile_interval=GITHUB_MIRROR_RECONCILE_INTERVAL):
+    """
+    Objets du miroir local d'un ProjectV2 (même forme que github_get_project_objects()) ;
+    [] pour un miroir vide (projet sans items).
+
+    Retourne None si le miroir n'est pas utilisable tel quel et doit être (re)constitué par
+    github_get_project_objects_incremental : aucun miroir pour ce projet, items en attente de
+    relecture (webhook reçu mais relecture échouée ou sans token), ou dernier balayage plus ancien
+    que `reconcile_interval` (événements de webhook perdus).
+    """
+    snapshot = _github_mirror_load(projectId)
+    items = snapshot.get("items")
+    if items is None:
+        return None
+    unresolved = [item_id for item_id, entry in items.items() if not entry.get("updatedAt")]
+    if unresolved:
+        logger.info(f"🔄 Miroir GitHub : {len(unresolved)} item(s) à relire, balayage incrémental.")
+        return None
+    if time.time() - float(snapshot.get("swept_at") or 0) >= float(reconcile_interval):
+        logger.info("🔄 Miroir GitHub à réconcilier (dernier balayage trop ancien), balayage incrémental.")
+        return None
+    return [entry["object"] for entry in items.values() if entry.get("object")]
+
+
+def github_mirror_apply_event(event, payload, github_token=None):
+    """
+    Applique un événement de webhook GitHub au miroir local (instantanés de github_get_project_objects_incremental).
+
+      - projects_v2_item : created / edited / restored / converted / reordered → l'item est relu
+        (`nodes(ids:)`, une seule requête) si un token est fourni ; sans token ou en cas d'échec il est
+        marqué à relire, et github_get_project_objects_from_mirror impose alors un balayage
+        incrémental ; deleted / archived → l'item est retiré du miroir.
+      - issues : edited / closed / reopened / labeled... → les items qui portent l'issue sont mis à jour
+        localement depuis le payload (titre, numéro, dépôt) ; deleted / transferred → retirés.
+
+    Seuls les projets dont un miroir existe déjà sont modifiés. Aucun appel à GitHub n'est fait
+    sans token : l'application d'un payload enregistré est donc testable hors ligne.
+    Retourne un résumé {"event", "action", "applied": nombre d'items touchés}.
+    """
+    payload = payload or {}
+    action = payload.get("action", "")
+    applied = 0
+
+    if event == "projects_v2_item":
+        applied = _github_mirror_apply_project_item(action, payload.get("projects_v2_item") or {}, github_token)
+    elif event == "issues":
+        applied = _github_mirror_apply_issue(action, payload.get("issue") or {}, payload.get("repository") or {})
+    else:
+        logger.debug(f"🔕 Événement GitHub ignoré : {event}")
+
+    logger.info(f"📬 Webhook GitHub {event}/{action} : {applied} item(s) du miroir mis à jour.")
+    return {"event": event, "action": action, "applied": applied}
+
+
+def _github_mirror_apply_project_item(action, item, github_token):
+    project_id = item.get("project_node_id")
+    item_id = item.get("node_id")
+    if not project_id or not item_id:
+        return 0
+
+    snapshot = _github_mirror_load(project_id)
+    if snapshot.get("items") is None:
+        return 0  # pas de miroir pour ce projet : il sera constitué par la prochaine lecture
+
+    # Relecture de l'item hors verrou : une réponse GitHub lente ne bloque ni les autres webhooks
+    # ni les lectures incrémentales
+    entry = None
+    if github_token and action not in ("deleted", "archived"):
+        profile = snapshot.get("profile", "full")
+        query = _GITHUB_PROJECT_ITEMS_BY_IDS_LEAN_QUERY if profile == "lean" else _GITHUB_PROJECT_ITEMS_BY_IDS_QUERY
+        try:
+            data = _github_graphql(github_token, query, {"ids": [item_id]}, timeout=15)
+            if "errors" in data:
+                # entrée laissée à relire (updatedAt vide) : le miroir repassera par un balayage incrémental
+                logger.warning(f"⚠️ Erreurs GraphQL (relecture de l'item {item_id}) : {data['errors']}")
+                data = {}
+            node = ((data.get("data") or {}).get("nodes") or [None])[0]
+            if node and node.get("id"):
+                _github_complete_item_pages(node, github_token)
+                entry = {
+                    "updatedAt": max(node.get("updatedAt") or "", ((node.get("content") or {}).get("updatedAt")) or ""),
+                    "object": _github_normalize_project_item(node, details_loaded=(profile != "lean")),
                 }
-                ... on PullRequest {
-                id
-                databaseId
-                number
-                title
-                body
-                createdAt
-                updatedAt            # last-modified timestamp for the issue
-                comments(first: 20) {
-                    totalCount
-                    pageInfo { hasNextPage endCursor }
-                    nodes {
-                        body
-                        bodyText     # rendered to plain text
-                        author { login }
-                        createdAt
-                        updatedAt            # last-modified timestamp for the issue
-                    }
+        except requests.RequestException as e:
+            # updatedAt vide : l'item sera relu par le prochain balayage incrémental
+            logger.warning(f"⚠️ Relecture de l'item {item_id} impossible : {e}")
+
+    # Lecture / modification / écriture de l'instantané sous verrou (threads et workers)
+    with _github_snapshot_locked(project_id):
+        snapshot = _github_mirror_load(project_id)
+        items = snapshot.get("items")
+        if items is None:
+            return 0
+
+        if action in ("deleted", "archived"):
+            if items.pop(item_id, None) is None:
+                return 0
+        else:
+            items[item_id] = entry or {"updatedAt": "", "object": (items.get(item_id) or {}).get("object")}
+        _github_snapshot_save(project_id, snapshot)
+    return 1
+
+
+def _github_mirror_apply_issue(action, issue, repository):
+    issue_id = issue.get("node_id")
+    if not issue_id or not os.path.isdir(GITHUB_SNAPSHOT_DIR):
+        return 0
+
+    applied = 0
+    for file_name in os.listdir(GITHUB_SNAPSHOT_DIR):
+        if not file_name.endswith(".json"):
+            continue
+        project_id = _github_snapshot_load_file(os.path.join(GITHUB_SNAPSHOT_DIR, file_name)).get("project_id")
+        if not project_id:
+            continue
+
+        with _github_snapshot_locked(project_id):
+            snapshot = _github_snapshot_load(project_id)
+            items = snapshot.get("items", {})
+
+            touched = [
+                item_id for item_id, entry in items.items()
+                if (entry.get("object") or {}).get("id_Github_IssueGQL") == issue_id
+            ]
+            for item_id in touched:
+                if action in ("deleted", "transferred"):
+                    items.pop(item_id, None)
+                    continue
+                # Item reconstruit depuis le payload ; corps et commentaires relus à la demande (details_loaded=False)
+                obj = items[item_id].get("object") or {}
+                node = {
+                    "id": item_id,
+                    "updatedAt": obj.get("timestamp"),
+                    "content": {
+                        "__typename": "Issue",
+                        "id": issue_id,
+                        "databaseId": issue.get("id"),
+                        "number": issue.get("number"),
+                        "title": issue.get("title"),
+                        "state": str(issue.get("state") or "").upper() or None,
+                        "url": issue.get("html_url"),
+                        "updatedAt": issue.get("updated_at"),
+                        "repository": {"nameWithOwner": repository.get("full_name") or obj.get("nameWithOwner", "")},
+                    },
                 }
-                assignees(first: 10) { nodes { login } }
+                items[item_id] = {
+                    "updatedAt": max(items[item_id].get("updatedAt") or "", issue.get("updated_at") or ""),
+                    "object": _github_normalize_project_item(node, details_loaded=False),
                 }
-            }
-            }
-        }
-        }
-    }
-    }
+
+            if touched:
+                _github_snapshot_save(project_id, snapshot)
+                applied += len(touched)
+    return applied
+
+
+def _github_complete_item_pages(node, github_token):
     """
+    Complète sur place un item de projet dont les connexions imbriquées sont tronquées :
+      - commentaires de l'Issue / PR (pagination via endCursor),
+      - valeurs de champs, uniquement si le titre doit en être déduit (DraftIssue sans titre...).
+    """
+    content = node.get("content") or {}
+
+    comments = content.get("comments") or {}
+    page_info = comments.get("pageInfo") or {}
+    if content.get("id") and page_info.get("hasNextPage"):
+        after = page_info.get("endCursor")
+        while after:
+            data = _github_graphql(
+                github_token,
+                _GITHUB_CONTENT_COMMENTS_QUERY,
+                {"contentId": content.get("id"), "first": GITHUB_NESTED_PAGE_SIZE, "after": after},
+                timeout=15,
+            )
+            if "errors" in data:
+                logger.warning("⚠️ Erreurs GraphQL (commentaires) : %s", data["errors"])
+                break
+            more = ((data.get("data") or {}).get("node") or {}).get("comments") or {}
+            comments.setdefault("nodes", []).extend(more.get("nodes") or [])
+            more_info = more.get("pageInfo") or {}
+            after = more_info.get("endCursor") if more_info.get("hasNextPage") else None
+        comments["pageInfo"] = {"hasNextPage": False, "endCursor": None}
+
+    field_values = node.get("fieldValues") or {}
+    page_info = field_values.get("pageInfo") or {}
+    if not content.get("title") and node.get("id") and page_info.get("hasNextPage"):
+        after = page_info.get("endCursor")
+        while after:
+            data = _github_graphql(
+                github_token,
+                _GITHUB_ITEM_FIELD_VALUES_QUERY,
+                {"itemId": node.get("id"), "first": GITHUB_NESTED_PAGE_SIZE, "after": after},
+                timeout=15,
+            )
+            if "errors" in data:
+                logger.warning("⚠️ Erreurs GraphQL (fieldValues) : %s", data["errors"])
+                break
+            more = ((data.get("data") or {}).get("node") or {}).get("fieldValues") or {}
+            field_values.setdefault("nodes", []).extend(more.get("nodes") or [])
+            more_info = more.get("pageInfo") or {}
+            after = more_info.get("endCursor") if more_info.get("hasNextPage") else None
+        field_values["pageInfo"] = {"hasNextPage": False, "endCursor": None}
 
-    variables = {"projectId": projectId}
+    return node
 
-    try:
-        r = requests.post(url, headers=headers, json={"query": query, "variables": variables}, timeout=15)
-        r.raise_for_status()
-        data = r.json()
-        if "errors" in data:
-            print("⚠️ Erreurs GraphQL :", data["errors"])
-            return []
 
-        nodes = (
-            data.get("data", {})
-            .get("node", {})
-            .get("items", {})
-            .get("nodes", [])
+def _github_normalize_project_item(node, details_loaded=True):
+    """
+    Convertit un item ProjectV2 (GraphQL) en objet de synchronisation.
+    Retourne None si le titre ne correspond ni à une Feature ni à une Issue.
+    details_loaded=False pour un item lu avec le profil "lean" (sans corps ni commentaires).
+    """
+    content = node.get("content") or {}
+    typename = content.get("__typename", "Unknown")
+    title = content.get("title")
+    body = content.get("body")
+    state = content.get("state", "N/A")
+    url_issue = content.get("url", "")
+    number = content.get("number", "")
+
+    # Project item metadata
+    project_item_id = node.get("id")  # ProjectV2Item.id
+    project_item_updated_at = node.get("updatedAt")
+
+    # Content metadata (Issue/PR/DraftIssue)
+    id_Github_IssueGQL = content.get("id")  # GraphQL node id of Issue/PR/DraftIssue
+    id_Github_Issue = content.get("databaseId")  # GraphQL node id of Issue/PR/DraftIssue
+
+    timestamp_Issue = content.get("updatedAt")
+    nameWithOwner = (content.get("repository") or {}).get("nameWithOwner", "")
+
+    # Ajout récupération et concaténation des commentaires dans body
+    comments_data = (content.get("comments") or {}).get("nodes", [])
+    if comments_data:
+        comments_text = "\n".join(
+            f"[{(c.get('author') or {}).get('login', 'inconnu')}] {c.get('body', '').strip()}"
+            for c in comments_data if c.get("body")
         )
-        objects = []
-
-        for node in nodes:
-            content = node.get("content") or {}
-            typename = content.get("__typename", "Unknown")
-            title = content.get("title")
-            body = content.get("body")
-            state = content.get("state", "N/A")
-            url_issue = content.get("url", "")
-            number = content.get("number", "")
-            updated = node.get("updatedAt")
-
-            # Project item metadata
-            project_item_id = node.get("id")  # ProjectV2Item.id
-            project_item_updated_at = node.get("updatedAt")
-
-            # Content metadata (Issue/PR/DraftIssue)
-            id_Github_IssueGQL = content.get("id")  # GraphQL node id of Issue/PR/DraftIssue
-            id_Github_Issue = content.get("databaseId")  # GraphQL node id of Issue/PR/DraftIssue
-
-            timestamp_Issue = content.get("updatedAt")
-            nameWithOwner = content.get("repository", {}).get("nameWithOwner", "")
-            content_type = typename
-
-            # Ajout récupération et concaténation des commentaires dans body
-            comments_data = content.get("comments", {}).get("nodes", [])
-            if comments_data:
-                comments_text = "\n".join(
-                    f"[{c.get('author', {}).get('login', 'inconnu')}] {c.get('body', '').strip()}"
-                    for c in comments_data if c.get("body")
-                )
-                if comments_text:
-                    body = (body or "") + "\n\n---\n💬 Commentaires GitHub :\n" + comments_text
-
-            # Si pas de titre dans content, essayer de le trouver dans fieldValues
-            if not title:
-                for fv in node.get("fieldValues", {}).get("nodes", []):
-                    field = fv.get("field", {}).get("name")
-                    if field and field.lower() in ("title", "name", "nom"):
-                        title = fv.get("value")
-                    if field and field.lower() in ("description", "body", "texte"):
-                        body = body or fv.get("value")
-            
-            # Extraction de Nom_Feature et id_feature depuis le titre (et si issue idem pour body)      
-            cleaned_text, detected_kind, pi_number, item_number = extract_id_and_clean_for_kind(title, kind=None)
-
-            if detected_kind == "Issues" or detected_kind == "Features":
-                objects.append({
-                    "type": detected_kind,
-                    "id_Github": project_item_id,
-                    "id_Github_IssueGQL": id_Github_IssueGQL,
-                    "timestamp_Issue": timestamp_Issue,
-                    "id_Github_Issue": id_Github_Issue,
-                    "Nom": cleaned_text or "(Sans Nom)",
-                    **({"Description": body} if detected_kind == "Features" else {}),
-                    "id_Num": item_number,
-                    "pi_Num": pi_number,
-                    "number": number,
-                    "Etat": state,
-                    "nameWithOwner": nameWithOwner,   
-                    "Commentaires": url_issue,
-                    "timestamp": project_item_updated_at,
-                    "timestamp_Issue": timestamp_Issue
-                })
+        if comments_text:
+            body = (body or "") + "\n\n---\n💬 Commentaires GitHub :\n" + comments_text
+
+    # Si pas de titre dans content, essayer de le trouver dans fieldValues
+    if not title:
+        for fv in (node.get("fieldValues") or {}).get("nodes", []):
+            field = (fv.get("field") or {}).get("name")
+            if field and field.lower() in ("title", "name", "nom"):
+                title = fv.get("text") or fv.get("value")
+            if field and field.lower() in ("description", "body", "texte"):
+                body = body or fv.get("text") or fv.get("value")
+
+    # Extraction de Nom_Feature et id_feature depuis le titre (et si issue idem pour body)
+    cleaned_text, detected_kind, pi_number, item_number = extract_id_and_clean_for_kind(title, kind=None)
+
+    if detected_kind not in ("Issues", "Features"):
+        return None
 
-        print(f"✅ {len(objects)} items récupérés depuis GitHub.")
-        return objects
+    return {
+        "type": detected_kind,
+        "id_Github": project_item_id,
+        "id_Github_IssueGQL": id_Github_IssueGQL,
+        "id_Github_Issue": id_Github_Issue,
+        "Nom": cleaned_text or "(Sans Nom)",
+        **({"Description": body} if detected_kind == "Features" else {}),
+        "id_Num": item_number,
+        "pi_Num": pi_number,
+        "number": number,
+        "Etat": state,
+        "nameWithOwner": nameWithOwner,
+        "Commentaires": url_issue,
+        "timestamp": project_item_updated_at,
+        "timestamp_Issue": timestamp_Issue,
+        "details_loaded": details_loaded
+    }
 
-    except requests.RequestException as e:
-        print(f"❌ Erreur API GitHub : {e}")
+
+def github_load_object_details(objects, github_token, chunk_size=GITHUB_ITEMS_PAGE_SIZE):
+    """
+    Complète sur place les objets lus avec le profil "lean" (details_loaded=False) :
+    relecture complète (`nodes(ids:)`, corps + commentaires) des seuls items concernés,
+    par lots de `chunk_size` ids. Les objets déjà complets ne coûtent aucune requête.
+    Retourne la liste des objets dont les détails n'ont pas pu être chargés (erreur GraphQL
+    ou réseau, item introuvable, token absent) : ils restent marqués details_loaded=False
+    et portent la cause dans "details_error".
+    """
+    pending = {}
+    for obj in objects or []:
+        if obj and not obj.get("details_loaded", True) and obj.get("id_Github"):
+            pending.setdefault(obj["id_Github"], []).append(obj)
+    if not pending:
         return []
 
+    failed = {}  # id_Github -> cause
+    ids = list(pending)
+    if not github_token:
+        failed = {item_id: "token GitHub absent" for item_id in ids}
+    for start in range(0, len(ids) if github_token else 0, chunk_size):
+        chunk = ids[start:start + chunk_size]
+        try:
+            data = _github_graphql(github_token, _GITHUB_PROJECT_ITEMS_BY_IDS_QUERY, {"ids": chunk}, timeout=15)
+        except requests.RequestException as e:
+            logger.error(f"❌ Erreur API GitHub (détails des items) : {e}")
+            failed.update({item_id: str(e) for item_id in chunk})
+            continue
+        if "errors" in data:
+            logger.error(f"❌ Erreurs GraphQL (détails des items) : {data['errors']}")
+            failed.update({item_id: "erreur GraphQL" for item_id in chunk})
+            continue
+        loaded = set()
+        for node in (data.get("data") or {}).get("nodes") or []:
+            if not node or not node.get("id"):
+                continue
+            _github_complete_item_pages(node, github_token)
+            detailed = _github_normalize_project_item(node)
+            if not detailed:
+                continue
+            loaded.add(node["id"])
+            for obj in pending.get(node["id"], []):
+                obj.update(detailed)
+        failed.update({item_id: "item introuvable" for item_id in chunk if item_id not in loaded})
+
+    for item_id, cause in failed.items():
+        for obj in pending[item_id]:
+            obj["details_error"] = cause
+    if failed:
+        logger.error(f"❌ Détails GitHub non chargés pour {len(failed)} item(s) sur {len(ids)}.")
+    logger.info(f"🔎 Détails GitHub relus pour {len(ids) - len(failed)} item(s).")
+    return [obj for item_id in failed for obj in pending[item_id]]
+
 
 def github_project_board_create_objects(github_conf, context):
     """
-    Crée dans iObeya les cards marquées 'create' dans iobeya_diff.
+    Crée dans GitHub (issues + items du ProjectV2) les features marquées 'create' dans github_diff.
+
+    Les créations passent par le moteur en lot github_create_projet_Items_batch ; l'état par
+    feature (`github_push_state` du contexte) permet de reprendre une poussée partiellement
+    échouée sans recréer les issues déjà présentes.
+    Retourne la liste des résultats par feature (voir github_create_projet_Items_batch).
     """
     project_id = github_conf.get("project_id")
     api_key = github_conf.get("api_token")
     default_repo_full_name=github_conf.get("default_repo_full_name")
 
+    # Contexte dépôt (repo cible, labels) résolu une seule fois pour toute la synchro
+    repo_context = GithubRepoContextCache(ttl=github_conf.get("repo_context_ttl"))
+
     try:
-        created = []
-        zorder = 100  # ordre d'empilement initial
+        # Index (Nom, type) des objets Grist : une seule passe au lieu d'un parcours par entrée du diff
+        grist_index = {}
+        for f in context.get("grist_objects", []) or []:
+            grist_index.setdefault((f.get("Nom"), f.get("type")), f)
+
+        features = []
         for item in context.get("github_diff", []):
             if item.get("action") == "create":
-                feature_name = item.get("Nom")
                 # recupère l'objet feature complet depuis le grist_objects
-                feature = next((f for f in context.get("grist_objects", []) if f.get("Nom") == feature_name and f.get("type") == "Features"), None)
+                feature = grist_index.get((item.get("Nom"), "Features"))
                 
                 if feature:
-                    result = github_create_projet_Items(project_id, api_key, feature, labels="feature", repo_full_name=default_repo_full_name)
-                    if result:
-                        created.append(result)
-                        zorder -= 1
+                    features.append(feature)
+
+        results = github_create_projet_Items_batch(
+            project_id,
+            api_key,
+            features,
+            repo_full_name=default_repo_full_name,
+            repo_context=repo_context,
+            chunk_size=github_conf.get("mutation_chunk_size") or GITHUB_MUTATION_CHUNK_SIZE,
+            resume_state=context.get("github_push_state"),
+            max_in_flight=github_conf.get("max_in_flight") or GITHUB_MAX_IN_FLIGHT,
+        )
 
-        print(f"🟦 {len(created)} cards créées dans iObeya.")
-        return created
+        print(f"🟦 {sum(1 for r in results if r.get('status') != 'failed')}/{len(results)} issues créées / rattachées dans GitHub.")
+        return results
     except Exception as e:
-        logger.error(f"❌ Erreur lors de la création des cards iObeya : {e}", exc_info=True)
+        logger.error(f"❌ Erreur lors de la création des issues GitHub : {e}", exc_info=True)
         return None
 
 
-def github_create_projet_Items(project_id, github_token, feature, assignees=None, labels=None, repo_full_name=None):
+def github_create_projet_Items_batch(project_id, github_token, features, repo_full_name=None, repo_context=None,
+                                     chunk_size=GITHUB_MUTATION_CHUNK_SIZE, resume_state=None,
+                                     max_in_flight=GITHUB_MAX_IN_FLIGHT):
     """
-    Crée une issue GitHub à partir d'une donnée 'feature' standardisée.
+    Crée en lot des issues GitHub à partir de features Grist et les rattache au ProjectV2.
+
+    - Création : mutations `createIssue` aliasées, `chunk_size` issues par document GraphQL.
+    - Rattachement : mutations `addProjectV2ItemById` aliasées, dans un document de suivi par chunk.
+    - Reprise : `resume_state` ({clé feature: état}) issu d'un précédent appel ; les features déjà
+      rattachées sont ignorées et celles dont l'issue existe déjà sont seulement rattachées. Une
+      création tentée sans réponse (create_attempted_at sans issue) est d'abord recherchée par
+      titre dans le dépôt, pour ne pas créer de doublon.
+    - Concurrence : jusqu'à `max_in_flight` chunks envoyés en parallèle par dépôt cible
+      (limite partagée par toutes les poussées du process vers ce dépôt).
 
-    Args:
-        project_id (str): identifiant du projet GitHub (GraphQL node ID du ProjectV2)
-        github_token (str): jeton d'accès personnel GitHub (scope 'repo')
-        feature (dict): dictionnaire contenant les données de la feature
-        repo_full_name (str, optional): nom complet du dépôt GitHub (format "owner/repo") où créer l'issue.
-    Kwargs:
-        assignees (list, optional): liste de logins GitHub à assigner
-        labels (list, optional): liste de labels à ajouter
     Returns:
-        dict | None: Dictionnaire contenant la réponse GitHub si succès, sinon None
+        list[dict]: un résultat par feature, dans l'ordre d'entrée :
+            {"key", "Nom", "status" ("created" | "attached" | "skipped" | "failed"),
+             "issue_node_id", "issue_number", "issue_url", "project_item_id", "create_attempted_at", "error"}
     """
-    import requests
+    features = list(features or [])
+    resume_state = resume_state or {}
+    chunk_size = max(1, int(chunk_size or GITHUB_MUTATION_CHUNK_SIZE))
+    max_in_flight = max(1, int(max_in_flight or 1))
+
+    results = []
+    for feature in features:
+        key = _github_feature_key(feature)
+        previous = resume_state.get(key) or {}
+        results.append({
+            "key": key,
+            "Nom": feature.get("Nom"),
+            "status": "skipped" if previous.get("project_item_id") else "pending",
+            "issue_node_id": previous.get("issue_node_id"),
+            "issue_number": previous.get("issue_number"),
+            "issue_url": previous.get("issue_url"),
+            "project_item_id": previous.get("project_item_id"),
+            "create_attempted_at": previous.get("create_attempted_at"),
+            "error": None,
+        })
+
+    if not any(r["status"] == "pending" for r in results):
+        return results
+
+    def _fail_pending(message):
+        for r in results:
+            if r["status"] == "pending":
+                r["status"] = "failed"
+                r["error"] = message
+        return results
+
+    if not project_id or not github_token:
+        logger.error("❌ Paramètres GitHub manquants (project_id ou token) pour la création en lot.")
+        return _fail_pending("missing project_id or token")
+
+    if repo_context is None:
+        repo_context = GithubRepoContextCache()
+
+    headers = {
+        "Authorization": f"Bearer {github_token}",
+        "Accept": "application/vnd.github+json"
+    }
+
+    # Contexte dépôt : repo cible, identifiant GraphQL du repo et du label "feature" (une seule fois)
+    try:
+        effective_repo_full_name = _github_effective_repo_full_name(project_id, github_token, repo_full_name, repo_context)
+        if not effective_repo_full_name:
+            return _fail_pending("no target repository")
+        repository_id = repo_context.get_repository_id(effective_repo_full_name, github_token)
+        label = repo_context.ensure_label(
+            api_url_repo=f"https://api.github.com/repos/{effective_repo_full_name}",
+            headers=headers,
+            label_name="feature",
+            color="5319e7",  # violet
+            description="Label for features created via Grist sync",
+        )
+    except requests.exceptions.RequestException as e:
+        logger.error("❌ Impossible de résoudre le contexte du dépôt GitHub : %s", e, exc_info=True)
+        return _fail_pending(str(e))
+
+    if not repository_id:
+        return _fail_pending(f"repository not found: {effective_repo_full_name}")
+    label_ids = [label["node_id"]] if label and label.get("node_id") else []
+
+    # Reprise : une création tentée sans réponse exploitable (timeout, réponse partielle) a pu aboutir
+    # côté GitHub. On recherche d'abord l'issue de même titre créée depuis la tentative : si elle existe,
+    # elle est seulement rattachée au projet (pas de doublon).
+    uncertain = [i for i, r in enumerate(results)
+                 if r["status"] == "pending" and not r["issue_node_id"] and r["create_attempted_at"]]
+    if uncertain:
+        titles = {i: _github_build_issue_content(features[i])[0] for i in uncertain}
+        since = min(results[i]["create_attempted_at"] for i in uncertain)
+        try:
+            found = _github_find_issues_by_title(github_token, effective_repo_full_name, set(titles.values()), since)
+        except requests.exceptions.RequestException as e:
+            logger.error("❌ Vérification des issues déjà créées impossible (%s) : création reportée.", e)
+            for i in uncertain:
+                results[i]["status"] = "failed"
+                results[i]["error"] = f"existing issue lookup failed: {e}"
+            found = {}
+        for i in uncertain:
+            issue = found.get(titles[i])
+            if issue:
+                results[i].update({
+                    "issue_node_id": issue.get("id"),
+                    "issue_number": issue.get("number"),
+                    "issue_url": issue.get("url"),
+                })
+                logger.info("♻️ Issue déjà créée lors d'une tentative précédente : #%s %s", issue.get("number"), titles[i])
+
+    def _process_chunk(chunk):
+        # Un chunk ne touche que ses propres indices de `results` : l'ordre d'entrée est conservé
+        with _github_repo_semaphore(effective_repo_full_name, max_in_flight):
+            # 1) Création des issues manquantes (createIssue aliasés)
+            to_create = [i for i in chunk if not results[i]["issue_node_id"]]
+            resumed = set(chunk) - set(to_create)
+            if to_create:
+                declarations = ["$repositoryId: ID!", "$labelIds: [ID!]"]
+                fields = []
+                variables = {"repositoryId": repository_id, "labelIds": label_ids}
+                for n, i in enumerate(to_create):
+                    title, body = _github_build_issue_content(features[i])
+                    declarations += [f"$t{n}: String!", f"$b{n}: String"]
+                    variables[f"t{n}"] = title
+                    variables[f"b{n}"] = body
+                    fields.append(
+                        f"c{n}: createIssue(input: {{repositoryId: $repositoryId, title: $t{n}, body: $b{n}, labelIds: $labelIds}}) "
+                        f"{{ issue {{ id number title url }} }}"
+                    )
+                query = "mutation(" + ", ".join(declarations) + ") {\n  " + "\n  ".join(fields) + "\n}"
+
+                # horodatage de la tentative : permet de retrouver l'issue si la réponse est perdue
+                attempted_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+                for i in to_create:
+                    results[i]["create_attempted_at"] = results[i]["create_attempted_at"] or attempted_at
+
+                try:
+                    data = _github_graphql(github_token, query, variables, timeout=30)
+                except requests.exceptions.RequestException as e:
+                    logger.error("❌ Erreur lors de la création en lot des issues : %s", e, exc_info=True)
+                    data = {"errors": [{"message": str(e)}]}
+
+                payload = data.get("data") or {}
+                errors = _github_errors_by_alias(data)
+                for n, i in enumerate(to_create):
+                    issue = (payload.get(f"c{n}") or {}).get("issue") or {}
+                    if issue.get("id"):
+                        results[i].update({
+                            "issue_node_id": issue.get("id"),
+                            "issue_number": issue.get("number"),
+                            "issue_url": issue.get("url"),
+                        })
+                        logger.info("✅ Issue créée dans %s : #%s %s", effective_repo_full_name, issue.get("number"), issue.get("title"))
+                    else:
+                        results[i]["status"] = "failed"
+                        results[i]["error"] = errors.get(f"c{n}") or errors.get(None) or "createIssue failed"
+
+            # 2) Rattachement au ProjectV2 (addProjectV2ItemById aliasés)
+            to_attach = [i for i in chunk if results[i]["status"] == "pending" and results[i]["issue_node_id"]]
+            if to_attach:
+                declarations = ["$projectId: ID!"]
+                fields = []
+                variables = {"projectId": project_id}
+                for n, i in enumerate(to_attach):
+                    declarations.append(f"$c{n}: ID!")
+                    variables[f"c{n}"] = results[i]["issue_node_id"]
+                    fields.append(
+                        f"a{n}: addProjectV2ItemById(input: {{projectId: $projectId, contentId: $c{n}}}) {{ item {{ id }} }}"
+                    )
+                query = "mutation(" + ", ".join(declarations) + ") {\n  " + "\n  ".join(fields) + "\n}"
+
+                try:
+                    data = _github_graphql(github_token, query, variables, timeout=30)
+                except requests.exceptions.RequestException as e:
+                    logger.error("❌ Erreur lors du rattachement en lot au ProjectV2 : %s", e, exc_info=True)
+                    data = {"errors": [{"message": str(e)}]}
+
+                payload = data.get("data") or {}
+                errors = _github_errors_by_alias(data)
+                for n, i in enumerate(to_attach):
+                    item = (payload.get(f"a{n}") or {}).get("item") or {}
+                    if item.get("id"):
+                        results[i]["project_item_id"] = item.get("id")
+                        results[i]["status"] = "attached" if i in resumed else "created"
+                    else:
+                        # l'issue existe : une reprise ne fera que le rattachement
+                        results[i]["status"] = "failed"
+                        results[i]["error"] = errors.get(f"a{n}") or errors.get(None) or "addProjectV2ItemById failed"
+                        logger.warning("⚠️ Issue créée mais non ajoutée au ProjectV2 (project_id=%s) : %s", project_id, results[i]["key"])
+
+    pending = [i for i, r in enumerate(results) if r["status"] == "pending"]
+    chunks = [pending[start:start + chunk_size] for start in range(0, len(pending), chunk_size)]
+    if max_in_flight > 1 and len(chunks) > 1:
+        with ThreadPoolExecutor(max_workers=min(max_in_flight, len(chunks))) as pool:
+            list(pool.map(_process_chunk, chunks))
+    else:
+        for chunk in chunks:
+            _process_chunk(chunk)
+
+    failed = sum(1 for r in results if r["status"] == "failed")
+    logger.info("✅ Création en lot GitHub : %s traitées, %s en échec.", len(results), failed)
+    return results
+
+
+def github_push_state_from_results(results, previous_state=None):
+    """Construit l'état de reprise {clé feature: {issue_node_id, issue_number, issue_url, project_item_id,
+    create_attempted_at}}.
+
+    Une création tentée sans issue connue (réponse perdue) est conservée avec son horodatage :
+    la reprise recherchera l'issue avant de la recréer.
+    """
+    state = dict(previous_state or {})
+    for r in results or []:
+        if r.get("issue_node_id") or r.get("create_attempted_at"):
+            state[r["key"]] = {
+                "issue_node_id": r.get("issue_node_id"),
+                "issue_number": r.get("issue_number"),
+                "issue_url": r.get("issue_url"),
+                "project_item_id": r.get("project_item_id"),
+                "create_attempted_at": r.get("create_attempted_at"),
+            }
+    return state
+
+
+_GITHUB_REPO_ISSUES_SINCE_QUERY = """
+query($owner: String!, $name: String!, $since: DateTime!, $first: Int!, $after: String) {
+  repository(owner: $owner, name: $name) {
+    issues(first: $first, after: $after, filterBy: {since: $since}, orderBy: {field: CREATED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes { id number title url createdAt }
+    }
+  }
+}
+"""
+
+
+def _github_find_issues_by_title(github_token, repo_full_name, titles, since):
+    """
+    Issues du dépôt créées depuis `since` (ISO 8601) dont le titre est exactement dans `titles`.
+
+    Liste directe des issues du dépôt (pas l'API de recherche, dont l'index est différé) :
+    retourne {titre: issue} (la plus ancienne si plusieurs). Lève requests.RequestException
+    si la liste ne peut pas être lue en entier.
+    """
+    owner, _, name = (repo_full_name or "").partition("/")
+    found = {}
+    after = None
+    while True:
+        data = _github_graphql(
+            github_token,
+            _GITHUB_REPO_ISSUES_SINCE_QUERY,
+            {"owner": owner, "name": name, "since": since, "first": 100, "after": after},
+            timeout=15,
+        )
+        if "errors" in data:
+            raise requests.exceptions.RequestException(f"GraphQL errors: {data['errors']}")
+        issues = (((data.get("data") or {}).get("repository") or {}).get("issues")) or {}
+        nodes = issues.get("nodes") or []
+        for issue in nodes:
+            # tri par date de création décroissante : la dernière affectation est la plus ancienne
+            if issue and (issue.get("createdAt") or "") >= since and issue.get("title") in titles:
+                found[issue["title"]] = issue
+        page_info = issues.get("pageInfo") or {}
+        oldest = (nodes[-1] or {}).get("createdAt") if nodes else ""
+        if not page_info.get("hasNextPage") or not page_info.get("endCursor") or (oldest or "") < since:
+            return found
+        after = page_info.get("endCursor")
+
+
+def _github_build_issue_content(feature):
+    """Construit (titre, corps) d'une issue GitHub à partir d'une feature Grist standardisée."""
 
     # Extraction des champs
     title = feature.get("Nom", "Sans titre")
-    body = "Description: " + feature.get("Description", "")
+    body = "Description: " + (feature.get("Description") or "")
     body += "\n\n----\n"
     id_feature = feature.get("id_Num")
     pi_number = feature.get("pi_Num", "")
 
-    # Calcul des méta-infos ( TODO : mettre le calcul de l'id_feature dans une fonction utilitaire partagée )
+    # Calcul des méta-infos
     Issue_title = f"[FP{pi_number}-{id_feature}] : {title}" if id_feature else f"[Feat]: {title}"
-    hypothesis = feature.get("Hypotheses_de_gain", "")
-    criterias = feature.get("Criteres_d_acceptation", "") 
+    hypothesis = feature.get("Hypotheses_de_gain") or ""
+    criterias = feature.get("Criteres_d_acceptation") or ""
 
-    if not feature or "Nom" not in feature:
-        print("⚠️ Donnée feature invalide ou incomplète.")
-        return None
-       
-    # Déterminer le repo cible. ( priorité au repo du projet si vide on prend celui par défaut , sinon le premier repo repo_full_name.
-    repos_url, owner, name, inferred_repo_full_name = _github_get_repo(project_id, github_token)
-    effective_repo_full_name = ( inferred_repo_full_name or repo_full_name ).strip()
-    
-    if not effective_repo_full_name:
-        logger.error(
-            "❌ Impossible d'inférer le repository associé au ProjectV2 (project_id=%s). "
-            "Veuillez specifier default_repo_full_name dans la configuration ou ajouter au moins une Issue/PR dans le projet.",
-            project_id,
-        )
-        return None
-    
-   # Construire le corps de l'issue avec checklist et méta-infos    
-    
     index = 0
     
     for line in hypothesis.splitlines():
@@ -401,154 +1352,24 @@ def github_create_projet_Items(project_id, github_token, feature, assignees=None
     # Ajoute un horodatage (date + heure) du moment de création côté synchro
     now_str = datetime.now(timezone.utc).astimezone().strftime("%Y-%m-%d %H:%M:%S %Z")
     body += f"\n\n----\nCréé depuis Grist (synchro: {now_str})"
-    
-    # Label attendu (case-insensitive). GitHub conserve la casse d'origine,
-    # mais l'API labels est insensible à la casse pour la recherche.
-    label_name = "feature"
 
-    payload = {
-        "title": Issue_title,
-        "body": body.strip(),
-        "labels": [label_name]
-    }
+    return Issue_title, body.strip()
 
-    # labels additionnels passés en param (en plus de "feature")
-
-    # push des données vers GitHub via REST API v3
-    headers = {
-        "Authorization": f"Bearer {github_token}",
-        "Accept": "application/vnd.github+json"
-    }
 
+def _github_effective_repo_full_name(project_id, github_token, repo_full_name, repo_context):
+    """Repo cible : repo inféré depuis les items du ProjectV2, sinon repo par défaut ; "" si aucun."""
+    _, _, _, inferred_repo_full_name = repo_context.get_repo(project_id, github_token) or (None, None, None, None)
+    effective_repo_full_name = ( inferred_repo_full_name or repo_full_name or "" ).strip()
 
-    # Endpoints REST
-    api_url_repo = f"https://api.github.com/repos/{effective_repo_full_name}"
-    api_url_issues = f"{api_url_repo}/issues"
-
-    # S'assurer que le label existe avant création d'issue
-    try:
-        _github_ensure_label_exists(
-            api_url_repo=api_url_repo,
-            headers=headers,
-            label_name=label_name,
-            color="5319e7",  # violet
-            description="Label for features created via Grist sync",
-        )
-    except requests.exceptions.RequestException as e:
+    if not effective_repo_full_name:
         logger.error(
-            "❌ Impossible de vérifier/créer le label '%s' sur %s : %s",
-            label_name,
-            effective_repo_full_name,
-            e,
-            exc_info=True,
-        )
-        return None
-
-    try:
-        # 1) Création de l'Issue dans le repository cible
-        response = requests.post(api_url_issues, headers=headers, json=payload, timeout=15)
-        response.raise_for_status()
-        issue_data = response.json()
-
-        issue_number = issue_data.get("number")
-        issue_title = issue_data.get("title")
-        issue_node_id = issue_data.get("node_id")  # GraphQL contentId
-
-        logger.info("✅ Issue créée dans %s : #%s %s", effective_repo_full_name, issue_number, issue_title)
-
-        if not issue_node_id:
-            logger.error(
-                "❌ L'Issue créée ne contient pas de node_id (contentId) — impossible de l'ajouter au ProjectV2."
-            )
-            return issue_data
-
-        # 2) Ajout de l'Issue au ProjectV2 (item)
-        repos_url= repos_url.replace("projects", "projectsV2")
-        repos_url= repos_url.replace("https://github.com/", "https://api.github.com/")
-        #        projectsV2
-        
-        project_item_id = _github_add_issue_to_project(github_token, project_id=project_id, issue_id=issue_node_id)
-        if project_item_id:
-            logger.info("✅ Issue ajoutée au ProjectV2 (%s) : projectItemId=%s", project_id, issue_node_id)
-            issue_data["project_item_id"] = project_item_id
-        else:
-            logger.warning("⚠️ Issue créée mais non ajoutée au ProjectV2 (project_id=%s)", project_id)
-
-        return issue_data
-
-    except requests.exceptions.RequestException as e:
-        logger.error(f"❌ Erreur lors de la création de l'issue GitHub : {e}", exc_info=True)
-        return None
-
-
-def _github_add_issue_to_project(github_token: str, project_id: str, issue_id: str) -> str:
-    """Add an Issue (contentId / node_id) to a ProjectV2 and return the created project item id.
-
-    Notes:
-      - For Projects V2, adding content MUST be done via GraphQL mutation `addProjectV2ItemById`.
-      - `project_id` is the GraphQL node ID of the ProjectV2.
-      - `issue_id` is the GraphQL node ID of the Issue (contentId).
-
-    Returns:
-      - projectItemId (str) on success
-      - "" (empty string) on failure
-    """
-
-    url = "https://api.github.com/graphql"
-
-    headers = {
-        "Authorization": f"Bearer {github_token}",
-        "Accept": "application/vnd.github+json",
-        "X-GitHub-Api-Version": "2022-11-28",
-    }
-
-    query = """
-    mutation($projectId: ID!, $contentId: ID!) {
-      addProjectV2ItemById(
-        input: {
-          projectId: $projectId
-          contentId: $contentId
-        }
-      ) {
-        item {
-          id
-        }
-      }
-    }
-    """
-
-    variables = {
-        "projectId": project_id,
-        "contentId": issue_id,
-    }
-
-    try:
-        r = requests.post(url, headers=headers, json={"query": query, "variables": variables}, timeout=15)
-        r.raise_for_status()
-        data = r.json()
-
-        if "errors" in data:
-            logger.error("⚠️ Erreurs GraphQL addProjectV2ItemById: %s", data.get("errors"))
-            return ""
-
-        item_id = (
-            data.get("data", {})
-            .get("addProjectV2ItemById", {})
-            .get("item", {})
-            .get("id")
+            "❌ Impossible d'inférer le repository associé au ProjectV2 (project_id=%s). "
+            "Veuillez specifier default_repo_full_name dans la configuration ou ajouter au moins une Issue/PR dans le projet.",
+            project_id,
         )
+    return effective_repo_full_name
 
-        if not item_id:
-            logger.error("❌ addProjectV2ItemById: item.id manquant dans la réponse: %s", data)
-            return ""
 
-        return item_id
-
-    except requests.exceptions.RequestException as e:
-        logger.error("❌ Erreur API GitHub (addProjectV2ItemById): %s", e, exc_info=True)
-        return ""
-    
-    
 def github_update_issue_title_gql_label(
     github_token: str,
     nameWithOwner: str,
@@ -608,7 +1429,7 @@ def github_update_issue_title_gql_label(
 
     try:
         # --- 1) Update title via GraphQL
-        r = requests.post(
+        r = _github_post(
             gql_url,
             headers=headers,
             json={"query": query, "variables": variables},
@@ -646,7 +1467,7 @@ def github_update_issue_title_gql_label(
             labels_url = f"https://api.github.com/repos/{nameWithOwner}/issues/{issue_number}/labels"
             payload = {"labels": ["feature"]}
 
-            r2 = requests.post(labels_url, headers=headers, json=payload, timeout=10)
+            r2 = _github_post(labels_url, headers=headers, json=payload, timeout=10)
             r2.raise_for_status()
 
             logger.info("🏷️ Label 'feature' ajouté (ou déjà présent) sur %s #%s", nameWithOwner, issue_number)
@@ -662,6 +1483,105 @@ def github_update_issue_title_gql_label(
         return False
     
         
+def github_update_issues_title_label_batch(github_token, updates, chunk_size=GITHUB_MUTATION_CHUNK_SIZE, repo_context=None):
+    """
+    Met à jour en lot le titre (et ajoute des labels) de plusieurs issues GitHub.
+
+    Les mises à jour sont envoyées sous forme de mutations aliasées (`updateIssue` +
+    `addLabelsToLabelable`) regroupées par documents GraphQL de `chunk_size` issues.
+    Les labels sont résolus (et créés si besoin) une seule fois par dépôt.
+
+    Args:
+        github_token (str): Personal Access Token GitHub
+        updates (list): tuples (id_Github_IssueGQL, new_title, labels[, nameWithOwner]) ; labels = liste de
+            noms (ou None) ; nameWithOwner (déjà lu avec l'item du projet) évite de relire le dépôt de l'issue
+        chunk_size (int): nombre d'issues par document GraphQL
+        repo_context (GithubRepoContextCache, optional): cache partagé des labels par dépôt
+
+    Returns:
+        list[bool]: succès par élément, dans l'ordre de `updates`
+    """
+    updates = list(updates or [])
+    results = [False] * len(updates)
+
+    if not github_token:
+        logger.error("❌ Token GitHub manquant pour la mise à jour en lot des issues.")
+        return results
+
+    if repo_context is None:
+        repo_context = GithubRepoContextCache()
+
+    # Normalisation des entrées (les entrées invalides restent en échec)
+    pending = []
+    repo_by_issue = {}
+    for idx, update in enumerate(updates):
+        issue_id, new_title, labels = update[:3]
+        if not issue_id or not new_title:
+            logger.error("❌ Paramètres invalides pour updateIssue (GraphQL) : index %s.", idx)
+            continue
+        if isinstance(labels, str):
+            labels = [labels]
+        if len(update) > 3 and update[3]:
+            repo_by_issue[issue_id] = update[3]
+        pending.append((idx, issue_id, new_title.strip(), [l for l in (labels or []) if l]))
+
+    try:
+        label_ids = _github_resolve_issue_label_ids(
+            github_token,
+            [(issue_id, labels) for _, issue_id, _, labels in pending if labels],
+            repo_context,
+            repo_by_issue=repo_by_issue,
+        )
+    except requests.exceptions.RequestException as e:
+        logger.error("❌ Impossible de résoudre les labels GitHub : %s", e, exc_info=True)
+        label_ids = {}
+
+    for start in range(0, len(pending), max(1, int(chunk_size))):
+        chunk = pending[start:start + max(1, int(chunk_size))]
+
+        declarations = []
+        fields = []
+        variables = {}
+        for n, (_, issue_id, new_title, labels) in enumerate(chunk):
+            declarations += [f"$id{n}: ID!", f"$t{n}: String!"]
+            variables[f"id{n}"] = issue_id
+            variables[f"t{n}"] = new_title
+            fields.append(
+                f"u{n}: updateIssue(input: {{id: $id{n}, title: $t{n}}}) {{ issue {{ id number title }} }}"
+            )
+            ids = label_ids.get(issue_id) or []
+            if ids:
+                declarations.append(f"$l{n}: [ID!]!")
+                variables[f"l{n}"] = ids
+                fields.append(
+                    f"l{n}: addLabelsToLabelable(input: {{labelableId: $id{n}, labelIds: $l{n}}}) {{ clientMutationId }}"
+                )
+
+        query = "mutation(" + ", ".join(declarations) + ") {\n  " + "\n  ".join(fields) + "\n}"
+
+        try:
+            data = _github_graphql(github_token, query, variables, timeout=30)
+        except requests.exceptions.RequestException as e:
+            logger.error("❌ Erreur lors de la mise à jour en lot des issues : %s", e, exc_info=True)
+            continue
+
+        payload = data.get("data") or {}
+        failed_aliases = set(_github_errors_by_alias(data))
+        if data.get("errors"):
+            logger.error("❌ Erreurs GraphQL (updateIssue/addLabelsToLabelable en lot) : %s", data["errors"])
+
+        for n, (idx, issue_id, new_title, labels) in enumerate(chunk):
+            ok = bool(payload.get(f"u{n}")) and f"u{n}" not in failed_aliases
+            if labels:
+                ok = ok and bool(label_ids.get(issue_id)) and f"l{n}" not in failed_aliases and f"l{n}" in payload
+            results[idx] = ok
+            if ok:
+                logger.info("✏️ Titre mis à jour via GraphQL : %s → %s", issue_id, new_title)
+
+    logger.info("✏️ %s/%s issues GitHub mises à jour en lot.", sum(results), len(results))
+    return results
+
+
 def github_update_issue_title_gql(
     github_token: str,
     issue_node_id: str,
@@ -715,7 +1635,7 @@ def github_update_issue_title_gql(
     }
 
     try:
-        r = requests.post(
+        r = _github_post(
             url,
             headers=headers,
             json={"query": query, "variables": variables},
@@ -758,7 +1678,7 @@ def _github_ensure_label_exists(api_url_repo: str, headers: dict, label_name: st
 
     # GitHub label endpoint is case-insensitive but returns stored casing.
     label_endpoint = f"{api_url_repo}/labels/{label_name}"
-    r = requests.get(label_endpoint, headers=headers, timeout=10)
+    r = _github_get(label_endpoint, headers=headers, timeout=10)
     if r.status_code == 200:
         return r.json()
     if r.status_code != 404:
@@ -769,16 +1689,288 @@ def _github_ensure_label_exists(api_url_repo: str, headers: dict, label_name: st
         "color": str(color).lstrip("#"),
         "description": description or "",
     }
-    r2 = requests.post(f"{api_url_repo}/labels", headers=headers, json=payload, timeout=10)
+    r2 = _github_post(f"{api_url_repo}/labels", headers=headers, json=payload, timeout=10)
     r2.raise_for_status()
     logger.info("🏷️ Label '%s' créé sur %s", label_name, api_url_repo)
     return r2.json()
 
 
+###
+### Cache du contexte dépôt (repo cible, owner, labels) pour une synchro
+###
+
+class GithubRepoContextCache:
+    """
+    Cache, à l'échelle d'une synchronisation, du contexte nécessaire à la création d'issues :
+      - repo cible inféré pour un ProjectV2 (résultat de _github_get_repo),
+      - état des labels par dépôt (résultat de _github_ensure_label_exists).
+
+    ttl (secondes, optionnel) : durée de validité d'une entrée ; None = valable toute la synchro.
+    """
+
+    def __init__(self, ttl=None):
+        self.ttl = float(ttl) if ttl else None
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get_repo(self, project_id, github_token):
+        """Retourne (url, owner, name, repo_full_name) pour le projet, en n'interrogeant GitHub qu'une fois."""
+        return self._get_or_load(("repo", project_id), lambda: _github_get_repo(project_id, github_token))
+
+    def get_repository_id(self, repo_full_name, github_token):
+        """Retourne l'identifiant GraphQL (node id) du dépôt "owner/repo"."""
+        return self._get_or_load(("repository_id", repo_full_name.lower()), lambda: _github_get_repository_id(repo_full_name, github_token))
+
+    def ensure_label(self, api_url_repo, headers, label_name, color="5319e7", description=""):
+        """Vérifie/crée le label une seule fois par dépôt (comparaison insensible à la casse)."""
+        return self._get_or_load(
+            ("label", api_url_repo.lower(), label_name.lower()),
+            lambda: _github_ensure_label_exists(
+                api_url_repo=api_url_repo,
+                headers=headers,
+                label_name=label_name,
+                color=color,
+                description=description,
+            ),
+        )
+
+    def _get_or_load(self, key, loader):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (self.ttl is None or time.monotonic() - entry[0] < self.ttl):
+                return entry[1]
+
+        value = loader()
+        # On ne mémorise pas les échecs (None) pour permettre une nouvelle tentative
+        if value is not None:
+            with self._lock:
+                self._entries[key] = (time.monotonic(), value)
+        return value
+
+
 #####
 ##### Fonctions utilitaires internes
 #####
 
+def _github_snapshot_path(project_id):
+    """Chemin du fichier d'instantané local d'un ProjectV2."""
+    safe_id = "".join(c if c.isalnum() or c in "-_" else "_" for c in str(project_id))
+    return os.path.join(GITHUB_SNAPSHOT_DIR, f"{safe_id}.json")
+
+
+def _github_snapshot_load(project_id):
+    """Charge l'instantané {project_id, watermark, items} d'un projet (vide si absent ou illisible)."""
+    snapshot = _github_snapshot_load_file(_github_snapshot_path(project_id))
+    return snapshot or {"project_id": project_id, "watermark": "", "items": {}}
+
+
+def _github_mirror_load(project_id):
+    """Instantané d'un projet tel qu'écrit sur disque ; {} si aucun miroir n'existe (pas de valeur par défaut)."""
+    return _github_snapshot_load_file(_github_snapshot_path(project_id))
+
+
+def _github_snapshot_load_file(path):
+    """Lit un fichier d'instantané ; {} si absent ou illisible."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            snapshot = json.load(f)
+        if isinstance(snapshot, dict) and isinstance(snapshot.get("items"), dict):
+            return snapshot
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as e:
+        logger.warning(f"⚠️ Instantané GitHub illisible ({path}) : {e}")
+    return {}
+
+
+@contextmanager
+def _github_snapshot_locked(project_id):
+    """Section critique sur l'instantané d'un projet : verrou des threads du process et, entre workers,
+    verrou fcntl sur un fichier compagnon (le fichier d'instantané est remplacé à chaque écriture)."""
+    with _github_snapshot_lock:
+        if fcntl is None:
+            yield
+            return
+        lock_path = _github_snapshot_path(project_id) + ".lock"
+        os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+        with open(lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _github_snapshot_save(project_id, snapshot):
+    """Écrit l'instantané de façon atomique (fichier temporaire puis renommage)."""
+    path = _github_snapshot_path(project_id)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({**snapshot, "project_id": project_id}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"⚠️ Impossible d'écrire l'instantané GitHub ({path}) : {e}")
+
+
+def _github_request(method, url, **kwargs):
+    """Appel GitHub (REST ou GraphQL) cadencé par l'ordonnanceur de rate-limit du token utilisé."""
+    authorization = (kwargs.get("headers") or {}).get("Authorization", "")
+    return github_rate_limiter(authorization).request(method, url, **kwargs)
+
+
+def _github_get(url, **kwargs):
+    return _github_request("GET", url, **kwargs)
+
+
+def _github_post(url, **kwargs):
+    return _github_request("POST", url, **kwargs)
+
+
+def _github_graphql(github_token, query, variables=None, timeout=15):
+    """Envoie une requête GraphQL à GitHub et retourne la réponse JSON décodée.
+
+    Lève requests.RequestException en cas d'erreur HTTP ; les erreurs GraphQL
+    restent dans la clé "errors" de la réponse (à traiter par l'appelant). Une réponse
+    RATE_LIMITED est transmise à l'ordonnanceur et la requête (lecture) rejouée après le reset.
+    Les requêtes en lecture (query) sont rejouables par la couche de transport, pas les mutations.
+    """
+    headers = {
+        "Authorization": f"Bearer {github_token}",
+        "Accept": "application/vnd.github+json"
+    }
+    is_mutation = query.lstrip().startswith("mutation")
+
+    # Les requêtes en lecture remontent aussi leur coût GraphQL pour l'ordonnanceur de rate-limit
+    if not is_mutation and "rateLimit" not in query:
+        end = query.rstrip().rfind("}")
+        query = query[:end] + "  rateLimit { cost remaining resetAt }\n" + query[end:]
+
+    limiter = github_rate_limiter(headers["Authorization"])
+    for attempt in range(1, GITHUB_RATE_LIMIT_MAX_ATTEMPTS + 1):
+        r = _github_post(
+            "https://api.github.com/graphql",
+            headers=headers,
+            json={"query": query, "variables": variables or {}},
+            timeout=timeout,
+            retry=not is_mutation,
+        )
+        r.raise_for_status()
+        data = r.json()
+
+        rate_limit = (data.get("data") or {}).pop("rateLimit", None) if isinstance(data.get("data"), dict) else None
+        limiter.update_graphql_budget(rate_limit)
+
+        # Rate-limit primaire GraphQL (HTTP 200 + errors RATE_LIMITED) : la requête n'a pas été exécutée,
+        # l'ordonnanceur attend le reset avant de la rejouer ; les mutations ne sont pas rejouées
+        if not limiter.update_from_graphql_errors(data.get("errors")) or is_mutation or attempt >= GITHUB_RATE_LIMIT_MAX_ATTEMPTS:
+            return data
+        logger.warning(f"⏳ Rate-limit GraphQL GitHub — nouvelle tentative {attempt}/{GITHUB_RATE_LIMIT_MAX_ATTEMPTS - 1}")
+    return data
+
+
+_GITHUB_ISSUES_REPOSITORY_QUERY = """
+query($ids: [ID!]!) {
+  nodes(ids: $ids) {
+    ... on Issue { id repository { nameWithOwner } }
+    ... on PullRequest { id repository { nameWithOwner } }
+  }
+}
+"""
+
+
+def _github_resolve_issue_label_ids(github_token, issue_labels, repo_context, repo_by_issue=None):
+    """
+    Résout les identifiants GraphQL des labels à poser sur des issues.
+
+    issue_labels : liste de (id_Github_IssueGQL, [noms de labels]).
+    repo_by_issue : {id_Github_IssueGQL: "owner/repo"} déjà connus (nameWithOwner lu avec les items).
+    Retourne {id_Github_IssueGQL: [label node ids]}. Le dépôt des seules issues absentes de
+    repo_by_issue est obtenu par une requête `nodes(ids:)` (100 ids par requête), puis chaque
+    label est vérifié/créé une seule fois par dépôt via le repo_context.
+    """
+    if not issue_labels:
+        return {}
+
+    headers = {
+        "Authorization": f"Bearer {github_token}",
+        "Accept": "application/vnd.github+json"
+    }
+
+    repo_by_issue = dict(repo_by_issue or {})
+    issue_ids = list(dict.fromkeys(issue_id for issue_id, _ in issue_labels if not repo_by_issue.get(issue_id)))
+    for start in range(0, len(issue_ids), 100):
+        data = _github_graphql(github_token, _GITHUB_ISSUES_REPOSITORY_QUERY, {"ids": issue_ids[start:start + 100]})
+        if "errors" in data:
+            logger.warning("⚠️ Erreurs GraphQL (nodes → repository) : %s", data["errors"])
+        for node in (data.get("data") or {}).get("nodes") or []:
+            if node and node.get("id"):
+                repo_by_issue[node["id"]] = (node.get("repository") or {}).get("nameWithOwner")
+
+    label_ids = {}
+    for issue_id, labels in issue_labels:
+        repo_full_name = repo_by_issue.get(issue_id)
+        if not repo_full_name:
+            logger.warning("⚠️ Dépôt introuvable pour l'issue %s : labels ignorés.", issue_id)
+            continue
+        ids = []
+        for label_name in labels:
+            label = repo_context.ensure_label(
+                api_url_repo=f"https://api.github.com/repos/{repo_full_name}",
+                headers=headers,
+                label_name=label_name,
+                color="5319e7",
+                description="Label for features created via Grist sync",
+            )
+            if label and label.get("node_id"):
+                ids.append(label["node_id"])
+        label_ids[issue_id] = ids
+    return label_ids
+
+
+def _github_get_repository_id(repo_full_name, github_token):
+    """Retourne le node id GraphQL du dépôt "owner/repo" (None si introuvable)."""
+    owner, _, name = (repo_full_name or "").partition("/")
+    query = """
+    query($owner: String!, $name: String!) {
+      repository(owner: $owner, name: $name) { id }
+    }
+    """
+    data = _github_graphql(github_token, query, {"owner": owner, "name": name})
+    if "errors" in data:
+        logger.error("❌ Erreurs GraphQL (repository %s) : %s", repo_full_name, data["errors"])
+    return ((data.get("data") or {}).get("repository") or {}).get("id")
+
+
+def _github_errors_by_alias(data):
+    """Indexe les erreurs GraphQL par alias de premier niveau (clé None pour les erreurs globales)."""
+    errors = {}
+    for err in (data or {}).get("errors") or []:
+        alias = (err.get("path") or [None])[0]
+        errors.setdefault(alias, err.get("message") or str(err))
+    return errors
+
+
+_github_repo_semaphores = {}
+_github_repo_semaphores_lock = threading.Lock()
+
+
+def _github_repo_semaphore(repo_full_name, limit):
+    """Sémaphore partagé limitant le nombre de requêtes d'écriture simultanées vers un dépôt."""
+    key = (str(repo_full_name).lower(), int(limit))
+    with _github_repo_semaphores_lock:
+        semaphore = _github_repo_semaphores.get(key)
+        if semaphore is None:
+            semaphore = _github_repo_semaphores[key] = threading.BoundedSemaphore(int(limit))
+    return semaphore
+
+
+def _github_feature_key(feature):
+    """Clé stable d'une feature Grist pour l'état de reprise : "<type>::<id_Num>::<Nom>"."""
+    return f"{feature.get('type', 'Features')}::{feature.get('id_Num')}::{feature.get('Nom')}"
+
+
 def _github_get_repo(project_id, github_token):
     """
     Récupère le nom complet du dépôt (organisation/repo) associé à un project_id GitHub (ProjectV2).
@@ -819,7 +2011,7 @@ def _github_get_repo(project_id, github_token):
     """
     variables = {"projectId": project_id}
     try:
-        resp = requests.post(graphql_url, headers=headers, json={"query": query, "variables": variables}, timeout=10)
+        resp = _github_post(graphql_url, headers=headers, json={"query": query, "variables": variables}, timeout=10, retry=True)
         resp.raise_for_status()
         data = resp.json()
         node = data.get("data", {}).get("node", {}) or {}
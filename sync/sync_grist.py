@@ -9,6 +9,15 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 import yaml
 from datetime import datetime, timezone
 import logging
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+try:
+    import fcntl  # verrou des réservations d'id_Num entre workers (indisponible sous Windows)
+except ImportError:
+    fcntl = None
 
 # --- Activation et configuration des logs ---
 logging.basicConfig(
@@ -16,14 +25,22 @@ logging.basicConfig(
     format="%(asctime)s [%(levelname)s] %(message)s"
 )
 logger = logging.getLogger("sync_grist")
+
+from sync.sync_http import http_get, http_post, http_patch
+
+# Nombre d'enregistrements par POST lors des créations en lot
+GRIST_CREATE_CHUNK_SIZE = 100
+# Nombre de tables Grist lues simultanément
+GRIST_FETCH_MAX_WORKERS = 5
     
 from sync.sync_iobeya import (
-    iobeya_update_object_title_prefix
+    iobeya_update_objects_title_prefix,
+    IOBEYA_CREATE_CHUNK_SIZE
 )    
 
 from sync.sync_github import (
-    github_update_issue_title_gql,
-    github_update_issue_title_gql_label
+    github_update_issues_title_label_batch,
+    github_load_object_details
 ) 
 
 
@@ -41,7 +58,7 @@ def grist_get_doc_name(base_url, doc_id, api_token):
     
     try:
         url = f"{base_url}/api/docs/{doc_id}"
-        resp = requests.get(url, headers=headers, timeout=10)
+        resp = http_get(url, headers=headers, timeout=10)
         resp.raise_for_status()
         data = resp.json()
         return data.get("name", f"(Doc {doc_id} sans nom)")
@@ -52,23 +69,64 @@ def grist_get_doc_name(base_url, doc_id, api_token):
 
 ### récupération des epics dans une list 
 
-def grist_get_epics(base_url, doc_id, api_key, table_name="Epics"):
-    
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json",
-        "Accept": "application/json"
-    }    
+class GristEpicResolver:
+    """
+    Résolveur d'Epics à la portée d'une requête : la table Epics n'est téléchargée qu'une fois,
+    puis indexée par identifiant interne Grist (record id) et par identifiant manuel
+    (id_Epic / id_epic / id2). Partagé par grist_get_epics, grist_get_epic,
+    grist_get_epic_object et grist_get_epic_objects.
+    """
+
+    def __init__(self, base_url, doc_id, api_key, table_name="Epics"):
+        self.base_url = base_url
+        self.doc_id = doc_id
+        self.api_key = api_key
+        self.table_name = table_name
+        self._records = None
+        self._by_id = {}
+        self._by_manual_id = {}
+        self._lock = threading.Lock()
+
+    def records(self):
+        """Enregistrements bruts de la table Epics (lève requests.RequestException en cas d'erreur)."""
+        with self._lock:
+            if self._records is None:
+                headers = {
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Content-Type": "application/json",
+                    "Accept": "application/json"
+                }
+                url = f"{self.base_url}/api/docs/{self.doc_id}/tables/{self.table_name}/records"
+                url = url.replace('://', '§§').replace('//', '/').replace('§§', '://')
+                response = http_get(url, headers=headers)
+                response.raise_for_status()
+                records = (response.json() or {}).get("records", [])
+
+                self._by_id = {str(rec.get("id")): rec for rec in records}
+                self._by_manual_id = {}
+                for rec in records:
+                    fields = rec.get("fields", {}) or {}
+                    manual = fields.get("id_Epic") or fields.get("id_epic") or fields.get("id2")
+                    if manual is not None:
+                        self._by_manual_id.setdefault(str(manual), rec)
+                self._records = records
+                logger.debug(f"📚 Table {self.table_name} chargée une fois ({len(records)} enregistrements).")
+            return self._records
+
+    def find(self, epic_id):
+        """Enregistrement brut de l'Epic : d'abord par record id, puis par identifiant manuel."""
+        self.records()
+        return self._by_id.get(str(epic_id)) or self._by_manual_id.get(str(epic_id))
+
+
+def grist_get_epics(base_url, doc_id, api_key, table_name="Epics", resolver=None):
     
+    resolver = resolver or GristEpicResolver(base_url, doc_id, api_key, table_name)
+
     try:
-        url = f"{base_url}/api/docs/{doc_id}/tables/{table_name}/records"
-        url = url.replace('://', '§§').replace('//', '/').replace('§§', '://')
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        data = response.json()
         epics = []
         
-        for record in data.get("records", []):
+        for record in resolver.records():
             record_id = record.get("id")
             fields = record.get("fields", {})
             epic_name = fields.get("Epic") or fields.get("Titre") or fields.get("Name") or fields.get("Nom")
@@ -106,43 +164,20 @@ def _sort_epics_by_name(epics, key_name="name"):
     )    
     
 # Fonction pour récupérer un objet Epic spécifique par l'un des identifiants possible
-def grist_get_epic(base_url, doc_id, api_key, epic_id, table_name="Epics"):
+def grist_get_epic(base_url, doc_id, api_key, epic_id, table_name="Epics", resolver=None):
     
     """
     Récupère le contenu complet d'un Epic à partir de son identifiant manuel id_epic.
     note : la colonne id_Epic est numérotée manuelle par l'utilisateur dans grist
     Retourne un dictionnaire contenant les champs de l'Epic.
+    resolver (GristEpicResolver, optionnel) : évite de retélécharger la table Epics.
     """
     
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json",
-        "Accept": "application/json"
-    }
+    resolver = resolver or GristEpicResolver(base_url, doc_id, api_key, table_name)
 
     try:
-        url = f"{base_url}/api/docs/{doc_id}/tables/{table_name}/records"
-        url = url.replace('://', '§§').replace('//', '/').replace('§§', '://')
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        data = response.json()
-
-        if not data:
-            return None
-
-        records = data.get("records", [])
-
-        # 1) Tentative: epic_id est l'ID interne Grist (record id)
-        the_epic = find_item_by_id(records, epic_id, "id")
-
-        # 2) Fallback: epic_id correspond à l'identifiant manuel (id_Epic/id_epic/id2)
-        if the_epic is None:
-            for rec in records:
-                fields = rec.get("fields", {}) or {}
-                manual = fields.get("id_Epic") or fields.get("id_epic") or fields.get("id2")
-                if manual is not None and str(manual) == str(epic_id):
-                    the_epic = rec
-                    break
+        # 1) record id Grist, 2) fallback sur l'identifiant manuel (id_Epic/id_epic/id2)
+        the_epic = resolver.find(epic_id)
 
         if the_epic is None:
             logger.warning(f"⚠️ Epic introuvable dans Grist pour epic_id={epic_id}.")
@@ -160,7 +195,8 @@ def grist_get_epic(base_url, doc_id, api_key, epic_id, table_name="Epics"):
 
 ### récupération de tous les objets liés à un epic spécifique
 
-def grist_get_epic_objects(base_url, doc_id, api_key, filter_epic_id=None , pi=0):
+def grist_get_epic_objects(base_url, doc_id, api_key, filter_epic_id=None , pi=0, resolver=None, fetch_mode="rest",
+                           snapshot_dir=None, full_reconcile_interval=None):
 
     features = pd.DataFrame()
     risks = pd.DataFrame()
@@ -174,12 +210,35 @@ def grist_get_epic_objects(base_url, doc_id, api_key, filter_epic_id=None , pi=0
     last_update_o = None
     last_update_i = None
 
+    # Un seul téléchargement de la table Epics pour les 5 tables
+    resolver = resolver or GristEpicResolver(base_url, doc_id, api_key)
+
+    # Mode SQL : une seule requête pour les 5 tables ; retour au mode REST si l'endpoint est indisponible
+    # (le mode incrémental, qui s'appuie sur ses propres instantanés, est prioritaire)
+    if fetch_mode == "sql" and not snapshot_dir:
+        records = grist_get_epic_objects_sql(base_url, doc_id, api_key, filter_epic_id, pi, resolver=resolver)
+        if records is not None:
+            return records
+        logger.info("↩️ Endpoint SQL Grist indisponible : lecture REST des tables.")
+
     try:
-        features, last_update_f = grist_get_epic_object(base_url, doc_id, api_key, "Features", filter_epic_id , pi)
-        risks, last_update_r = grist_get_epic_object(base_url, doc_id, api_key, "Risques", filter_epic_id , pi)
-        dependances, last_update_d = grist_get_epic_object(base_url, doc_id, api_key, "Dependances", filter_epic_id , pi)
-        objectives, last_update_o = grist_get_epic_object(base_url, doc_id, api_key, "Objectives", filter_epic_id , pi)
-        issues, last_update_i = grist_get_epic_object(base_url, doc_id, api_key, "Issues", filter_epic_id , pi)             
+        # Les 5 tables sont lues en parallèle (pool borné) ; l'ordre de fusion reste celui des tables
+        tables = ("Features", "Risques", "Dependances", "Objectives", "Issues")
+        with ThreadPoolExecutor(max_workers=min(GRIST_FETCH_MAX_WORKERS, len(tables))) as pool:
+            futures = [
+                pool.submit(
+                    grist_get_epic_object, base_url, doc_id, api_key, table, filter_epic_id, pi, resolver=resolver,
+                    snapshot_dir=snapshot_dir, full_reconcile_interval=full_reconcile_interval,
+                )
+                for table in tables
+            ]
+            (
+                (features, last_update_f),
+                (risks, last_update_r),
+                (dependances, last_update_d),
+                (objectives, last_update_o),
+                (issues, last_update_i),
+            ) = [future.result() for future in futures]
 
         # Initialize records as DataFrame
         records = pd.DataFrame()
@@ -203,21 +262,366 @@ def grist_get_epic_objects(base_url, doc_id, api_key, filter_epic_id=None , pi=0
         logger.warning(f"❌ Erreur lors de la récupération des objets de l'Epic {filter_epic_id} : {e}")
         return None
 
+# Tables d'objets synchronisées et colonnes utilisées par la synchro (projection du mode SQL)
+GRIST_OBJECT_TABLES = ("Features", "Risques", "Dependances", "Objectives", "Issues")
+GRIST_SYNC_COLUMNS = (
+    "Epic", "pi_Num", "id_Num", "Nom", "Description", "Hypotheses_de_gain", "Criteres_d_acceptation",
+    "Commentaires", "Committed", "timestamp", "id_feature", "id_Feature", "id2",
+)
+
+def grist_get_epic_objects_sql(base_url, doc_id, api_key, filter_epic_id=None, pi=0, resolver=None):
+    """
+    Lecture des objets d'un Epic en une seule requête sur l'endpoint /api/docs/{doc}/sql :
+    UNION ALL des 5 tables, projection des seules colonnes utilisées par la synchro
+    (colonnes découvertes par table, mises en cache) et filtre Epic / PI paramétré.
+
+    Retourne un DataFrame de même forme que le mode REST, ou None si l'endpoint SQL
+    est indisponible (désactivé, erreur) : l'appelant repasse alors en REST.
+    """
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json",
+        "Accept": "application/json"
+    }
+
+    epic = None
+    if filter_epic_id is not None:
+        epic = grist_get_epic(base_url, doc_id, api_key, filter_epic_id, resolver=resolver)
+        if epic is None:
+            return None
+
+    try:
+        pi_val = int(pi)
+    except (ValueError, TypeError):
+        pi_val = 0
+
+    try:
+        selects, args, columns_by_table = [], [], {}
+        for table in GRIST_OBJECT_TABLES:
+            columns = _grist_table_columns(base_url, doc_id, api_key, table)
+            if columns is None:
+                continue  # table absente du document
+            if epic is not None and "Epic" not in columns:
+                continue  # aucune ligne ne peut être rattachée à l'epic
+            columns_by_table[table] = columns
+
+            projection = ", ".join(
+                f'"{table}"."{col}" AS "{col}"' if col in columns else f'NULL AS "{col}"'
+                for col in GRIST_SYNC_COLUMNS
+            )
+            # colonne de dernière modification (nom variable selon la table) exposée sous un alias commun
+            modified = next((c for c in GRIST_WATERMARK_COLUMNS if c in columns), None)
+            projection += f', "{table}"."{modified}" AS "Date_MAJ"' if modified else ', NULL AS "Date_MAJ"'
+            where = []
+            if epic is not None:
+                where.append(f'"{table}"."Epic" = ?')
+                args.append(epic.get("id"))
+            if pi_val >= 1 and "pi_Num" in columns:
+                where.append(f'("{table}"."pi_Num" = ? OR "{table}"."pi_Num" = ?)')
+                args.extend([pi_val, str(pi_val)])
+            selects.append(
+                f"SELECT '{table}' AS \"type\", \"{table}\".\"id\" AS \"id\", {projection} FROM \"{table}\""
+                + (f" WHERE {' AND '.join(where)}" if where else "")
+            )
+
+        if not selects:
+            return pd.DataFrame()
+
+        url = f"{base_url}/api/docs/{doc_id}/sql"
+        url = url.replace('://', '§§').replace('//', '/').replace('§§', '://')
+        response = http_post(url, headers=headers, json={"sql": " UNION ALL ".join(selects), "args": args}, retry=True)
+        response.raise_for_status()
+        rows = (response.json() or {}).get("records", [])
+
+    except (requests.exceptions.RequestException, ValueError) as e:
+        logger.warning(f"⚠️ Lecture SQL Grist impossible : {e}")
+        return None
+
+    records = []
+    for row in rows:
+        row_fields = row.get("fields", row) or {}
+        table = row_fields.get("type")
+        columns = columns_by_table.get(table, ())
+        fields = {
+            "type": table,
+            "id": row_fields.get("id"),
+            "id_Epic": epic.get("id_Epic") if epic is not None else None,
+            # seules les colonnes existantes de la table, comme en mode REST
+            **{col: row_fields.get(col) for col in GRIST_SYNC_COLUMNS if col in columns},
+        }
+        if row_fields.get("Date_MAJ") is not None:
+            fields["Date_MAJ"] = row_fields.get("Date_MAJ")
+        if table == "Features":
+            fields["id_feature"] = fields.get("id_feature") or fields.get("id_Feature") or fields.get("id2")
+        # filtre PI conservé côté Python (colonnes pi_Num absentes ou typées différemment)
+        if pi_val < 1 or str(fields.get("pi_Num")) == str(pi_val):
+            records.append(fields)
+
+    df = pd.DataFrame(records)
+    logger.info(f"✅ Total {len(df)} objets récupérés pour l'Epic {filter_epic_id} depuis Grist (1 requête SQL).")
+    return df
+
+# Rafraîchissement incrémental : colonnes candidates pour le watermark. Uniquement des colonnes de
+# dernière modification ("timestamp" est une date de création : une ligne modifiée ensuite serait manquée)
+GRIST_WATERMARK_COLUMNS = (
+    "updatedAt", "UpdatedAt", "modifiedAt", "ModifiedAt", "lastUpdate", "LastUpdate",
+    "last_modified", "Last_Modified", "Derniere_MAJ", "Dernière_MAJ", "DerniereMAJ", "DernièreMAJ",
+    "Date_MAJ", "date_maj"
+)
+# Types Grist stockés en secondes epoch dans SQLite (le watermark est alors lié comme nombre)
+GRIST_WATERMARK_EPOCH_TYPES = ("DateTime", "Date", "Numeric", "Int")
+# Intervalle (s) entre deux relectures complètes d'une table (prise en compte des suppressions)
+GRIST_FULL_RECONCILE_INTERVAL = 3600
+
+_grist_snapshot_locks = {}  # chemin d'instantané -> verrou des threads (une table n'en bloque pas une autre)
+_grist_snapshot_locks_guard = threading.Lock()
+
+def grist_get_table_records_incremental(base_url, doc_id, api_key, table_name, snapshot_dir,
+                                        full_reconcile_interval=GRIST_FULL_RECONCILE_INTERVAL):
+    """
+    Enregistrements d'une table Grist (format de l'endpoint /records) tenus à jour par un instantané
+    local persistant par (doc, table) et un watermark sur la colonne de dernière modification.
+
+    - Première lecture ou relecture périodique (full_reconcile_interval) : lecture complète
+      (les suppressions sont prises en compte à ce moment-là).
+    - Sinon : une requête SQL ne renvoie que les ids des lignes modifiées après le watermark,
+      puis ces seules lignes sont relues via /records (filtre sur id) et fusionnées dans l'instantané.
+      Le watermark est comparé dans le type de stockage de la colonne : secondes epoch pour
+      DateTime/Date/Numeric/Int, valeur brute la plus récente (même format) pour une colonne Text.
+    En cas d'erreur sur le chemin incrémental, on repasse en lecture complète.
+
+    Retourne None si la table n'a pas de colonne de modification exploitable (ou si ses colonnes
+    sont illisibles) : l'appelant fait alors la lecture filtrée habituelle (Epic / PI côté serveur)
+    plutôt que de télécharger la table entière à chaque passage.
+    La lecture / mise à jour / écriture de l'instantané se fait sous verrou (threads et workers).
+    """
+    path = _grist_snapshot_path(snapshot_dir, doc_id, table_name)
+
+    try:
+        columns = _grist_table_columns(base_url, doc_id, api_key, table_name) or {}
+    except requests.exceptions.RequestException as e:
+        logger.warning(f"⚠️ Colonnes de {table_name} indisponibles : {e}")
+        return None
+    column = next((c for c in GRIST_WATERMARK_COLUMNS if c in columns), None)
+    column_type = _grist_watermark_storage(columns.get(column)) if column else None
+    if column_type is None:
+        if column:
+            logger.info(f"ℹ️ {table_name} : colonne {column} de type {columns.get(column)} inutilisable comme watermark.")
+        logger.info(f"ℹ️ {table_name} : pas de colonne de modification, lecture filtrée sans instantané.")
+        return None
+
+    with _grist_snapshot_locked(path):
+        snapshot = _grist_snapshot_load(path)
+        now = time.time()
+
+        watermark = snapshot.get("watermark") if column_type == "epoch" else snapshot.get("watermark_value")
+        full = (
+            not snapshot.get("records")
+            or snapshot.get("column") != column
+            or snapshot.get("column_type") != column_type
+            or watermark is None
+            or now - float(snapshot.get("full_at") or 0) >= float(full_reconcile_interval)
+        )
+
+        if not full:
+            try:
+                changed_ids = _grist_sql_changed_ids(base_url, doc_id, api_key, table_name, column, watermark)
+                changed = _grist_get_records_by_ids(base_url, doc_id, api_key, table_name, changed_ids)
+                for rec in changed:
+                    snapshot["records"][str(rec.get("id"))] = rec
+                logger.info(f"🔄 {table_name} : {len(changed)} ligne(s) modifiée(s) depuis le dernier passage.")
+            except (requests.exceptions.RequestException, ValueError) as e:
+                logger.warning(f"⚠️ Lecture incrémentale de {table_name} impossible ({e}) : lecture complète.")
+                full = True
+
+        if full:
+            headers = {
+                "Authorization": f"Bearer {api_key}",
+                "Accept": "application/json"
+            }
+            url = f"{base_url}/api/docs/{doc_id}/tables/{table_name}/records"
+            url = url.replace('://', '§§').replace('//', '/').replace('§§', '://')
+            response = http_get(url, headers=headers)
+            response.raise_for_status()
+            records = (response.json() or {}).get("records", [])
+            snapshot = {
+                "doc_id": doc_id,
+                "table": table_name,
+                "column": column,
+                "column_type": column_type,
+                "full_at": now,
+                "records": {str(rec.get("id")): rec for rec in records},
+            }
+            logger.info(f"📥 {table_name} : relecture complète ({len(records)} lignes).")
+
+        # Watermark : valeur la plus récente de la colonne, en epoch et telle que stockée (colonne Text)
+        stamps = []
+        for rec in snapshot["records"].values():
+            value = (rec.get("fields") or {}).get(column)
+            ts = _parse_timestamp_to_epoch(value)
+            if ts is not None:
+                stamps.append((ts, value))
+        if stamps:
+            ts, value = max(stamps, key=lambda item: item[0])
+            if ts >= float(snapshot.get("watermark") or 0):
+                snapshot["watermark"], snapshot["watermark_value"] = ts, value
+
+        _grist_snapshot_save(path, snapshot)
+    return list(snapshot["records"].values())
+
+def _grist_watermark_storage(column_type):
+    """Stockage SQLite d'une colonne Grist pour le watermark : "epoch", "text" ou None (inutilisable)."""
+    base_type = str(column_type or "").split(":", 1)[0]
+    if base_type in GRIST_WATERMARK_EPOCH_TYPES:
+        return "epoch"
+    if base_type == "Text":
+        return "text"
+    return None
+
+def _grist_sql_changed_ids(base_url, doc_id, api_key, table_name, column, watermark):
+    """Ids des lignes dont la colonne de modification est postérieure au watermark (endpoint /sql).
+
+    Le watermark doit être fourni dans le type de stockage de la colonne (nombre ou chaîne).
+    """
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json",
+        "Accept": "application/json"
+    }
+    url = f"{base_url}/api/docs/{doc_id}/sql"
+    url = url.replace('://', '§§').replace('//', '/').replace('§§', '://')
+    sql = f'SELECT "id" FROM "{table_name}" WHERE "{column}" > ?'
+    response = http_post(url, headers=headers, json={"sql": sql, "args": [watermark]}, retry=True)
+    response.raise_for_status()
+    return [(row.get("fields", row) or {}).get("id") for row in (response.json() or {}).get("records", [])]
+
+def _grist_get_records_by_ids(base_url, doc_id, api_key, table_name, ids, chunk_size=GRIST_CREATE_CHUNK_SIZE):
+    """Relit des lignes précises via /records (filtre sur id) pour conserver le format REST."""
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Accept": "application/json"
+    }
+    url = f"{base_url}/api/docs/{doc_id}/tables/{table_name}/records"
+    url = url.replace('://', '§§').replace('//', '/').replace('§§', '://')
+    records = []
+    ids = [i for i in ids if i is not None]
+    for start in range(0, len(ids), chunk_size):
+        response = http_get(url, headers=headers, params={"filter": json.dumps({"id": ids[start:start + chunk_size]})})
+        response.raise_for_status()
+        records.extend((response.json() or {}).get("records", []))
+    return records
+
+def _grist_snapshot_path(snapshot_dir, doc_id, table_name):
+    safe = "".join(c if c.isalnum() or c in "-_" else "_" for c in f"{doc_id}_{table_name}")
+    return os.path.join(snapshot_dir, f"{safe}.json")
+
+@contextmanager
+def _grist_snapshot_locked(path):
+    """Section critique sur l'instantané d'une table : verrou des threads du process (par table) et, entre workers,
+    verrou fcntl sur un fichier compagnon (l'instantané est remplacé à chaque écriture)."""
+    with _grist_snapshot_locks_guard:
+        thread_lock = _grist_snapshot_locks.setdefault(path, threading.Lock())
+    with thread_lock:
+        if fcntl is None:
+            yield
+            return
+        lock_path = path + ".lock"
+        try:
+            os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+            lock_file = open(lock_path, "a")
+        except OSError as e:
+            logger.warning(f"⚠️ Verrou de l'instantané Grist indisponible ({lock_path}) : {e}")
+            yield
+            return
+        with lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def _grist_snapshot_load(path):
+    """Charge un instantané de table ; {} si absent ou illisible."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            snapshot = json.load(f)
+        if isinstance(snapshot, dict) and isinstance(snapshot.get("records"), dict):
+            return snapshot
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as e:
+        logger.warning(f"⚠️ Instantané Grist illisible ({path}) : {e}")
+    return {}
+
+def _grist_snapshot_save(path, snapshot):
+    """Écrit l'instantané de façon atomique (fichier temporaire puis renommage)."""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"⚠️ Impossible d'écrire l'instantané Grist ({path}) : {e}")
+
+_grist_columns_cache = {}
+_grist_columns_cache_lock = threading.Lock()
+# Durée de validité (s) de la liste des colonnes d'une table
+GRIST_COLUMNS_CACHE_TTL = 300
+
+def _grist_table_columns(base_url, doc_id, api_key, table_name):
+    """Colonnes d'une table {id: type Grist} (mis en cache) ; None si la table n'existe pas."""
+    key = (base_url, doc_id, table_name)
+    with _grist_columns_cache_lock:
+        entry = _grist_columns_cache.get(key)
+        if entry is not None and time.monotonic() - entry[0] < GRIST_COLUMNS_CACHE_TTL:
+            return entry[1]
+
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Accept": "application/json"
+    }
+    url = f"{base_url}/api/docs/{doc_id}/tables/{table_name}/columns"
+    url = url.replace('://', '§§').replace('//', '/').replace('§§', '://')
+    response = http_get(url, headers=headers)
+    if response.status_code == 404:
+        columns = None
+    else:
+        response.raise_for_status()
+        columns = {
+            col.get("id"): (col.get("fields") or {}).get("type")
+            for col in (response.json() or {}).get("columns", []) if col.get("id")
+        }
+
+    with _grist_columns_cache_lock:
+        _grist_columns_cache[key] = (time.monotonic(), columns)
+    return columns
+
 ###
 ### Fonction pour récuperer / créer dans Grist les objets
 ###    
    
-def grist_get_epic_object(base_url, doc_id, api_key, table_name, filter_epic_id=None , pi=0):
+def grist_get_epic_object(base_url, doc_id, api_key, table_name, filter_epic_id=None , pi=0, resolver=None,
+                          sort=None, limit=None, snapshot_dir=None, full_reconcile_interval=None):
     """
     Récupère l'ensemble des données depuis la source de données Grist.
     Retourne un tuple (DataFrame pandas, dernier_timestamp).
+
+    Les prédicats Epic / pi_Num sont transmis à Grist (paramètre `filter` de l'endpoint records)
+    pour ne transférer que les lignes de l'epic sélectionné ; `sort` et `limit` sont optionnels.
+    Si Grist refuse le filtre (colonne absente...), on relit la table complète ; le filtrage
+    Python ci-dessous reste appliqué dans tous les cas.
+
+    snapshot_dir (optionnel) : lecture incrémentale via un instantané local de la table
+    (voir grist_get_table_records_incremental) au lieu du téléchargement filtré, si la table
+    a une colonne de dernière modification.
     """
         
     # Détermine le champ de liaison Epic et récupère les informations de l'Epic correspondant
     # Récupère les informations de l'Epic correspondant
     
     if filter_epic_id is not None:
-        epic = grist_get_epic(base_url, doc_id, api_key, filter_epic_id)
+        epic = grist_get_epic(base_url, doc_id, api_key, filter_epic_id, resolver=resolver)
         
     headers = {
         "Authorization": f"Bearer {api_key}",
@@ -225,12 +629,26 @@ def grist_get_epic_object(base_url, doc_id, api_key, table_name, filter_epic_id=
     }
 
     try:
-        url = f"{base_url}/api/docs/{doc_id}/tables/{table_name}/records"
-        url = url.replace('://', '§§').replace('//', '/').replace('§§', '://')
-        
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        data = response.json()
+        incremental = grist_get_table_records_incremental(
+            base_url, doc_id, api_key, table_name, snapshot_dir,
+            full_reconcile_interval=full_reconcile_interval or GRIST_FULL_RECONCILE_INTERVAL,
+        ) if snapshot_dir else None
+
+        if incremental is not None:
+            data = {"records": incremental}
+        else:
+            # lecture filtrée (Epic / PI côté serveur) ; aussi pour une table sans colonne de modification
+            url = f"{base_url}/api/docs/{doc_id}/tables/{table_name}/records"
+            url = url.replace('://', '§§').replace('//', '/').replace('§§', '://')
+
+            params = _grist_records_params(epic if filter_epic_id is not None else None, pi, sort, limit)
+            response = http_get(url, headers=headers, params=params)
+            if params.get("filter") and response.status_code == 400:
+                logger.warning(f"⚠️ Filtre Grist refusé pour {table_name} ({response.text[:200]}) : lecture complète.")
+                params.pop("filter")
+                response = http_get(url, headers=headers, params=params)
+            response.raise_for_status()
+            data = response.json()
 
         records = []
         last_update = None
@@ -287,6 +705,147 @@ def grist_get_epic_object(base_url, doc_id, api_key, table_name, filter_epic_id=
         logger.warning(f"❌ Erreur lors de la récupération des données Grist : {e}")
         return pd.DataFrame(), None
     
+def _grist_records_params(epic, pi, sort=None, limit=None):
+    """
+    Paramètres de l'endpoint /records : filtre serveur sur la référence Epic (record id)
+    et sur pi_Num (valeur entière et texte, selon le type de la colonne), tri et limite optionnels.
+    """
+    filters = {}
+    if isinstance(epic, dict) and epic.get("id") is not None:
+        filters["Epic"] = [epic.get("id")]
+    try:
+        pi_val = int(pi)
+    except (ValueError, TypeError):
+        pi_val = 0
+    if pi_val >= 1:
+        filters["pi_Num"] = [pi_val, str(pi_val)]
+
+    params = {}
+    if filters:
+        params["filter"] = json.dumps(filters)
+    if sort:
+        params["sort"] = sort
+    if limit:
+        params["limit"] = int(limit)
+    return params
+
+### Allocation des id_Num (numéros d'objets par table / PI)
+
+class GristIdAllocator:
+    """
+    Allocateur d'id_Num par (table, PI) : le max courant est lu côté serveur en une requête
+    (SQL MAX() sur /sql, ou /records trié décroissant limité à 1 ligne), puis une plage d'ids
+    consécutifs est réservée de façon atomique :
+      - dans le processus (verrou + prochain id connu par clé) ;
+      - entre processus (workers gunicorn) via un fichier de réservations verrouillé (fcntl)
+        dans `state_dir`, les ids réservés n'étant jamais redistribués.
+    Un id réservé mais non créé (échec de création) laisse simplement un trou dans la numérotation.
+    """
+
+    def __init__(self, base_url, doc_id, api_key, state_dir=None):
+        self.base_url = base_url
+        self.doc_id = doc_id
+        self.api_key = api_key
+        self.state_dir = state_dir
+        self._lock = threading.Lock()
+        self._next = {}  # (table, pi) -> prochain id libre connu dans ce processus
+
+    def reserve(self, table, pi_num, count, floor=0):
+        """Réserve `count` id_Num consécutifs pour (table, pi_num) ; retourne le premier.
+
+        floor : max déjà connu localement (garde-fou si la lecture serveur échoue).
+        """
+        count = max(0, int(count))
+        pi_val = _grist_pi_value(pi_num)
+        server_max = self._server_max(table, pi_val)
+        key = (table, pi_val)
+        with self._lock, self._reservations() as reservations:
+            state_key = f"{table}|{pi_val}"
+            start = max(int(floor or 0), server_max or 0, self._next.get(key, 1) - 1,
+                        int(reservations.get(state_key, 0))) + 1
+            if count:
+                reservations[state_key] = start + count - 1
+                self._next[key] = start + count
+        logger.debug(f"🔢 id_Num réservés pour {table} (PI {pi_val}) : {start}..{start + count - 1}")
+        return start
+
+    def _server_max(self, table, pi_val):
+        """Plus grand id_Num de la table pour le PI (0 si aucun) ; None si la lecture échoue."""
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+            "Accept": "application/json"
+        }
+        url = f"{self.base_url}/api/docs/{self.doc_id}/sql"
+        url = url.replace('://', '§§').replace('//', '/').replace('§§', '://')
+        sql = f'SELECT MAX(CAST("id_Num" AS INTEGER)) AS max_id FROM "{table}"'
+        args = []
+        if pi_val >= 1:
+            sql += ' WHERE CAST("pi_Num" AS INTEGER) = ?'
+            args.append(pi_val)
+        try:
+            response = http_post(url, headers=headers, json={"sql": sql, "args": args}, retry=True)
+            response.raise_for_status()
+            rows = (response.json() or {}).get("records", [])
+            value = (rows[0].get("fields", rows[0]) or {}).get("max_id") if rows else None
+            return int(value or 0)
+        except (requests.exceptions.RequestException, ValueError, TypeError) as e:
+            logger.info(f"↩️ MAX(id_Num) via /sql indisponible pour {table} ({e}) : lecture /records triée.")
+
+        url = f"{self.base_url}/api/docs/{self.doc_id}/tables/{table}/records"
+        url = url.replace('://', '§§').replace('//', '/').replace('§§', '://')
+        try:
+            response = http_get(url, headers=headers, params=_grist_records_params(None, pi_val, sort="-id_Num", limit=1))
+            response.raise_for_status()
+            rows = (response.json() or {}).get("records", [])
+            return int((rows[0].get("fields") or {}).get("id_Num") or 0) if rows else 0
+        except (requests.exceptions.RequestException, ValueError, TypeError) as e:
+            logger.warning(f"⚠️ Impossible de lire le max id_Num de {table} dans Grist : {e}")
+            return None
+
+    @contextmanager
+    def _reservations(self):
+        """Réservations partagées entre processus ({"table|pi": dernier id réservé}), fichier verrouillé."""
+        if not self.state_dir or fcntl is None:
+            yield {}
+            return
+        safe = "".join(c if c.isalnum() or c in "-_" else "_" for c in str(self.doc_id))
+        os.makedirs(self.state_dir, exist_ok=True)
+        with open(os.path.join(self.state_dir, f"{safe}_id_reservations.json"), "a+", encoding="utf-8") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                try:
+                    reservations = json.loads(f.read() or "{}")
+                except ValueError:
+                    reservations = {}
+                yield reservations
+                f.seek(0)
+                f.truncate()
+                json.dump(reservations, f)
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+_grist_id_allocators = {}
+_grist_id_allocators_lock = threading.Lock()
+
+def grist_id_allocator(base_url, doc_id, api_key, state_dir=None):
+    """Allocateur partagé (un par document Grist) pour que les réservations du processus soient communes."""
+    key = (base_url, doc_id, state_dir)
+    with _grist_id_allocators_lock:
+        allocator = _grist_id_allocators.get(key)
+        if allocator is None:
+            allocator = _grist_id_allocators[key] = GristIdAllocator(base_url, doc_id, api_key, state_dir)
+        allocator.api_key = api_key
+        return allocator
+
+def _grist_pi_value(pi):
+    try:
+        return int(float(pi))
+    except (ValueError, TypeError):
+        return 0
+
 ### Création des objets lié à un EPIC / PI pi number
 #   dans Grist si "action = 'not_present'" partir du fichier de diffs issue d'iObeya et GitHub    
 # NOTE / TODO : Pour se rappeller 
@@ -351,10 +910,8 @@ def grist_create_epic_objects(grist_conf, iobeya_conf,github_conf,context):
     # initialisations
     created = []
     combined_diffs = []
-
-    # on compile les id numériques max déjà utilisés par type d'objet dans grist (par epic / pi num)
-    # (on calcule à partir des objets déjà présents dans Grist)
-    max_ids = _compute_max_id_by_type(grist_objects, pi_num=pi_Num)
+    github_updates = []  # (résultat, (id_Github_IssueGQL, nouveau titre, labels, nameWithOwner)) traités en lot après les créations
+    iobeya_updates = []  # (résultat, (uid iObeya, nouveau titre)) traités en lot après les créations
 
     # Fusion des diffs iObeya et GitHub pour créer les onjets manquants dans Grist
     # todo ajouter un champ source dans les diffs pour savoir d'où vient l'objet (iobeya/github) et l'id de l'objets source 
@@ -383,12 +940,41 @@ def grist_create_epic_objects(grist_conf, iobeya_conf,github_conf,context):
             obj["source"] = "github"
             combined_diffs.append(obj)
 
+    # Objets GitHub lus avec le profil "lean" : corps et commentaires relus uniquement pour ceux à créer.
+    # Un objet dont les détails n'ont pu être lus n'est pas créé (il le serait sans Description) : échec signalé
+    details_failed = github_load_object_details(
+        [obj for obj in combined_diffs if obj.get("source") == "github"],
+        (github_conf or {}).get("api_token"),
+    )
+    for obj in details_failed:
+        logger.error(f"❌ {obj.get('Nom')} ({obj.get('type')}) non créé : détails GitHub non chargés ({obj.get('details_error')}).")
+        created.append({
+            "records": None, "source": "github", "Nom": obj.get("Nom"), "type": obj.get("type"),
+            "error": f"détails GitHub non chargés : {obj.get('details_error')}",
+        })
+    combined_diffs = [obj for obj in combined_diffs if not any(obj is failed for failed in details_failed)]
+
     logger.info(f"🧩 {len(combined_diffs)} features à créer dans Grist (not_present).")
 
     # Création des objets manquants dans Grist
     # l'id_epic est implicite au contexte de la synchro 
     # La syntaxe des variables utilisé ici est volontairement identique de celle utilisée des objets dans Grist y/c la casse
      
+    # 1) Réservation des id_Num : une plage par table, à partir du max lu côté serveur (par PI)
+    #    et réservée atomiquement (pas de doublon entre utilisateurs / workers simultanés).
+    #    Le max des objets de la session ne sert que de garde-fou si la lecture serveur échoue.
+    allocator = grist_id_allocator(api_url, doc_id, api_token, grist_conf.get("id_state_dir"))
+    local_max_ids = _compute_max_id_by_type(grist_objects, pi_num=pi_Num) if combined_diffs else {}
+    counts = defaultdict(int)
+    for object in combined_diffs:
+        counts[object.get("type", "Features")] += 1
+    next_ids = {
+        type: allocator.reserve(type, pi_Num, count, floor=local_max_ids.get(type, 0))
+        for type, count in counts.items()
+    }
+
+    # 2) Préparation des enregistrements (id_Num attribué séquentiellement dans la plage réservée)
+    pending_creations = []
     for object in combined_diffs:
 
         # valeurs obligatoires / communes
@@ -403,16 +989,11 @@ def grist_create_epic_objects(grist_conf, iobeya_conf,github_conf,context):
         Criteres_d_acceptation = object.get("Criteres_d_acceptation", None)
         Committed = object.get("Committed", None)
 
-        # calcul de l'identifiant numérique de l'objet à créer (on prend la valeur max + 1)
-        next_id = int(max_ids.get(type, 0)) + 1
-        max_ids[type] = next_id
-        id_Num = next_id
+        # identifiant numérique de l'objet à créer (suivant dans la plage réservée pour la table)
+        id_Num = next_ids[type]
+        next_ids[type] = id_Num + 1
 
-        result = grist_create_object(
-            base_url=api_url,
-            doc_id=doc_id,
-            api_key=api_token,
-            type=type,
+        fields = _grist_object_fields(
             Epic=epic_Name,
             pi_Num=pi_Num,
             id_Num=id_Num,
@@ -424,7 +1005,22 @@ def grist_create_epic_objects(grist_conf, iobeya_conf,github_conf,context):
             Commentaires=f"Créé via synchronisation depuis {source}, le {datetime.now().strftime('%Y-%m-%d')}",
             Committed=Committed
         )
-        
+        pending_creations.append((object, type, Nom, id_Num, Committed, source, fields))
+
+    # 3) Création en lot : un seul appel /apply atomique pour toutes les tables
+    #    (ou un POST par table, découpé en paquets de create_chunk_size, si /apply est indisponible)
+    record_ids = grist_create_records_batch(
+        api_url, doc_id, api_token,
+        [(type, fields) for (_, type, _, _, _, _, fields) in pending_creations],
+        chunk_size=grist_conf.get("create_chunk_size") or GRIST_CREATE_CHUNK_SIZE,
+        use_apply=grist_conf.get("write_mode", "apply") == "apply",
+    )
+
+    # 4) Propagation des identifiants (préfixes de titres iObeya / GitHub) pour chaque objet créé
+    for (object, type, Nom, id_Num, Committed, source, _), record_id in zip(pending_creations, record_ids):
+
+        result = {"records": [{"id": record_id}]} if record_id is not None else None
+
         # ajouter les informations de source / contexte si besoin
         # calcule de l'id_de l'objet du grist à partir de l'objet créé
         # TODO : à refactorer plus tard ( mettre dans une fonction dédiée dans sync utils par exemple )
@@ -470,36 +1066,117 @@ def grist_create_epic_objects(grist_conf, iobeya_conf,github_conf,context):
                 #iobeya_object = find_item_by_id(iobeya_objects, Nom, "Nom")
 
                 # on met à jour le titre de la carte iobeya pour y inclure
-                iobeya_api_url = iobeya_conf.get("api_url", [])
-                iobeya_api_token = iobeya_conf.get("api_token", [])
+                # (mise à jour différée : un PUT en lot après la boucle de création)
                 object_id = object.get("uid", "")
                 new_title = f"[{id_objet_prefix}] : {Nom}"
-                res = iobeya_update_object_title_prefix(iobeya_api_url, iobeya_api_token, new_title, object_id)
-                result["update_iobeyacard_title"] = res
+                iobeya_updates.append((result, (object_id, new_title)))
 
             if source == "github":
                 result["source"] = source
                 # on met à jour le titre de l'issue de graphQl pour y inclure l'identifiant en prefixe
-                github_token = github_conf.get("api_token", "")
+                # (mise à jour différée : un lot de mutations GraphQL après la boucle de création)
                 new_title = f"[{id_objet_prefix}] : {Nom}"
-                object_id = object.get("id_Github_Issue", "")
                 number = object.get("number", "")
                 id_Github_IssueGQL = object.get("id_Github_IssueGQL", "")
                 nameWithOwner = object.get("nameWithOwner", "")
+                labels = ["feature"] if nameWithOwner and number else []
 
-                #res = github_update_issue_title_gql( github_token, id_Github_IssueGQL, new_title) 
-                res = github_update_issue_title_gql_label(github_token, nameWithOwner, id_Github_IssueGQL, number, new_title, add_feature_label = True)
-                result["update_github_issue_title"] = res
+                github_updates.append((result, (id_Github_IssueGQL, new_title, labels, nameWithOwner)))
                 
             # Si création réussie, on ajoute à la liste des créés et gardant depuis quel source
             created.append(result)
             
+    # Mise à jour en lot des titres des cartes iObeya (lecture par élément ou du board selon le nombre + PUT par paquets)
+    if iobeya_updates:
+        res = iobeya_update_objects_title_prefix(
+            iobeya_conf.get("api_url", ""), iobeya_conf.get("api_token", ""),
+            [update for _, update in iobeya_updates],
+            board_id=iobeya_conf.get("board_id"),
+            chunk_size=iobeya_conf.get("create_chunk_size") or IOBEYA_CREATE_CHUNK_SIZE,
+        )
+        for (result, _), updated in zip(iobeya_updates, res):
+            result["update_iobeyacard_title"] = [updated] if updated else None
+
+    # Mise à jour en lot des titres / labels des issues GitHub (mutations GraphQL aliasées)
+    if github_updates:
+        github_token = github_conf.get("api_token", "")
+        res = github_update_issues_title_label_batch(github_token, [update for _, update in github_updates])
+        for (result, _), ok in zip(github_updates, res):
+            result["update_github_issue_title"] = ok
+
     ## todo : pensez à ajouter des fonction de CRUD dans iobeya et github ? (dans la methode appellante ) 
     
-    logger.info(f"✅ {len(created)} features créées dans Grist.")
+    logger.info(f"✅ {sum(1 for result in created if result.get('records'))} features créées dans Grist.")
     return created
 
 
+def grist_update_epic_objects(grist_conf, context):
+    """
+    Applique dans Grist les diffs "update_grist" (objets présents des deux côtés dont le titre ou la
+    description a changé côté iObeya / GitHub).
+
+    Les diffs des deux sources sont fusionnés par enregistrement Grist (type, id), puis envoyés en lot :
+    un BulkUpdateRecord par (table, jeu de colonnes) dans un seul appel /apply, ou un PATCH /records
+    par table (paquets de create_chunk_size) si l'écriture par /apply n'est pas disponible.
+    Si iObeya et GitHub proposent des valeurs différentes pour une même colonne d'un même
+    enregistrement, la colonne n'est pas modifiée et le conflit est signalé.
+    Retourne {"updated": [{"type", "id", "fields"}], "conflicts": [{"type", "id", "Nom", "field", "values"}]}.
+    """
+    wrapper = context if isinstance(context, dict) else {}
+
+    updates = {}  # (table, id) -> {colonne: (source, valeur)}
+    names = {}
+    conflicts = []
+    for diff_key in ("iobeya_diff", "github_diff"):
+        source = diff_key.split("_", 1)[0]
+        for item in wrapper.get(diff_key) or []:
+            if not isinstance(item, dict) or item.get("action") != "update_grist":
+                continue
+            table, record_id, fields = item.get("type"), item.get("id"), item.get("fields") or {}
+            if not table or record_id is None or not fields:
+                logger.warning(f"⚠️ Diff update_grist incomplet ignoré (Nom={item.get('Nom')}, type={table}).")
+                continue
+            key = (table, record_id)
+            names.setdefault(key, item.get("Nom"))
+            merged = updates.setdefault(key, {})
+            for field, value in fields.items():
+                if field in merged and not _grist_same_value(field, merged[field][1], value):
+                    conflicts.append({
+                        "type": table, "id": record_id, "Nom": names[key], "field": field,
+                        "values": {merged[field][0]: merged[field][1], source: value},
+                    })
+                    logger.warning(f"⚠️ Conflit sur {table} #{record_id} ({field}) : iObeya et GitHub diffèrent, colonne non modifiée.")
+                merged.setdefault(field, (source, value))
+
+    for conflict in conflicts:
+        updates[(conflict["type"], conflict["id"])].pop(conflict["field"], None)
+    updates = {key: {field: value for field, (_, value) in merged.items()}
+               for key, merged in updates.items() if merged}
+
+    if not updates:
+        return {"updated": [], "conflicts": conflicts}
+
+    logger.info(f"🧩 {len(updates)} objet(s) à mettre à jour dans Grist (update_grist).")
+    records = [(table, record_id, fields) for (table, record_id), fields in updates.items()]
+    applied = grist_update_records_batch(
+        grist_conf.get("api_url"), grist_conf.get("doc_id"), grist_conf.get("api_token"),
+        records,
+        chunk_size=grist_conf.get("create_chunk_size") or GRIST_CREATE_CHUNK_SIZE,
+        use_apply=grist_conf.get("write_mode", "apply") == "apply",
+    )
+    updated = [{"type": table, "id": record_id, "fields": fields}
+               for (table, record_id, fields), ok in zip(records, applied) if ok]
+    logger.info(f"✅ {len(updated)} objet(s) mis à jour dans Grist.")
+    return {"updated": updated, "conflicts": conflicts}
+
+def _grist_same_value(field, a, b):
+    """Égalité de deux valeurs proposées pour une colonne (espaces normalisés, casse ignorée pour Nom)."""
+    a, b = " ".join(str(a).split()), " ".join(str(b).split())
+    if field == "Nom":
+        return a.lower() == b.lower()
+    return a == b
+
+
 ###
 ### Ensemble des fonction CRUD pour les features
 ###
@@ -520,26 +1197,12 @@ def grist_create_object(
         "Accept": "application/json"
     }
 
-    # Construction des champs en filtrant les valeurs None / vides
-    fields = {
-        "Epic": Epic,            
-        "pi_Num": pi_Num,
-        "id_Num": id_Num,
-        "Nom": Nom,
-        "Description": Description,
-        "Hypotheses_de_gain": Hypotheses_de_gain,
-        "Commentaires": Commentaires,
-        "Criteres_d_acceptation": Criteres_d_acceptation,
-        "Committed": Committed,
-        "timestamp": timestamp,
-    }
-
-    # Supprime les champs None, vides ou chaînes vides
-    fields = {
-        k: v
-        for k, v in fields.items()
-        if v is not None and not (isinstance(v, str) and v.strip() == "")
-    }
+    fields = _grist_object_fields(
+        Epic=Epic, pi_Num=pi_Num, id_Num=id_Num, timestamp=timestamp,
+        Nom=Nom, Description=Description,
+        Hypotheses_de_gain=Hypotheses_de_gain, Criteres_d_acceptation=Criteres_d_acceptation,
+        Commentaires=Commentaires, Committed=Committed
+    )
 
     payload = {
         "records": [
@@ -553,7 +1216,7 @@ def grist_create_object(
     url = url.replace('://', '§§').replace('//', '/').replace('§§', '://')
 
     try:
-        response = requests.post(url, headers=headers, json=payload)
+        response = http_post(url, headers=headers, json=payload)
         response.raise_for_status()
         data = response.json()
         logger.info(f"✅ objet créé avec succès dans Grist : {type} / {data}")
@@ -563,6 +1226,219 @@ def grist_create_object(
         logger.warning(f"❌ Erreur lors de la création de l'objet {type} : {e}")
         return None
 
+class GristActionBatch:
+    """
+    Lot d'actions utilisateur Grist (BulkAddRecord / BulkUpdateRecord) envoyées en un seul appel
+    à l'endpoint /api/docs/{doc}/apply : toutes les tables en un aller-retour, appliqué de façon
+    atomique par Grist (tout ou rien).
+    """
+
+    def __init__(self, base_url, doc_id, api_key):
+        self.base_url = base_url
+        self.doc_id = doc_id
+        self.api_key = api_key
+        self.actions = []
+
+    def add_records(self, table, fields_list):
+        """Ajoute un BulkAddRecord ; retourne l'index de l'action (ses retValues sont les row ids créés)."""
+        columns = sorted({col for fields in fields_list for col in fields})
+        self.actions.append([
+            "BulkAddRecord", table, [None] * len(fields_list),
+            {col: [fields.get(col) for fields in fields_list] for col in columns},
+        ])
+        return len(self.actions) - 1
+
+    def update_records(self, table, updates):
+        """Ajoute un BulkUpdateRecord pour des (row_id, fields) partageant le même jeu de colonnes."""
+        columns = sorted({col for _, fields in updates for col in fields})
+        self.actions.append([
+            "BulkUpdateRecord", table, [row_id for row_id, _ in updates],
+            {col: [fields.get(col) for _, fields in updates] for col in columns},
+        ])
+        return len(self.actions) - 1
+
+    def apply(self):
+        """Envoie toutes les actions en un appel ; retourne les retValues (une entrée par action).
+
+        Lève requests.RequestException en cas d'échec : dans ce cas rien n'a été appliqué.
+        """
+        if not self.actions:
+            return []
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+            "Accept": "application/json"
+        }
+        url = f"{self.base_url}/api/docs/{self.doc_id}/apply"
+        url = url.replace('://', '§§').replace('//', '/').replace('§§', '://')
+        response = http_post(url, headers=headers, json=self.actions)
+        response.raise_for_status()
+        ret_values = (response.json() or {}).get("retValues", [])
+        logger.info(f"✅ {len(self.actions)} action(s) appliquée(s) dans Grist en un appel /apply.")
+        return ret_values
+
+
+def grist_create_records_batch(base_url, doc_id, api_key, records, chunk_size=GRIST_CREATE_CHUNK_SIZE, use_apply=True):
+    """
+    Crée des enregistrements dans Grist en lot.
+
+    records : liste de (table, fields). Les enregistrements sont regroupés par table (et par
+    jeu de colonnes, Grist attendant des colonnes homogènes dans un même POST).
+    use_apply : toutes les tables en un seul appel /apply atomique (GristActionBatch) ; si l'endpoint
+    est indisponible (404/405), repli sur un POST /records par table, par paquets de `chunk_size`.
+    Un refus d'accès (403) est levé (HTTPError) : le repli échouerait pour la même raison.
+    Retourne la liste des record ids créés, dans l'ordre de `records` (None en cas d'échec).
+    """
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json",
+        "Accept": "application/json"
+    }
+    chunk_size = max(1, int(chunk_size))
+
+    groups = {}
+    for index, (table, fields) in enumerate(records):
+        groups.setdefault((table, tuple(sorted(fields))), []).append(index)
+
+    record_ids = [None] * len(records)
+
+    if use_apply and records:
+        batch = GristActionBatch(base_url, doc_id, api_key)
+        actions = [(batch.add_records(table, [records[i][1] for i in indexes]), indexes)
+                   for (table, _), indexes in groups.items()]
+        try:
+            ret_values = batch.apply()
+            for action_index, indexes in actions:
+                row_ids = ret_values[action_index] if action_index < len(ret_values) else []
+                for i, row_id in zip(indexes, row_ids or []):
+                    record_ids[i] = row_id
+            logger.info(f"📦 {len(records)} créations Grist en 1 requête /apply.")
+            return record_ids
+        except requests.exceptions.HTTPError as e:
+            status = e.response.status_code if e.response is not None else None
+            if status == 403:
+                logger.error(f"❌ Création en lot refusée par Grist (HTTP 403, droits insuffisants) : {e}")
+                raise
+            if status not in (404, 405):
+                logger.warning(f"❌ Création en lot refusée par Grist (/apply, rien n'a été appliqué) : {e}")
+                return record_ids
+            logger.info(f"↩️ Endpoint /apply indisponible (HTTP {status}) : création par table.")
+        except requests.exceptions.RequestException as e:
+            # Issue incertaine (timeout...) : pas de repli pour ne pas risquer de doublons
+            logger.warning(f"❌ Erreur lors de la création en lot (/apply) : {e}")
+            return record_ids
+
+    calls = 0
+    for (table, _), indexes in groups.items():
+        url = f"{base_url}/api/docs/{doc_id}/tables/{table}/records"
+        url = url.replace('://', '§§').replace('//', '/').replace('§§', '://')
+
+        for start in range(0, len(indexes), chunk_size):
+            chunk = indexes[start:start + chunk_size]
+            payload = {"records": [{"fields": records[i][1]} for i in chunk]}
+            calls += 1
+            try:
+                response = http_post(url, headers=headers, json=payload)
+                response.raise_for_status()
+                created = (response.json() or {}).get("records", [])
+                # Grist renvoie les ids dans l'ordre des enregistrements envoyés
+                for i, rec in zip(chunk, created):
+                    record_ids[i] = rec.get("id")
+                logger.info(f"✅ {len(created)} objet(s) créé(s) dans Grist : {table}")
+            except requests.exceptions.RequestException as e:
+                logger.warning(f"❌ Erreur lors de la création en lot de {len(chunk)} objet(s) {table} : {e}")
+
+    logger.info(f"📦 {len(records)} créations Grist en {calls} requête(s).")
+    return record_ids
+
+def grist_update_records_batch(base_url, doc_id, api_key, records, chunk_size=GRIST_CREATE_CHUNK_SIZE, use_apply=True):
+    """
+    Met à jour des enregistrements Grist en lot.
+
+    records : liste de (table, row_id, fields), regroupés par table et jeu de colonnes.
+    use_apply : un seul appel /apply atomique (BulkUpdateRecord) ; repli sur un PATCH /records par
+    table, par paquets de `chunk_size`, si l'endpoint est indisponible (404/405).
+    Un refus d'accès (403) est levé (HTTPError) : le repli échouerait pour la même raison.
+    Retourne une liste de booléens (mise à jour appliquée ou non), dans l'ordre de `records`.
+    """
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json",
+        "Accept": "application/json"
+    }
+    chunk_size = max(1, int(chunk_size))
+
+    groups = {}
+    for index, (table, _, fields) in enumerate(records):
+        groups.setdefault((table, tuple(sorted(fields))), []).append(index)
+
+    applied = [False] * len(records)
+
+    if use_apply and records:
+        batch = GristActionBatch(base_url, doc_id, api_key)
+        for (table, _), indexes in groups.items():
+            batch.update_records(table, [(records[i][1], records[i][2]) for i in indexes])
+        try:
+            batch.apply()
+            logger.info(f"📦 {len(records)} mises à jour Grist en 1 requête /apply.")
+            return [True] * len(records)
+        except requests.exceptions.HTTPError as e:
+            status = e.response.status_code if e.response is not None else None
+            if status == 403:
+                logger.error(f"❌ Mise à jour en lot refusée par Grist (HTTP 403, droits insuffisants) : {e}")
+                raise
+            if status not in (404, 405):
+                logger.warning(f"❌ Mise à jour en lot refusée par Grist (/apply, rien n'a été appliqué) : {e}")
+                return applied
+            logger.info(f"↩️ Endpoint /apply indisponible (HTTP {status}) : mise à jour par table.")
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"❌ Erreur lors de la mise à jour en lot (/apply) : {e}")
+            return applied
+
+    calls = 0
+    for (table, _), indexes in groups.items():
+        url = f"{base_url}/api/docs/{doc_id}/tables/{table}/records"
+        url = url.replace('://', '§§').replace('//', '/').replace('§§', '://')
+
+        for start in range(0, len(indexes), chunk_size):
+            chunk = indexes[start:start + chunk_size]
+            payload = {"records": [{"id": records[i][1], "fields": records[i][2]} for i in chunk]}
+            calls += 1
+            try:
+                response = http_patch(url, headers=headers, json=payload)
+                response.raise_for_status()
+                for i in chunk:
+                    applied[i] = True
+                logger.info(f"✅ {len(chunk)} objet(s) mis à jour dans Grist : {table}")
+            except requests.exceptions.RequestException as e:
+                logger.warning(f"❌ Erreur lors de la mise à jour en lot de {len(chunk)} objet(s) {table} : {e}")
+
+    logger.info(f"📦 {len(records)} mises à jour Grist en {calls} requête(s).")
+    return applied
+
+def _grist_object_fields(Epic, pi_Num, id_Num, timestamp, Nom, Description,
+                         Hypotheses_de_gain, Criteres_d_acceptation, Commentaires, Committed):
+    """Champs d'un objet à créer dans Grist, sans les valeurs None / vides."""
+    fields = {
+        "Epic": Epic,            
+        "pi_Num": pi_Num,
+        "id_Num": id_Num,
+        "Nom": Nom,
+        "Description": Description,
+        "Hypotheses_de_gain": Hypotheses_de_gain,
+        "Commentaires": Commentaires,
+        "Criteres_d_acceptation": Criteres_d_acceptation,
+        "Committed": Committed,
+        "timestamp": timestamp,
+    }
+
+    # Supprime les champs None, vides ou chaînes vides
+    return {
+        k: v
+        for k, v in fields.items()
+        if v is not None and not (isinstance(v, str) and v.strip() == "")
+    }
+
 ### UTILITAIRES
 
 # -- Fonction utilitaire pour retrouver un élément par identifiant dans une liste de dictionnaires
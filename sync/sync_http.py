@@ -0,0 +1,234 @@
+## Couche de transport HTTP partagée par les connecteurs Grist, iObeya et GitHub
+
+import os, sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))) ##include the parent directory for module imports
+import random
+import threading
+import time
+import logging
+from urllib.parse import urlsplit
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import requests
+import yaml
+from requests.adapters import HTTPAdapter, BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+# HTTP/2 (optionnel) : utilisé pour api.github.com si httpx + h2 sont installés
+try:
+    import httpx  # type: ignore
+    import h2  # type: ignore  # noqa: F401
+except ImportError:
+    httpx = None
+
+# --- Activation et configuration des logs ---
+logging.basicConfig(
+    level=logging.DEBUG,
+    format="%(asctime)s [%(levelname)s] %(message)s"
+)
+logger = logging.getLogger("sync_http")
+
+# Chargement de la configuration depuis config.yaml ou config.example.yaml
+config_path = "config.yaml" if os.path.exists("config.yaml") else "config.example.yaml"
+with open(config_path, "r") as f:
+    config = yaml.safe_load(f) or {}
+
+http_conf = config.get("http", {}) or {}
+
+# Timeouts par défaut (connexion, lecture) appliqués quand l'appelant n'en fournit pas
+DEFAULT_TIMEOUT = (
+    float(http_conf.get("connect_timeout", 5)),
+    float(http_conf.get("read_timeout", 30)),
+)
+# Taille des pools de connexions keep-alive par hôte
+POOL_MAXSIZE = int(http_conf.get("pool_maxsize", 10))
+# Nombre de nouvelles tentatives (méthodes idempotentes uniquement) et base du backoff (secondes)
+MAX_RETRIES = int(http_conf.get("max_retries", 3))
+BACKOFF_BASE = float(http_conf.get("backoff_base", 0.5))
+BACKOFF_MAX = float(http_conf.get("backoff_max", 10))
+# Attente maximale acceptée pour un Retry-After envoyé par le serveur (au-delà : pas de nouvelle tentative)
+RETRY_AFTER_MAX = float(http_conf.get("retry_after_max", 120))
+# Hôtes servis en HTTP/2 quand httpx[http2] est disponible
+HTTP2_HOSTS = set(http_conf.get("http2_hosts", ["api.github.com"]) or [])
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "PUT", "DELETE", "OPTIONS"}
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+###########
+###########  Sessions poolées par hôte  ###########
+###########
+
+def http_session(url):
+    """Retourne la requests.Session partagée (keep-alive, pool de connexions) pour l'hôte de `url`."""
+    parts = urlsplit(url)
+    key = f"{parts.scheme}://{parts.netloc}".lower()
+
+    session = _sessions.get(key)
+    if session is not None:
+        return session
+
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = requests.Session()
+            if httpx is not None and parts.hostname in HTTP2_HOSTS:
+                session.mount(key, _Http2Adapter())
+                logger.debug(f"🔌 Session HTTP/2 créée pour {key}")
+            else:
+                # Les retries sont gérés par http_request (backoff avec jitter) : pas de retry urllib3 ici
+                session.mount(key, HTTPAdapter(pool_connections=1, pool_maxsize=POOL_MAXSIZE, max_retries=0))
+                logger.debug(f"🔌 Session HTTP/1.1 poolée créée pour {key}")
+            _sessions[key] = session
+    return session
+
+
+def http_request(method, url, timeout=None, retry=None, **kwargs):
+    """
+    Envoie une requête via la session poolée de l'hôte.
+
+    Args:
+        method (str): méthode HTTP
+        url (str): URL complète
+        timeout: timeout requests ; DEFAULT_TIMEOUT si None
+        retry (bool, optional): force (ou interdit) les nouvelles tentatives ;
+            par défaut seules les méthodes idempotentes sont rejouées.
+    Returns:
+        requests.Response (le statut n'est pas vérifié : à l'appelant d'appeler raise_for_status()).
+    """
+    method = method.upper()
+    if timeout is None:
+        timeout = DEFAULT_TIMEOUT
+    if retry is None:
+        retry = method in IDEMPOTENT_METHODS
+    attempts = (MAX_RETRIES if retry else 0) + 1
+
+    session = http_session(url)
+    for attempt in range(1, attempts + 1):
+        try:
+            response = session.request(method, url, timeout=timeout, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if attempt >= attempts:
+                raise
+            delay = _backoff_delay(attempt)
+            logger.warning(f"🔁 {method} {url} : {e} — nouvelle tentative {attempt}/{attempts - 1} dans {delay:.2f}s")
+            time.sleep(delay)
+            continue
+
+        if response.status_code in RETRY_STATUSES and attempt < attempts:
+            delay = _retry_after_delay(response)
+            if delay is not None and delay > RETRY_AFTER_MAX:
+                logger.warning(
+                    f"⏳ {method} {url} : HTTP {response.status_code}, Retry-After {delay:.0f}s > {RETRY_AFTER_MAX:.0f}s — pas de nouvelle tentative"
+                )
+                return response
+            if delay is None:
+                delay = _backoff_delay(attempt)
+            logger.warning(
+                f"🔁 {method} {url} : HTTP {response.status_code} — nouvelle tentative {attempt}/{attempts - 1} dans {delay:.2f}s"
+            )
+            response.close()
+            time.sleep(delay)
+            continue
+
+        return response
+
+
+def http_get(url, **kwargs):
+    return http_request("GET", url, **kwargs)
+
+
+def http_post(url, **kwargs):
+    return http_request("POST", url, **kwargs)
+
+
+def http_put(url, **kwargs):
+    return http_request("PUT", url, **kwargs)
+
+
+def http_patch(url, **kwargs):
+    return http_request("PATCH", url, **kwargs)
+
+
+def http_delete(url, **kwargs):
+    return http_request("DELETE", url, **kwargs)
+
+
+#####
+##### Fonctions utilitaires internes
+#####
+
+def _backoff_delay(attempt):
+    """Backoff exponentiel avec jitter complet : uniforme dans [0, min(max, base * 2^(n-1))]."""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** (attempt - 1))))
+
+
+def _retry_after_delay(response):
+    """Délai (secondes) indiqué par l'en-tête Retry-After (secondes ou date HTTP) ; None si absent.
+
+    La valeur du serveur est respectée telle quelle : BACKOFF_MAX ne borne que le backoff calculé,
+    le plafond RETRY_AFTER_MAX est appliqué par l'appelant.
+    """
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class _Http2Adapter(BaseAdapter):
+    """Adapter requests s'appuyant sur un httpx.Client HTTP/2 (multiplexage sur une seule connexion TLS).
+
+    Les appelants conservent l'API requests (Response, raise_for_status, exceptions requests).
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._client = httpx.Client(http2=True, limits=httpx.Limits(max_connections=POOL_MAXSIZE))
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            httpx_timeout = httpx.Timeout(read, connect=connect)
+        else:
+            httpx_timeout = httpx.Timeout(timeout)
+
+        try:
+            resp = self._client.request(
+                request.method,
+                request.url,
+                headers=dict(request.headers),
+                content=request.body,
+                timeout=httpx_timeout,
+            )
+        except httpx.TimeoutException as e:
+            raise requests.Timeout(e, request=request)
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(e, request=request)
+
+        response = requests.Response()
+        response.status_code = resp.status_code
+        response.headers = CaseInsensitiveDict(resp.headers)
+        response._content = resp.content
+        response.encoding = resp.encoding
+        response.reason = resp.reason_phrase
+        response.url = str(resp.url)
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self):
+        self._client.close()
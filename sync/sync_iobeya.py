@@ -10,6 +10,7 @@ from datetime import datetime, timezone
 import logging
 import json
 import uuid
+import codecs
 
 # --- Import des fonctions utilitaires ---
 
@@ -18,6 +19,7 @@ from sync.sync_utils import (
     extract_id_and_clean_for_kind,
     extract_objective_id_and_clean
 )
+from sync.sync_http import http_get, http_post, http_put
 
 # --- Activation et configuration des logs ---
 logging.basicConfig(
@@ -32,6 +34,19 @@ config_path = "config.yaml" if os.path.exists("config.yaml") else "config.exampl
 with open(config_path, "r") as f:
     config = yaml.safe_load(f)
 
+# Classes d'éléments du board exploitées par la synchronisation (les autres sont ignorées à la lecture)
+IOBEYA_BOARD_ELEMENT_CLASSES = {
+    "com.iobeya.dto.BoardCardDTO",
+    "com.iobeya.dto.BoardNoteDTO",
+    "com.iobeya.dto.BoardFreetextDTO",
+}
+# Taille (octets) des blocs lus sur le flux de détails d'un board
+IOBEYA_STREAM_CHUNK_SIZE = 64 * 1024
+# Nombre d'éléments envoyés par POST /s/j/elements lors des créations en lot
+IOBEYA_CREATE_CHUNK_SIZE = 50
+# En dessous de ce nombre d'éléments à retitrer, lecture élément par élément plutôt que du board complet
+IOBEYA_BOARD_READ_MIN = 10
+
 ###########    
 ###########  Methodes pour gérer les interactions avec iObeya  ###########
 ###########
@@ -49,7 +64,7 @@ def iobeya_get_rooms(base_url, token):
     url = f"{base_url}/s/j/rooms"
     headers = {"Authorization": f"Bearer {token}", "Accept": "application/json"}
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_get(url, headers=headers, timeout=10)
         response.raise_for_status()
         data = response.json()
         rooms = [
@@ -77,7 +92,7 @@ def iobeya_get_boards(room_id):
     url = f"{base_url}/s/j/rooms/{room_id}/details"
     headers = {"Authorization": f"Bearer {token}", "Accept": "application/json"}
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_get(url, headers=headers, timeout=10)
         response.raise_for_status()
         
         data = response.json()
@@ -134,9 +149,11 @@ def iobeya_get_board_objects(base_url, board_id, api_key, type_features_card_lis
 
     try:
         url = f"{base_url}/s/j/boards/{board_id}/details"
-        response = requests.get(url, headers=headers)
+        # Lecture en flux : les éléments du board sont décodés un par un et ceux dont la @class
+        # n'est pas exploitée (images, formes...) sont écartés aussitôt (mémoire constante)
+        response = http_get(url, headers=headers, stream=True)
         response.raise_for_status()
-        data = response.json()
+        data = iobeya_iter_board_elements(response, IOBEYA_BOARD_ELEMENT_CLASSES)
                 
                 # --- Debug: break early on a specific object id (useful to isolate problematic payloads)
         BREAK_ON_OBJECT_ID = "2CF60A73-E9C2-2B37-813A-C17D15CDED02"
@@ -293,35 +310,95 @@ def iobeya_get_board_objects(base_url, board_id, api_key, type_features_card_lis
         logger.info(f"✅ {len(returnObject)} objects récupérées depuis iObeya.")
         return returnObject
 
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, ValueError) as e:
         logger.warning(f"❌ Erreur lors de la récupération des objects iObeya : {e}")
         return None
 
+def iobeya_iter_board_elements(response, keep_classes=None, chunk_size=IOBEYA_STREAM_CHUNK_SIZE):
+    """
+    Parcourt en flux le tableau JSON renvoyé par /s/j/boards/{id}/details (requête faite avec stream=True).
+
+    Les éléments sont décodés un à un (json.JSONDecoder.raw_decode sur un tampon alimenté par
+    iter_content) : seul l'élément en cours est en mémoire. Ceux dont la @class n'est pas dans
+    keep_classes sont ignorés dès leur lecture (keep_classes=None : tout est renvoyé).
+    Lève ValueError si la réponse n'est pas un tableau JSON complet.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+    buffer = ""
+    pos = 0
+    started = False
+    read = kept = 0
+
+    try:
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            buffer = buffer[pos:] + text_decoder.decode(chunk)
+            pos = 0
+            while True:
+                # séparateurs entre éléments
+                while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                    pos += 1
+                if pos >= len(buffer):
+                    break
+                if not started:
+                    if buffer[pos] != "[":
+                        raise ValueError("réponse iObeya inattendue (tableau JSON attendu)")
+                    started = True
+                    pos += 1
+                    continue
+                if buffer[pos] == "]":
+                    logger.debug(f"📥 {read} éléments lus en flux sur le board, {kept} conservés.")
+                    return
+                try:
+                    item, pos = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    break  # élément incomplet : on lit la suite du flux
+                read += 1
+                if keep_classes is None or (isinstance(item, dict) and item.get("@class") in keep_classes):
+                    kept += 1
+                    yield item
+    finally:
+        response.close()
+
+    raise ValueError("réponse iObeya tronquée (fin du tableau JSON non reçue)")
+
 def iobeya_board_create_objects(iobeya_conf, context):
     """
     Crée dans iObeya les cards marquées 'create' dans iobeya_diff.
+
+    Les payloads de toutes les cartes sont construits d'abord (features retrouvées via un index
+    (Nom -> feature) des grist_objects), puis envoyés par paquets de create_chunk_size éléments
+    sur /s/j/elements : quelques requêtes au lieu d'une par feature.
     """
     base_url = iobeya_conf.get("api_url")
     board_id = iobeya_conf.get("board_id")
     api_key = iobeya_conf.get("api_token")
     room_id= iobeya_conf.get("room_id")
     container = iobeya_conf.get("iobeya_board_container")
+    chunk_size = iobeya_conf.get("create_chunk_size") or IOBEYA_CREATE_CHUNK_SIZE
 
     try:
-        created = []
+        # index des features Grist par nom (la première occurrence l'emporte)
+        features_by_name = {}
+        for f in context.get("grist_objects", []):
+            if f.get("type") == "Features":
+                features_by_name.setdefault(f.get("Nom"), f)
+
+        payloads = []
         zorder = 100  # ordre d'empilement initial
         for item in context.get("iobeya_diff", []):
             if item.get("action") == "create":
                 feature_name = item.get("Nom")
                 # recupère l'objet feature complet depuis le grist_objects
-                feature = next((f for f in context.get("grist_objects", []) if f.get("Nom") == feature_name and f.get("type") == "Features"), None)
+                feature = features_by_name.get(feature_name)
                 
                 if feature:
                     x_pos, y_pos = get_next_card_position()
-                    result = iobeya_create_feature_card(base_url, room_id, board_id, container, api_key, feature, x=x_pos, y=y_pos, zorder=zorder)
-                    if result:
-                        created.append(result)
-                        zorder -= 1
+                    payloads.append(_iobeya_feature_card_payload(feature, container, x=x_pos, y=y_pos, zorder=zorder))
+                    zorder -= 1
+
+        results = iobeya_create_elements_batch(base_url, api_key, payloads, chunk_size=chunk_size)
+        created = [result for result in results if result]
 
         print(f"🟦 {len(created)} cards créées dans iObeya.")
         return created
@@ -329,6 +406,62 @@ def iobeya_board_create_objects(iobeya_conf, context):
         logger.error(f"❌ Erreur lors de la création des cards iObeya : {e}", exc_info=True)
         return None
 
+def iobeya_create_elements_batch(base_url, api_key, payloads, chunk_size=IOBEYA_CREATE_CHUNK_SIZE):
+    """
+    Crée des éléments iObeya par paquets de `chunk_size` (un POST /s/j/elements par paquet).
+
+    Retourne, dans l'ordre de `payloads`, l'élément renvoyé par iObeya pour chacun (retrouvé par
+    son id, généré côté client, ou par position si la réponse n'a pas d'ids) ou None en cas d'échec
+    ou si la réponse ne confirme pas sa création. Si un paquet est refusé, ses éléments sont
+    renvoyés un par un pour isoler celui en erreur (les ids étant fixés, pas de doublon).
+    """
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Accept": "application/json",
+        "Content-Type": "application/json"
+    }
+    url = f"{base_url}/s/j/elements"
+    chunk_size = max(1, int(chunk_size))
+    results = [None] * len(payloads)
+
+    def _post(indexes):
+        chunk = [payloads[i] for i in indexes]
+        response = http_post(url, headers=headers, json=chunk, timeout=10)
+        response.raise_for_status()
+        data = response.json()
+        returned = data if isinstance(data, list) else [data]
+        by_id = {el.get("id"): el for el in returned if isinstance(el, dict) and el.get("id")}
+        for position, i in enumerate(indexes):
+            element = by_id.get(payloads[i].get("id"))
+            if element is None and not by_id and len(returned) == len(indexes):
+                element = returned[position] if isinstance(returned[position], dict) else None  # réponse sans ids : même ordre que l'envoi
+            if element is None:
+                # création non confirmée par la réponse : signalée en échec (pas de renvoi, l'élément peut exister)
+                logger.warning("⚠️ Création de l'élément iObeya %s non confirmée par la réponse.", payloads[i].get("id"))
+            results[i] = element
+
+    calls = 0
+    for start in range(0, len(payloads), chunk_size):
+        indexes = list(range(start, min(start + chunk_size, len(payloads))))
+        calls += 1
+        try:
+            _post(indexes)
+            logger.info(f"🟦 {len(indexes)} élément(s) envoyé(s) à iObeya en une requête.")
+        except requests.RequestException as e:
+            if len(indexes) == 1:
+                logger.warning("❌ Erreur lors de la création d'un élément iObeya (%s) : %s", payloads[indexes[0]].get("id"), e)
+                continue
+            logger.warning(f"⚠️ Paquet de {len(indexes)} éléments refusé par iObeya ({e}) : création unitaire.")
+            for i in indexes:
+                calls += 1
+                try:
+                    _post([i])
+                except requests.RequestException as e:
+                    logger.warning("❌ Erreur lors de la création d'un élément iObeya (%s) : %s", payloads[i].get("id"), e)
+
+    logger.info(f"📦 {sum(1 for r in results if r)}/{len(payloads)} éléments créés dans iObeya en {calls} requête(s).")
+    return results
+
 def iobeya_create_feature_card(base_url, room_id, board_id, container, api_key, feature, x=300, y=300, zorder=1):
     """
     Crée une FeatureCard iObeya avec une structure complète
@@ -341,6 +474,27 @@ def iobeya_create_feature_card(base_url, room_id, board_id, container, api_key,
         "Content-Type": "application/json"
     }
 
+    payload = _iobeya_feature_card_payload(feature, container, x=x, y=y, zorder=zorder)
+    uuid_id = payload["id"]
+    card_title = payload["props"]["title"]
+
+    url = f"{base_url}/s/j/elements"
+    payload = [payload] #iboeya API expects a list of elements
+    
+    try:
+        #logger.info("📤 Payload envoyé à iObeya : %s", json.dumps(payload, indent=2, ensure_ascii=False))
+        response = http_post(url, headers=headers, json=payload, timeout=10)
+        response.raise_for_status()
+        data = response.json()
+        logger.info("🟦 FeatureCard créée dans iObeya : %s (%s)", uuid_id, card_title)
+        return data
+    except requests.RequestException as e:
+        logger.warning("❌ Erreur lors de la création d'une FeatureCard iObeya : %s", e)
+        return None
+
+def _iobeya_feature_card_payload(feature, container, x=300, y=300, zorder=1):
+    """Élément BoardCardDTO (FeatureCard) à envoyer sur /s/j/elements pour une feature Grist."""
+
     # Extraction des champs
     title = feature.get("Nom", "Sans titre")
     description = feature.get("Description", "")
@@ -384,7 +538,7 @@ def iobeya_create_feature_card(base_url, room_id, board_id, container, api_key,
     card_title = f"[FP{pi_number}-{id_feature}] : {title}" if id_feature else f"[Feat]: {title}"
     uuid_id=uuid.uuid4() # action : creer un uuid pour l'id de la card
 
-    payload = {
+    return {
         "@class": "com.iobeya.dto.BoardCardDTO",
         "isReadOnly": False,
         "id": str(uuid_id),
@@ -424,23 +578,6 @@ def iobeya_create_feature_card(base_url, room_id, board_id, container, api_key,
         "checklist": checklist
     }
 
-    url = f"{base_url}/s/j/elements"
-    payload = [payload] #iboeya API expects a list of elements
-    
-    try:
-        #logger.info("📤 Payload envoyé à iObeya : %s", json.dumps(payload, indent=2, ensure_ascii=False))
-        response = requests.post(url, headers=headers, json=payload, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-        logger.info("🟦 FeatureCard créée dans iObeya : %s (%s)", uuid_id, card_title)
-        return data
-    except requests.RequestException as e:
-        logger.warning("❌ Erreur lors de la création d'une FeatureCard iObeya : %s", e)
-        return None
-
-
-# a créer une fonction de mise à jour de l'id_Objet dans la carte iobeya
-# idéalement on met à jour aussi le titre de la carte pour y inclure l'id_Objet
 # TODO : peux être trouver comment récuperer juste un seul objet et le mettre à jour ?
 
 def iobeya_update_object_title_prefix(base_url, iobeya_api_token, new_title, id_Objet):
@@ -454,7 +591,7 @@ def iobeya_update_object_title_prefix(base_url, iobeya_api_token, new_title, id_
       
     try:
         url = f"{base_url}/s/j/elements/{id_Objet}"
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_get(url, headers=headers, timeout=10)
         response.raise_for_status()
         data = response.json()
         
@@ -471,20 +608,14 @@ def iobeya_update_object_title_prefix(base_url, iobeya_api_token, new_title, id_
         return None
     
     # on met à jour le titre de la carte ou le contentLabel selon le type d'objet
-    if ( data.get("props") or isinstance(data.get("props"), dict) ):
-        if ( data.get("@class") == "com.iobeya.dto.BoardCardDTO" ): # pour features ou dépendances
-                data["props"]["title"] = new_title
-        if ( data.get("@class") == "com.iobeya.dto.BoardNoteDTO" ): # pour features ou dépendances
-                data["props"]["content"] = new_title                   
-    else :
-        data["contentLabel"]= new_title
+    _iobeya_set_element_title(data, new_title)
    
     payload = [data] #iboeya API expects a list of elements
     
     try:
         url = f"{base_url}/s/j/elements"
         #logger.info("📤 Payload envoyé à iObeya : %s", json.dumps(payload, indent=2, ensure_ascii=False))
-        response = requests.put(url, headers=headers, json=payload, timeout=10)
+        response = http_put(url, headers=headers, json=payload, timeout=10)
         response.raise_for_status()
         data = response.json()
         logger.info("🟦 Title FeatureCard mise à jour dans iObeya : %s (%s)", id_Objet, new_title)
@@ -494,6 +625,97 @@ def iobeya_update_object_title_prefix(base_url, iobeya_api_token, new_title, id_
         return None
        
 
+def iobeya_update_objects_title_prefix(base_url, iobeya_api_token, updates, board_id=None, chunk_size=IOBEYA_CREATE_CHUNK_SIZE,
+                                       board_read_min=IOBEYA_BOARD_READ_MIN):
+    """
+    Variante en lot de iobeya_update_object_title_prefix : updates = [(id_Objet, new_title), ...].
+
+    Le JSON des éléments à modifier est relu élément par élément (GET /s/j/elements/{id}) pour
+    moins de `board_read_min` éléments ; au-delà, en un seul appel (détails du board, lus en flux :
+    seuls les éléments concernés sont conservés), le board pouvant peser plusieurs Mo. Tous les
+    éléments modifiés sont ensuite envoyés par paquets de `chunk_size` en PUT /s/j/elements.
+    Sans board_id (ou si la relecture du board échoue), lecture par élément.
+    Retourne, dans l'ordre de `updates`, l'élément mis à jour ou None en cas d'échec.
+    """
+    headers = {
+        "Authorization": f"Bearer {iobeya_api_token}",
+        "Accept": "application/json",
+        "Content-Type": "application/json"
+    }
+    results = [None] * len(updates)
+    if not updates:
+        return results
+
+    wanted = {id_Objet for id_Objet, _ in updates if id_Objet}
+    elements = {}
+    gets = 0
+
+    if board_id and len(wanted) >= max(1, int(board_read_min)):
+        # un seul appel : relecture en flux des détails du board, sans rien garder d'autre que les éléments visés
+        try:
+            url = f"{base_url}/s/j/boards/{board_id}/details"
+            response = http_get(url, headers=headers, stream=True)
+            gets += 1
+            response.raise_for_status()
+            for el in iobeya_iter_board_elements(response, IOBEYA_BOARD_ELEMENT_CLASSES):
+                if el.get("id") in wanted:
+                    elements[el.get("id")] = el
+        except (requests.RequestException, ValueError) as e:
+            elements = {}
+            logger.warning(f"⚠️ Relecture du board iObeya {board_id} impossible ({e}) : lecture par élément.")
+
+    for id_Objet in wanted - set(elements):
+        try:
+            response = http_get(f"{base_url}/s/j/elements/{id_Objet}", headers=headers, timeout=10)
+            gets += 1
+            response.raise_for_status()
+            data = response.json()
+            data = (data[0] if data else None) if isinstance(data, list) else data
+            if data:
+                elements[id_Objet] = data
+            else:
+                logger.warning("❌ Réponse iObeya vide pour l'objet : %s", id_Objet)
+        except requests.RequestException as e:
+            logger.warning("❌ Erreur lors de la lecture de l'objet iObeya %s : %s", id_Objet, e)
+
+    # application des nouveaux titres (un élément modifié plusieurs fois n'est envoyé qu'une fois)
+    for id_Objet, new_title in updates:
+        if id_Objet in elements:
+            _iobeya_set_element_title(elements[id_Objet], new_title)
+    ids = list(dict.fromkeys(id_Objet for id_Objet, _ in updates if id_Objet in elements))
+
+    url = f"{base_url}/s/j/elements"
+    chunk_size = max(1, int(chunk_size))
+    sent = {}
+    puts = 0
+    for start in range(0, len(ids), chunk_size):
+        chunk_ids = ids[start:start + chunk_size]
+        payload = [elements[i] for i in chunk_ids] #iboeya API expects a list of elements
+        puts += 1
+        try:
+            response = http_put(url, headers=headers, json=payload, timeout=10)
+            response.raise_for_status()
+            for i in chunk_ids:
+                sent[i] = elements[i]
+            logger.info(f"🟦 {len(chunk_ids)} titre(s) mis à jour dans iObeya en une requête.")
+        except requests.RequestException as e:
+            logger.warning(f"❌ Erreur lors de la mise à jour de {len(chunk_ids)} titre(s) iObeya : {e}")
+
+    for index, (id_Objet, _) in enumerate(updates):
+        results[index] = sent.get(id_Objet)
+    logger.info(f"📦 {len(sent)}/{len(wanted)} titres iObeya mis à jour en {gets} lecture(s) et {puts} écriture(s).")
+    return results
+
+def _iobeya_set_element_title(data, new_title):
+    """Remplace le titre d'un élément iObeya selon son type (carte, note ou texte libre)."""
+    if ( data.get("props") or isinstance(data.get("props"), dict) ):
+        if ( data.get("@class") == "com.iobeya.dto.BoardCardDTO" ): # pour features ou dépendances
+                data["props"]["title"] = new_title
+        if ( data.get("@class") == "com.iobeya.dto.BoardNoteDTO" ): # pour features ou dépendances
+                data["props"]["content"] = new_title                   
+    else :
+        data["contentLabel"]= new_title
+
 # --- Placement paramétrable en quinconce (stagger) ---
 
 PLACEMENT = {  # positionnement dans le rectangle de travail "Features backlog"
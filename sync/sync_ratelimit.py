@@ -0,0 +1,239 @@
+## Ordonnanceur des appels GitHub (REST et GraphQL) tenant compte des rate-limits
+
+import os, sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))) ##include the parent directory for module imports
+import hashlib
+import threading
+import time
+import logging
+from datetime import datetime, timezone
+
+import yaml
+
+from sync.sync_http import http_request
+
+# --- Activation et configuration des logs ---
+logging.basicConfig(
+    level=logging.DEBUG,
+    format="%(asctime)s [%(levelname)s] %(message)s"
+)
+logger = logging.getLogger("sync_ratelimit")
+
+# Chargement de la configuration depuis config.yaml ou config.example.yaml
+config_path = "config.yaml" if os.path.exists("config.yaml") else "config.example.yaml"
+with open(config_path, "r") as f:
+    config = yaml.safe_load(f) or {}
+
+rate_limit_conf = (config.get("github", {}) or {}).get("rate_limit", {}) or {}
+
+# Débit maximal soutenu (requêtes / seconde) et rafale autorisée (taille du seau de jetons)
+MAX_RATE = float(rate_limit_conf.get("max_rate", 10))
+BURST = int(rate_limit_conf.get("burst", 10))
+# Réserve de budget à ne pas consommer (le débit est calculé sur remaining - min_remaining)
+MIN_REMAINING = int(rate_limit_conf.get("min_remaining", 50))
+# Attente maximale cumulée pour une requête avant de l'envoyer quand même (secondes)
+MAX_WAIT = float(rate_limit_conf.get("max_wait", 120))
+# Pause par défaut après un rate-limit secondaire sans Retry-After (recommandation GitHub : 60s)
+SECONDARY_LIMIT_PAUSE = float(rate_limit_conf.get("secondary_pause", 60))
+# Nombre de tentatives pour une requête rejetée par un rate-limit
+MAX_ATTEMPTS = int(rate_limit_conf.get("max_attempts", 3))
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+class GithubRateLimiter:
+    """
+    Ordonnanceur des appels GitHub pour un token donné.
+
+    - Suit les budgets par ressource ("core" pour REST, "graphql") à partir des en-têtes
+      X-RateLimit-* et de l'objet GraphQL `rateLimit { cost remaining resetAt }`.
+    - Cadence les requêtes avec un seau de jetons dont le débit de remplissage est
+      min(max_rate, budget restant / temps avant reset) : débit maximal sans épuiser le budget.
+    - Respecte Retry-After et les rate-limits secondaires (pause puis nouvelle tentative), ainsi que
+      le rate-limit primaire GraphQL signalé dans le corps (HTTP 200, errors[].type == "RATE_LIMITED").
+    """
+
+    def __init__(self, max_rate=MAX_RATE, burst=BURST, min_remaining=MIN_REMAINING, max_wait=MAX_WAIT):
+        self.max_rate = max(0.01, float(max_rate))
+        self.burst = max(1, int(burst))
+        self.min_remaining = max(0, int(min_remaining))
+        self.max_wait = float(max_wait)
+
+        self._tokens = float(self.burst)
+        self._last_refill = time.monotonic()
+        self._budgets = {}
+        self._blocked_until = 0.0  # epoch (secondes)
+        self._lock = threading.Lock()
+
+        self.requests = 0
+        self.throttled = 0
+        self.waited = 0.0
+
+    def request(self, method, url, max_attempts=MAX_ATTEMPTS, **kwargs):
+        """Envoie une requête via la couche de transport après obtention d'un jeton ; rejoue si rate-limitée."""
+        resource = "graphql" if url.rstrip("/").endswith("/graphql") else "core"
+        response = None
+        for attempt in range(1, max(1, max_attempts) + 1):
+            self.acquire(resource)
+            response = http_request(method, url, **kwargs)
+            if not self.update_from_response(response, resource) or attempt >= max_attempts:
+                return response
+            logger.warning(
+                f"⏳ Rate-limit GitHub ({resource}) sur {method} {url} — nouvelle tentative {attempt}/{max_attempts - 1}"
+            )
+            response.close()
+        return response
+
+    def acquire(self, resource="core"):
+        """Bloque jusqu'à ce qu'un jeton soit disponible pour `resource` (attente bornée par max_wait)."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.time()
+                if self._blocked_until > now:
+                    wait = self._blocked_until - now
+                else:
+                    budget = self._budgets.get(resource) or {}
+                    remaining = budget.get("remaining")
+                    reset = budget.get("reset") or 0
+                    available = None if remaining is None else remaining - self.min_remaining
+
+                    if available is not None and available <= 0 and reset > now:
+                        # Budget (hors réserve) épuisé : on attend le reset de la fenêtre
+                        wait = reset - now
+                    else:
+                        rate = self.max_rate
+                        if available is not None and reset > now:
+                            rate = max(0.01, min(rate, available / max(1.0, reset - now)))
+                        self._refill(rate)
+                        if self._tokens >= 1:
+                            self._tokens -= 1
+                            self.requests += 1
+                            self.waited += waited
+                            return waited
+                        wait = (1 - self._tokens) / rate
+
+            if waited + wait > self.max_wait:
+                logger.warning(
+                    f"⚠️ Attente rate-limit GitHub ({resource}) plafonnée à {self.max_wait:.0f}s : envoi de la requête."
+                )
+                with self._lock:
+                    self.requests += 1
+                    self.waited += waited
+                return waited
+            time.sleep(wait)
+            waited += wait
+
+    def update_from_response(self, response, resource="core"):
+        """Met à jour les budgets depuis les en-têtes ; retourne True si la requête a été rate-limitée."""
+        headers = response.headers
+        resource = headers.get("X-RateLimit-Resource") or resource
+        now = time.time()
+        throttled = False
+
+        with self._lock:
+            budget = self._budgets.setdefault(resource, {})
+            for key, header in (("limit", "X-RateLimit-Limit"), ("remaining", "X-RateLimit-Remaining"),
+                                ("used", "X-RateLimit-Used"), ("reset", "X-RateLimit-Reset")):
+                value = headers.get(header)
+                if value is not None:
+                    try:
+                        budget[key] = int(value)
+                    except ValueError:
+                        pass
+
+            if response.status_code in (403, 429):
+                retry_after = headers.get("Retry-After")
+                text = ""
+                try:
+                    text = (response.text or "").lower()
+                except Exception:
+                    pass
+
+                if retry_after:
+                    try:
+                        self._blocked_until = max(self._blocked_until, now + float(retry_after))
+                        throttled = True
+                    except ValueError:
+                        pass
+                elif budget.get("remaining") == 0 and budget.get("reset"):
+                    self._blocked_until = max(self._blocked_until, float(budget["reset"]))
+                    throttled = True
+                elif response.status_code == 429 or "rate limit" in text:
+                    self._blocked_until = max(self._blocked_until, now + SECONDARY_LIMIT_PAUSE)
+                    throttled = True
+
+                if throttled:
+                    self.throttled += 1
+        return throttled
+
+    def update_from_graphql_errors(self, errors):
+        """
+        Rate-limit primaire GraphQL : GitHub répond HTTP 200 avec errors[].type == "RATE_LIMITED".
+        Bloque les requêtes jusqu'au reset du budget GraphQL (ou SECONDARY_LIMIT_PAUSE s'il est inconnu) ;
+        retourne True si la requête a été rate-limitée (à rejouer).
+        """
+        if not any(isinstance(e, dict) and e.get("type") == "RATE_LIMITED" for e in errors or ()):
+            return False
+        now = time.time()
+        with self._lock:
+            budget = self._budgets.setdefault("graphql", {})
+            reset = float(budget.get("reset") or 0)
+            budget["remaining"] = 0
+            self._blocked_until = max(self._blocked_until, reset if reset > now else now + SECONDARY_LIMIT_PAUSE)
+            self.throttled += 1
+        return True
+
+    def update_graphql_budget(self, rate_limit):
+        """Met à jour le budget GraphQL depuis l'objet `rateLimit { cost remaining resetAt }`."""
+        if not rate_limit:
+            return
+        with self._lock:
+            budget = self._budgets.setdefault("graphql", {})
+            if rate_limit.get("remaining") is not None:
+                budget["remaining"] = int(rate_limit["remaining"])
+            if rate_limit.get("cost") is not None:
+                budget["last_cost"] = int(rate_limit["cost"])
+            reset_at = rate_limit.get("resetAt")
+            if reset_at:
+                try:
+                    budget["reset"] = int(datetime.fromisoformat(reset_at.replace("Z", "+00:00")).timestamp())
+                except ValueError:
+                    pass
+
+    def status(self):
+        """Instantané JSON-compatible des budgets et du cadencement."""
+        with self._lock:
+            budgets = {}
+            for resource, budget in self._budgets.items():
+                entry = {k: v for k, v in budget.items() if k != "reset"}
+                if budget.get("reset"):
+                    entry["reset_at"] = datetime.fromtimestamp(budget["reset"], tz=timezone.utc).isoformat()
+                budgets[resource] = entry
+            return {
+                "budgets": budgets,
+                "requests": self.requests,
+                "throttled": self.throttled,
+                "waited_s": round(self.waited, 3),
+            }
+
+    def _refill(self, rate):
+        now = time.monotonic()
+        self._tokens = min(float(self.burst), self._tokens + (now - self._last_refill) * rate)
+        self._last_refill = now
+
+
+def github_rate_limiter(authorization):
+    """Retourne l'ordonnanceur associé à un en-tête Authorization (un budget GitHub par token)."""
+    key = hashlib.sha256((authorization or "").encode("utf-8")).hexdigest()
+    limiter = _limiters.get(key)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.setdefault(key, GithubRateLimiter())
+    return limiter
+
+
+def github_rate_limit_status(github_token):
+    """Budget restant et statistiques de cadencement pour un token GitHub (pour le résultat de synchro)."""
+    return github_rate_limiter(f"Bearer {github_token}").status()
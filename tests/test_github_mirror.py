@@ -0,0 +1,151 @@
+"""Application hors ligne de payloads de webhooks GitHub enregistrés au miroir local des projets."""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # config.example.yaml est lu depuis le répertoire courant à l'import des modules
+
+from sync import sync_github  # noqa: E402
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+PROJECT_ID = "PVT_kwDOBn8XzM4AbCde"
+ITEM_ID = "PVTI_lADOBn8XzM4AbCdezgK1"
+ISSUE_ID = "I_kwDOKx1Ab86AAA01"
+
+
+def _load_fixture(name):
+    with open(os.path.join(FIXTURES, name), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class GithubMirrorApplyEventTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        patcher = mock.patch.object(sync_github, "GITHUB_SNAPSHOT_DIR", self.tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+
+        # Miroir constitué par une lecture précédente : un item portant l'issue FP3-007
+        sync_github._github_snapshot_save(PROJECT_ID, {
+            "project_id": PROJECT_ID,
+            "profile": "lean",
+            "watermark": "2025-01-10T09:12:44Z",
+            "swept_at": time.time(),
+            "items": {
+                ITEM_ID: {
+                    "updatedAt": "2025-01-10T09:12:44Z",
+                    "object": {
+                        "type": "Features",
+                        "id_Github": ITEM_ID,
+                        "id_Github_IssueGQL": ISSUE_ID,
+                        "Nom": "Export indicateurs",
+                        "id_Num": 7,
+                        "pi_Num": 3,
+                        "number": 42,
+                        "nameWithOwner": "example-org/backlog",
+                        "timestamp": "2025-01-10T09:12:44Z",
+                        "details_loaded": False,
+                    },
+                },
+            },
+        })
+
+    def _mirror(self):
+        return sync_github.github_get_project_objects_from_mirror(PROJECT_ID)
+
+    def test_issue_edited_updates_mirror_without_network(self):
+        with mock.patch.object(sync_github, "_github_graphql") as graphql:
+            summary = sync_github.github_mirror_apply_event("issues", _load_fixture("github_webhook_issues_edited.json"))
+        graphql.assert_not_called()
+
+        self.assertEqual(summary, {"event": "issues", "action": "edited", "applied": 1})
+        [obj] = self._mirror()
+        self.assertEqual(obj["Nom"], "Export des indicateurs PI")
+        self.assertEqual((obj["type"], obj["pi_Num"], obj["id_Num"]), ("Features", 3, 7))
+        self.assertFalse(obj["details_loaded"])
+
+    def test_project_item_edited_without_token_marks_item_for_refetch(self):
+        with mock.patch.object(sync_github, "_github_graphql") as graphql:
+            summary = sync_github.github_mirror_apply_event(
+                "projects_v2_item", _load_fixture("github_webhook_projects_v2_item_edited.json"), github_token=None
+            )
+        graphql.assert_not_called()
+
+        self.assertEqual(summary["applied"], 1)
+        snapshot = sync_github._github_snapshot_load(PROJECT_ID)
+        entry = snapshot["items"][ITEM_ID]
+        self.assertEqual(entry["updatedAt"], "")  # relu au prochain balayage incrémental
+        self.assertEqual(entry["object"]["Nom"], "Export indicateurs")
+        self.assertIsNone(self._mirror())  # miroir non utilisable tant que l'item n'est pas relu
+
+    def test_project_item_refetch_graphql_error_forces_incremental_sweep(self):
+        rate_limited = {"errors": [{"type": "RATE_LIMITED", "message": "API rate limit exceeded"}]}
+        with mock.patch.object(sync_github, "_github_graphql", return_value=rate_limited):
+            summary = sync_github.github_mirror_apply_event(
+                "projects_v2_item", _load_fixture("github_webhook_projects_v2_item_edited.json"), github_token="token"
+            )
+
+        self.assertEqual(summary["applied"], 1)
+        self.assertEqual(sync_github._github_snapshot_load(PROJECT_ID)["items"][ITEM_ID]["updatedAt"], "")
+        self.assertIsNone(self._mirror())
+
+    def test_stale_mirror_requires_reconcile(self):
+        self.assertEqual(len(self._mirror()), 1)
+        self.assertIsNone(sync_github.github_get_project_objects_from_mirror(PROJECT_ID, reconcile_interval=0))
+
+    def test_project_item_refetch_runs_outside_snapshot_lock(self):
+        lock_free_during_fetch = []
+
+        def fake_graphql(token, query, variables=None, timeout=15):
+            acquired = sync_github._github_snapshot_lock.acquire(blocking=False)
+            lock_free_during_fetch.append(acquired)
+            if acquired:
+                sync_github._github_snapshot_lock.release()
+            return {"data": {"nodes": [{
+                "id": ITEM_ID,
+                "updatedAt": "2025-01-14T16:03:27Z",
+                "content": {
+                    "__typename": "Issue", "id": ISSUE_ID, "number": 42,
+                    "title": "[FP3-007] : Export des indicateurs PI",
+                    "updatedAt": "2025-01-14T16:03:00Z",
+                    "repository": {"nameWithOwner": "example-org/backlog"},
+                },
+            }]}}
+
+        with mock.patch.object(sync_github, "_github_graphql", side_effect=fake_graphql):
+            sync_github.github_mirror_apply_event(
+                "projects_v2_item", _load_fixture("github_webhook_projects_v2_item_edited.json"), github_token="token"
+            )
+
+        self.assertEqual(lock_free_during_fetch, [True])
+        entry = sync_github._github_snapshot_load(PROJECT_ID)["items"][ITEM_ID]
+        self.assertEqual(entry["updatedAt"], "2025-01-14T16:03:27Z")
+        self.assertEqual(entry["object"]["Nom"], "Export des indicateurs PI")
+
+    def test_project_item_deleted_removes_item(self):
+        summary = sync_github.github_mirror_apply_event(
+            "projects_v2_item", _load_fixture("github_webhook_projects_v2_item_deleted.json"), github_token=None
+        )
+        self.assertEqual(summary["applied"], 1)
+        self.assertEqual(self._mirror(), [])  # miroir vide, distinct d'un miroir absent
+        self.assertIsNone(sync_github.github_get_project_objects_from_mirror("PVT_unknown"))
+
+    def test_event_for_unknown_project_is_ignored(self):
+        payload = _load_fixture("github_webhook_projects_v2_item_edited.json")
+        payload["projects_v2_item"]["project_node_id"] = "PVT_unknown"
+        summary = sync_github.github_mirror_apply_event("projects_v2_item", payload, github_token=None)
+        self.assertEqual(summary["applied"], 0)
+        self.assertFalse(os.path.exists(sync_github._github_snapshot_path("PVT_unknown")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -59,7 +59,8 @@ from sync.sync_grist import (
     grist_get_doc_name,
     grist_get_epics,
     grist_get_epic_objects,
-    grist_get_epic
+    grist_get_epic,
+    GristEpicResolver
 )
 from sync.sync_iobeya import (
     iobeya_get_rooms,
@@ -69,8 +70,14 @@ from sync.sync_iobeya import (
 
 from sync.sync_github import (
     github_get_organizations,
-    github_get_projects,
-    github_get_project_objects
+    github_get_projects_cached,
+    github_project_catalog,
+    github_iter_project_objects,
+    github_get_project_objects_incremental,
+    github_get_project_objects_from_mirror,
+    GithubIncompleteReadError,
+    github_mirror_apply_event,
+    github_webhook_verify_signature
 )
 
 # --- Initialisation de l'application Flask ---
@@ -159,6 +166,13 @@ GRIST_DOC_ID = grist_conf.get("default_doc_id", "")
 GRIST_TABLE_NAME = grist_conf.get("default_table", "Features")
 GRIST_EPIC_TABLE_NAME = grist_conf.get("default_epic_table", "Epics")
 GRIST_FEATURE_TABLE_NAME = grist_conf.get("default_feature_table", "Features")
+GRIST_FETCH_MODE = grist_conf.get("fetch_mode", "rest")  # "rest" (5 tables) ou "sql" (une requête UNION ALL)
+# Rafraîchissement incrémental des tables Grist (instantanés locaux dans run.output_dir)
+GRIST_INCREMENTAL_REFRESH = bool(grist_conf.get("incremental_refresh", False))
+GRIST_SNAPSHOT_DIR = os.path.join((config.get("run", {}) or {}).get("output_dir", "data"), "grist_snapshots")
+GRIST_FULL_RECONCILE_INTERVAL = grist_conf.get("full_reconcile_interval")
+# Réservations d'id_Num partagées entre workers (fichier verrouillé dans run.output_dir)
+GRIST_ID_STATE_DIR = os.path.join((config.get("run", {}) or {}).get("output_dir", "data"), "grist_ids")
 
 # iObeya configuration
 iobeya_conf = config.get("iobeya", {})
@@ -171,6 +185,16 @@ github_conf = config.get("github", {})
 GITHUB_TOKEN_ENV_VAR = github_conf.get("token_env_var", "")
 GITHUB_ORGANIZATIONS = github_conf.get("organizations", [])
 GITHUB_DEFAULT_REPO_FULL_NAME = github_conf.get("default_repo_full_name", "")  
+GITHUB_INCREMENTAL_FETCH = bool(github_conf.get("incremental_fetch", False))
+# Profil de lecture pour /prepare : "lean" (diff seulement, détails relus à la création dans Grist) ou "full"
+GITHUB_FETCH_PROFILE = github_conf.get("fetch_profile", "lean")
+# Miroir local alimenté par les webhooks GitHub (/github-webhook) : le diff lit le miroir au lieu de l'API
+GITHUB_WEBHOOK_MIRROR = bool(github_conf.get("webhook_mirror", False))
+GITHUB_WEBHOOK_SECRET = os.getenv("GITHUB_WEBHOOK_SECRET") or github_conf.get("webhook_secret", "")
+
+# Préchargement en tâche de fond du catalogue des ProjectsV2 de toutes les organisations configurées
+if GITHUB_TOKEN_ENV_VAR and GITHUB_ORGANIZATIONS:
+    github_project_catalog(GITHUB_TOKEN_ENV_VAR).warm(GITHUB_ORGANIZATIONS, wait=False)
 
 # --- Allowed object types for diffing (explicit allowlists)
 IOBEYA_ALLOWED_OBJECT_TYPES = {
@@ -186,6 +210,12 @@ GITHUB_ALLOWED_OBJECT_TYPES = {
     "Issues"
 }
 
+# --- Champs propagés vers Grist (diffs "update_grist") pour les objets déjà présents
+# (la Description iObeya n'est qu'une copie du titre ; le corps GitHub est décoré à la création
+# et complété des commentaires : non comparable à la Description Grist, seul le Nom est propagé)
+IOBEYA_UPDATE_FIELDS = ("Nom",)
+GITHUB_UPDATE_FIELDS = ("Nom",)
+
 # --- Vérification de clés d'accès sécurisées à l'application ---
 
 # L'accès aux endpoints non publics nécessite une clé d'accès valide
@@ -217,7 +247,8 @@ def verify_access_key():
     public_paths = [
         "/", "/healthz", "/favicon.ico",
         "/static/", "/verify", "/sync",
-        "/github-projects", "/iobeya-boards"
+        "/github-projects", "/iobeya-boards",
+        "/github-webhook"  # authentifié par la signature X-Hub-Signature-256
     ]
     
     # Autorise toutes les routes qui commencent par /static/ ou correspondent à la liste blanche
@@ -323,7 +354,8 @@ def github_projects():
         return jsonify({"error": "Token GitHub manquant ou non défini dans l'environnement"}), 401
     
     try:
-        project_list = github_get_projects(GITHUB_TOKEN_ENV_VAR, org_name)
+        force_refresh = request.args.get("refresh", "").strip().lower() in ("1", "true", "yes")
+        project_list = github_get_projects_cached(GITHUB_TOKEN_ENV_VAR, org_name, force_refresh=force_refresh)
         app.logger.info(f"✅ {len(project_list)} projets récupérés pour {org_name}.")
         return jsonify(project_list)
 
@@ -331,6 +363,26 @@ def github_projects():
         app.logger.error(f"⚠️ Erreur API GitHub GraphQL : {e}")
         return jsonify({"error": f"Échec de la récupération des projets : {e}"}), 500
 
+@app.route("/github-webhook", methods=["POST"])
+def github_webhook():
+    """Reçoit les événements projects_v2_item / issues signés et les applique au miroir local."""
+    if not GITHUB_WEBHOOK_SECRET:
+        app.logger.error("❌ Secret de webhook GitHub non configuré (github.webhook_secret ou GITHUB_WEBHOOK_SECRET)")
+        return jsonify({"error": "Webhook non configuré"}), 503
+
+    body = request.get_data()
+    if not github_webhook_verify_signature(GITHUB_WEBHOOK_SECRET, body, request.headers.get("X-Hub-Signature-256")):
+        app.logger.warning("⚠️ Signature de webhook GitHub invalide")
+        return jsonify({"error": "Signature invalide"}), 401
+
+    event = request.headers.get("X-GitHub-Event", "")
+    if event == "ping":
+        return jsonify({"status": "pong"})
+
+    payload = request.get_json(silent=True) or {}
+    summary = github_mirror_apply_event(event, payload, GITHUB_TOKEN_ENV_VAR)
+    return jsonify(summary)
+
 @app.route("/iobeya-boards")
 def iobeya_boards():
     room_id = request.args.get("room_id")
@@ -390,8 +442,11 @@ def verify():
     
     # récupérer les objets depuis grist
     
+    # Table Epics téléchargée une seule fois pour toute la prévisualisation
+    epic_resolver = GristEpicResolver(GRIST_API_URL, grist_doc_id, GRIST_API_TOKEN)
+
     try:
-        grist_epics = grist_get_epics(GRIST_API_URL, grist_doc_id, GRIST_API_TOKEN )       
+        grist_epics = grist_get_epics(GRIST_API_URL, grist_doc_id, GRIST_API_TOKEN, resolver=epic_resolver)
         session_data["grist_epics"] = jsonify(grist_epics)
         app.logger.info(f" >> ✅ {len(session_data['grist_epics'])} épics récupérés depuis Grist (app.py).")
     except Exception as e:
@@ -399,8 +454,14 @@ def verify():
         session_data["grist_objects"].clear()   
         
     try:
-        epic_obj = grist_get_epic(GRIST_API_URL, grist_doc_id, GRIST_API_TOKEN, epic )       
-        df = grist_get_epic_objects(GRIST_API_URL, grist_doc_id, GRIST_API_TOKEN, epic, pi or 0)
+        epic_obj = grist_get_epic(GRIST_API_URL, grist_doc_id, GRIST_API_TOKEN, epic, resolver=epic_resolver)
+        df = grist_get_epic_objects(
+            GRIST_API_URL, grist_doc_id, GRIST_API_TOKEN, epic, pi or 0,
+            resolver=epic_resolver,
+            fetch_mode=GRIST_FETCH_MODE,
+            snapshot_dir=GRIST_SNAPSHOT_DIR if GRIST_INCREMENTAL_REFRESH else None,
+            full_reconcile_interval=GRIST_FULL_RECONCILE_INTERVAL,
+        )
         session_data["grist_objects"] = df_to_records_jsonsafe(df)
         app.logger.info(f" >> ✅ {len(session_data['grist_objects'])} objets récupérées depuis Grist (app.py).")
     except Exception as e:
@@ -423,19 +484,41 @@ def verify():
         session_data["iobeya_objects"].clear()
         
     # récupérer les objets depuis GitHub
+    # (lecture incomplète => pas de diff GitHub : les items non lus seraient vus comme absents)
+    session_data["github_read_complete"] = True
     try:
-        if github_project_id is not None :
-            github_objects = github_get_project_objects(github_project_id, GITHUB_TOKEN_ENV_VAR)
-            if isinstance(github_objects, list):
-                session_data["github_objects"] = _json_safe(github_objects)
-            else:
-                # Compat: si la fonction renvoie un DataFrame à l'avenir
-                df = github_objects
-                session_data["github_objects"] = df_to_records_jsonsafe(df)
+        mirror_objects = None
+        if github_project_id is not None and GITHUB_WEBHOOK_MIRROR:
+            # Miroir local tenu à jour par les webhooks : aucun appel GitHub, quelle que soit la taille du projet
+            # (None : miroir absent, items à relire ou réconciliation due => balayage incrémental ci-dessous)
+            mirror_objects = github_get_project_objects_from_mirror(github_project_id)
+
+        if mirror_objects is not None:
+            session_data["github_objects"] = _json_safe(mirror_objects)
+            app.logger.info(f" >>✅ {len(session_data['github_objects'])} objets lus depuis le miroir GitHub (app.py).")
+        elif github_project_id is not None and (GITHUB_INCREMENTAL_FETCH or GITHUB_WEBHOOK_MIRROR):
+            # Lecture incrémentale : seuls les items modifiés depuis le dernier passage sont relus
+            # (constitue aussi le miroir initial utilisé par les webhooks)
+            session_data["github_objects"] = _json_safe(
+                github_get_project_objects_incremental(github_project_id, GITHUB_TOKEN_ENV_VAR, profile=GITHUB_FETCH_PROFILE)
+            )
+            app.logger.info(f" >>✅ {len(session_data['github_objects'])} objets récupérés depuis GitHub (app.py).")
+        elif github_project_id is not None :
+            # Lecture page par page : seuls les objets normalisés sont conservés, les pages brutes sont libérées au fil de l'eau.
+            # Le diff est calculé ensuite sur l'ensemble : un item pas encore lu serait vu comme absent (création en double)
+            github_objects = []
+            for page in github_iter_project_objects(github_project_id, GITHUB_TOKEN_ENV_VAR, profile=GITHUB_FETCH_PROFILE):
+                github_objects.extend(_json_safe(page))
+            session_data["github_objects"] = github_objects
             app.logger.info(f" >>✅ {len(session_data['github_objects'])} objets récupérés depuis GitHub (app.py).")  
+    except GithubIncompleteReadError as e:
+        app.logger.error(f"❌ Lecture GitHub incomplète, diff GitHub non calculé : {e}")
+        session_data["github_read_complete"] = False
+        session_data["github_objects"] = []
     except Exception as e:
         app.logger.error(f"❌ Erreur lors de la récupération des objets GitHub : {e}")
-        session_data["github_objects"].clear()
+        session_data["github_read_complete"] = False
+        session_data["github_objects"] = []
 
     # récupérer les diffs
     
@@ -444,7 +527,7 @@ def verify():
 
     try:
         # récupère la liste des epics pour filtrer les diffs en fonction de l'epic sélectionné
-        id_epic_value = grist_get_epic(GRIST_API_URL,grist_doc_id,GRIST_API_TOKEN,epic,"Epics")
+        id_epic_value = grist_get_epic(GRIST_API_URL,grist_doc_id,GRIST_API_TOKEN,epic,"Epics",resolver=epic_resolver)
 
         # Calcul des diffs iObeya et GitHub vs grist
         if iobeya_board_id is not None:
@@ -454,16 +537,18 @@ def verify():
                 rename_deleted,
                 epic_obj,
                 allowed_types=IOBEYA_ALLOWED_OBJECT_TYPES,
+                update_fields=IOBEYA_UPDATE_FIELDS,
             )
             app.logger.info(f"✅ {len(session_data['iobeya_diff'])} différences récupérées depuis iObeya (app.py).")
 
-        if github_project_id is not None :        
+        if github_project_id is not None and session_data.get("github_read_complete"):
             session_data["github_diff"] = compute_diff(
                 session_data["grist_objects"],
                 session_data["github_objects"],
                 rename_deleted,
                 epic_obj,
                 allowed_types=GITHUB_ALLOWED_OBJECT_TYPES,
+                update_fields=GITHUB_UPDATE_FIELDS,
             )
             app.logger.info(f"✅ {len(session_data['github_diff'])} différences récupérées depuis GitHub (app.py).")
 
@@ -478,7 +563,8 @@ def verify():
         "iobeya": _json_safe(session_data["iobeya_objects"]),
         "github": _json_safe(session_data["github_objects"]),
         "iobeya_diff": _json_safe(session_data["iobeya_diff"]),
-        "github_diff": _json_safe(session_data["github_diff"])
+        "github_diff": _json_safe(session_data["github_diff"]),
+        "github_read_complete": session_data.get("github_read_complete", True)
     })
 
 @app.route("/sync", methods=["POST"])
@@ -530,7 +616,10 @@ def sync():
         "api_url": GRIST_API_URL,
         "doc_id": grist_doc_id,
         "api_token": GRIST_API_TOKEN,
-        "feature_table_name": GRIST_FEATURE_TABLE_NAME
+        "feature_table_name": GRIST_FEATURE_TABLE_NAME,
+        "create_chunk_size": grist_conf.get("create_chunk_size"),
+        "write_mode": grist_conf.get("write_mode", "apply"),
+        "id_state_dir": GRIST_ID_STATE_DIR
     }
 
     iobeya_params = {
@@ -538,13 +627,17 @@ def sync():
         "board_id": iobeya_board_id,
         "iobeya_board_container": iobeya_board_container,
         "room_id": iobeya_room_id,
-        "api_token": IOBEYA_API_TOKEN
+        "api_token": IOBEYA_API_TOKEN,
+        "create_chunk_size": iobeya_conf.get("create_chunk_size")
     }
 
     github_params = {
         "project_id": github_project_id,
         "api_token": GITHUB_TOKEN_ENV_VAR,
-        "default_repo_full_name": GITHUB_DEFAULT_REPO_FULL_NAME
+        "default_repo_full_name": GITHUB_DEFAULT_REPO_FULL_NAME,
+        "repo_context_ttl": github_conf.get("repo_context_ttl"),
+        "mutation_chunk_size": github_conf.get("mutation_chunk_size"),
+        "max_in_flight": github_conf.get("max_in_flight")
     }
 
     # Met à jour le grist_doc_id actif dans le contexte avant synchronisation
@@ -567,6 +660,11 @@ def sync():
         session_data
     )
 
+    # Conserve l'état de reprise de la poussée GitHub (évite de recréer des issues déjà créées)
+    if result.get("details", {}).get("github_push_state") is not None:
+        session_data["github_push_state"] = result["details"]["github_push_state"]
+        session_store.set(session_id, session_data)
+
     return jsonify({
         "status": "ok",
         "iobeya_board_id": iobeya_board_id,